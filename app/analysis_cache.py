@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from app.config import settings, LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+# cherry-pick/rebase 시 자동으로 붙는 trailer 는 patch-id 계산에서 제외
+_TRAILER_PATTERN = re.compile(
+    r'^\s*(\(cherry picked from commit [0-9a-f]+\)|signed-off-by:.*|co-authored-by:.*|change-id:.*)\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def compute_patch_id(
+    diffs: List[Dict[str, Any]],
+    commit_message: str,
+    prompt_version: str,
+    kind: str,
+    scope: Optional[Any] = None
+) -> str:
+    # git patch-id 와 같이 hunk 위치(줄 번호)와 공백을 무시하고 변경 줄만으로 해시
+    # scope(Redmine project 등)가 있으면 포함해 다른 project 의 결과(issue id)를 재사용하지 않도록 함
+    digest = hashlib.sha256()
+    digest.update(f"{kind}\0{prompt_version}\0".encode('utf-8'))
+    if scope is not None:
+        digest.update(f"scope={scope}\0".encode('utf-8'))
+
+    message = _TRAILER_PATTERN.sub('', commit_message or '')
+    digest.update(_WHITESPACE.sub(' ', message).strip().encode('utf-8'))
+
+    for diff in sorted(diffs, key=lambda d: d.get('path') or ''):
+        digest.update(f"\0{diff.get('path')}\0".encode('utf-8'))
+        for line in (diff.get('diff') or '').split('\n'):
+            if line[:1] in ('+', '-') and not line.startswith(('+++', '---')):
+                digest.update(line[0].encode('utf-8'))
+                digest.update(_WHITESPACE.sub('', line[1:]).encode('utf-8'))
+                digest.update(b'\n')
+
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Patch-id 기준 LLM 분석 결과 캐시 (SQLite, TTL + LRU 개수 제한).
+
+    rebase/cherry-pick 으로 SHA 만 바뀐 commit 은 같은 patch-id 를 가지므로
+    저장된 분석 결과를 재사용하고 LLM 호출을 생략합니다.
+    """
+
+    # 쓰기 몇 번마다 만료/초과 항목을 정리할지
+    PRUNE_EVERY = 50
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.db_path = db_path or (LOGS_DIR / "analysis_cache.db")
+        self.ttl_seconds = settings.ANALYSIS_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.ANALYSIS_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            "patch_id TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_used_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache (last_used_at)"
+        )
+
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, patch_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE patch_id = ?",
+                (patch_id,)
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE analysis_cache SET last_used_at = ? WHERE patch_id = ?",
+                (now, patch_id)
+            )
+            self.hits += 1
+
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning(f"Corrupted analysis cache entry {patch_id[:12]}, ignoring")
+            return None
+
+    def set(self, patch_id: str, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Analysis result not cacheable: {e}")
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (patch_id, value, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (patch_id, payload, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 1:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM analysis_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+
+        # 개수 초과 시 가장 오래 사용되지 않은 항목부터 제거
+        self._conn.execute(
+            "DELETE FROM analysis_cache WHERE patch_id IN ("
+            "SELECT patch_id FROM analysis_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[AnalysisCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache()
+
+    return _cache
@@ -1,18 +1,25 @@
 import logging
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from app.gitlab_client import GitLabClient
 from app.redmine_client import RedmineClient
+from app.issue_snapshot import IssueSnapshotStore
+from app.issue_writer import IssueWriter, IssueWriteBatch
+from app.issue_index import build_commit_query
+from app.issue_vectors import build_commit_text
 from app.utils import (
     parse_issue_id_from_message,
     log_sync_event,
-    is_commit_already_processed,
-    mark_commit_as_processed,
-    estimate_tokens,
-    chunk_diff_data,
-    format_redmine_issues
+    filter_new_commits,
+    mark_commit_as_processed
 )
+from app.diff_chunker import DiffChunkPlanner
+from app.analysis_cache import compute_patch_id, get_analysis_cache
 from chains.simple_chain import CommitAnalysisChain
 from app.config import settings
 
@@ -22,10 +29,25 @@ logger = logging.getLogger(__name__)
 
 class CommitAnalyzer:
 
+    # 대기열에 있는 청크 호출의 시작 여부 확인 간격 (초)
+    CHUNK_POLL_INTERVAL = 1.0
+
     def __init__(self):
         self.gitlab = GitLabClient()
         self.redmine = RedmineClient()
         self.chain = CommitAnalysisChain()
+        self.chunk_planner = DiffChunkPlanner()
+        self.analysis_cache = get_analysis_cache()
+        self.issue_snapshot = IssueSnapshotStore(self.redmine)
+        self.issue_writer = IssueWriter(self.redmine)
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=settings.ANALYZER_IO_WORKERS,
+            thread_name_prefix="analyzer-io"
+        )
+        self.chunk_executor = ThreadPoolExecutor(
+            max_workers=settings.CHUNK_ANALYSIS_CONCURRENCY,
+            thread_name_prefix="chunk-analysis"
+        )
 
     def should_skip_commit(self, commit_data: Dict) -> bool:
         message = commit_data.get('message', '').lower()
@@ -62,17 +84,34 @@ class CommitAnalyzer:
                 result['reason'] = 'No commits in webhook'
                 return result
 
+            # push 전체 commit 을 한 번에 중복 확인
+            new_commit_shas = set(filter_new_commits([commit.get('id') for commit in commits]))
+
+            if self._should_analyze_per_push(webhook_data, commits, new_commit_shas):
+                push_results = self._process_push(project_id, project_name, commits, webhook_data)
+                if push_results is not None:
+                    result['commit_results'] = push_results
+                    result['status'] = 'success'
+                    return result
+
+            # 같은 issue 를 갱신하는 commit 들은 push 단위로 모아 issue 별로 한 번만 기록
+            writes = IssueWriteBatch(self.issue_writer)
+
             for commit in commits:
                 commit_result = self._process_single_commit(
                     project_id,
                     project_name,
                     commit,
-                    webhook_data
+                    webhook_data,
+                    already_processed=commit.get('id') not in new_commit_shas,
+                    writes=writes
                 )
 
                 result['commit_results'] = result.get('commit_results', [])
                 result['commit_results'].append(commit_result)
 
+            writes.flush()
+
             result['status'] = 'success'
 
         except Exception as e:
@@ -90,7 +129,9 @@ class CommitAnalyzer:
         project_id: int,
         project_name: str,
         commit: Dict,
-        webhook_data: Dict
+        webhook_data: Dict,
+        already_processed: bool = False,
+        writes: Optional[IssueWriteBatch] = None
     ) -> Dict[str, Any]:
         commit_sha = commit.get('id')
         commit_message = commit.get('message', '')
@@ -98,29 +139,36 @@ class CommitAnalyzer:
 
         logger.info(f"Processing commit {commit_sha[:8]} in {project_name}")
 
-        result = {
-            'commit_sha': commit_sha,
-            'status': 'pending'
-        }
-
-        if self.should_skip_commit(commit):
-            result['status'] = 'skipped'
-            result['reason'] = 'Commit type should be skipped'
+        result = self._precheck_commit(commit, already_processed)
+        if result['status'] == 'skipped':
             return result
 
-        if is_commit_already_processed(commit_sha):
-            logger.info(f"Commit {commit_sha[:8]} already processed, skipping")
-            result['status'] = 'skipped'
-            result['reason'] = 'Commit already processed'
-            return result
+        explicit_issue_id = parse_issue_id_from_message(commit_message)
 
-        commit_detail = self.gitlab.get_commit(project_id, commit_sha)
-        if not commit_detail:
-            result['status'] = 'failed'
-            result['error'] = 'Failed to fetch commit details'
-            return result
+        if explicit_issue_id:
+            logger.info(f"Commit explicitly references Redmine issue #{explicit_issue_id}")
+            commit_diffs = self.gitlab.get_commit_diff(project_id, commit_sha)
+            if commit_diffs is None:
+                result['status'] = 'failed'
+                result['error'] = 'Failed to fetch commit diff'
+                return result
+
+            return self._update_explicit_issue(
+                explicit_issue_id,
+                commit_sha,
+                commit_message,
+                author_name,
+                self.gitlab.filter_and_summarize_diff(commit_diffs),
+                writes
+            )
 
-        commit_diffs = self.gitlab.get_commit_diff(project_id, commit_sha)
+        # commit 메타데이터는 push payload 에 있으므로 get_commit 은 호출하지 않음
+        # diff / GitLab issue / Redmine 컨텍스트는 서로 독립적이므로 동시에 조회
+        diff_future = self.io_executor.submit(self.gitlab.get_commit_diff, project_id, commit_sha)
+        gitlab_issue_future = self.io_executor.submit(self._fetch_gitlab_issue, project_id, commit_message)
+        redmine_future = self.io_executor.submit(self._fetch_redmine_context, project_name)
+
+        commit_diffs = diff_future.result()
         if commit_diffs is None:
             result['status'] = 'failed'
             result['error'] = 'Failed to fetch commit diff'
@@ -128,42 +176,443 @@ class CommitAnalyzer:
 
         diff_data = self.gitlab.filter_and_summarize_diff(commit_diffs)
 
+        redmine_project, open_issues = redmine_future.result()
+        if not redmine_project:
+            result['status'] = 'failed'
+            result['error'] = f'Redmine project not found: {project_name}'
+            return result
+
+        if open_issues is None:
+            result['status'] = 'failed'
+            result['error'] = 'Failed to fetch Redmine issues'
+            return result
+
+        gitlab_issue = gitlab_issue_future.result()
+        open_issues = self._select_issues(redmine_project['id'], commit_message, diff_data, open_issues)
+
+        commit_data = {
+            'repository': project_name,
+            'branch': webhook_data.get('ref', 'unknown').split('/')[-1],
+            'author': author_name,
+            'commit_hash': commit_sha,
+            'commit_message': commit_message,
+            'diff_data': diff_data
+        }
+
+        return self._analyze_and_apply(
+            redmine_project,
+            open_issues,
+            gitlab_issue,
+            commit_data,
+            [commit_sha],
+            writes
+        )
+
+    def _analyze_and_apply(
+        self,
+        redmine_project: Dict,
+        open_issues: list,
+        gitlab_issue: Optional[Dict],
+        commit_data: Dict[str, Any],
+        commit_shas: List[str],
+        writes: Optional[IssueWriteBatch] = None
+    ) -> Dict[str, Any]:
+        commit_sha = commit_data['commit_hash']
+        commit_message = commit_data['commit_message']
+        author_name = commit_data['author']
+        diff_data = commit_data['diff_data']
+
+        # 분석 결과에는 issue id 가 들어 있으므로 Redmine project 별로 구분
+        patch_id, cached = self._lookup_cache(diff_data, commit_message, 'analysis', redmine_project['id'])
+
+        if cached:
+            analysis_result = self._reuse_cached_analysis(cached, commit_sha)
+        else:
+            packed_commit_data = self._fit_prompt(commit_data, open_issues, gitlab_issue)
+            if packed_commit_data is None:
+                analysis_result = self._analyze_with_chunking(
+                    commit_data,
+                    open_issues,
+                    diff_data.get('diffs', [])
+                )
+            else:
+                analysis_result = self.chain.analyze(
+                    packed_commit_data,
+                    open_issues,
+                    gitlab_issue
+                )
+
+        if not analysis_result:
+            return {
+                'commit_sha': commit_sha,
+                'status': 'failed',
+                'error': 'LLM analysis failed'
+            }
+
+        finish = partial(
+            self._finish_analysis,
+            patch_id=patch_id,
+            analysis_result=analysis_result,
+            cached=bool(cached),
+            commit_sha=commit_sha,
+            commit_shas=commit_shas
+        )
+
+        if analysis_result['action'] == 'create':
+            result = self._create_issue(
+                redmine_project['id'],
+                analysis_result,
+                commit_sha,
+                author_name
+            )
+            return finish(result)
+
+        # 갱신은 push 단위로 모아 기록되므로 기록이 끝난 뒤 finish 가 호출됨
+        return self._update_issue(
+            analysis_result['redmine_issue_id'],
+            analysis_result,
+            commit_sha,
+            commit_message,
+            author_name,
+            writes,
+            on_done=finish
+        )
+
+    def _finish_analysis(
+        self,
+        result: Dict[str, Any],
+        patch_id: str,
+        analysis_result: Dict[str, Any],
+        cached: bool,
+        commit_sha: str,
+        commit_shas: List[str]
+    ) -> Dict[str, Any]:
+        if cached:
+            result['cached'] = True
+        elif result.get('status') == 'success':
+            self._store_analysis(patch_id, analysis_result, result)
+
+        return self._complete_analysis(result, commit_sha, commit_shas)
+
+    def _patch_id(
+        self,
+        diff_data: Dict[str, Any],
+        commit_message: str,
+        kind: str,
+        scope: Optional[Any] = None
+    ) -> str:
+        return compute_patch_id(diff_data.get('diffs', []), commit_message, self.chain.prompt_version, kind, scope)
+
+    def _lookup_cache(
+        self,
+        diff_data: Dict[str, Any],
+        commit_message: str,
+        kind: str,
+        scope: Optional[Any] = None
+    ) -> Tuple[str, Optional[Dict]]:
+        patch_id = self._patch_id(diff_data, commit_message, kind, scope)
+        return patch_id, self.analysis_cache.get(patch_id)
+
+    @staticmethod
+    def _reuse_cached_analysis(cached: Dict[str, Any], commit_sha: str) -> Dict[str, Any]:
+        # 같은 patch 로 이미 만든/갱신한 issue 가 있으면 새로 만들지 않고 그 issue 를 갱신
+        analysis_result = dict(cached['analysis'])
+        if cached.get('issue_id'):
+            analysis_result['action'] = 'update'
+            analysis_result['redmine_issue_id'] = cached['issue_id']
+
+        logger.info(
+            f"Reusing cached analysis for {commit_sha[:8]} (same patch as an earlier commit, "
+            f"issue #{analysis_result.get('redmine_issue_id')})"
+        )
+        return analysis_result
+
+    def _store_analysis(self, patch_id: str, analysis_result: Dict[str, Any], result: Dict[str, Any]):
+        issue_id = result.get('issue_id') or (result.get('created_issue') or {}).get('id')
+        try:
+            self.analysis_cache.set(patch_id, {'analysis': analysis_result, 'issue_id': issue_id})
+        except Exception as e:
+            logger.warning(f"Failed to store analysis cache entry: {e}")
+
+    def _fit_prompt(
+        self,
+        commit_data: Dict[str, Any],
+        open_issues: list,
+        gitlab_issue: Optional[Dict]
+    ) -> Optional[Dict[str, Any]]:
+        # 예산 안에 담긴 diff 비율이 너무 낮을 때만 청킹 모드로 전환 (None 반환)
+        packed_diff = self.chain.fit_analysis_diff(commit_data, open_issues, gitlab_issue)
+        budget = packed_diff['budget']
+
+        if budget['coverage'] < settings.PROMPT_MIN_DIFF_COVERAGE:
+            logger.info(
+                f"Diff coverage {budget['coverage']:.0%} below {settings.PROMPT_MIN_DIFF_COVERAGE:.0%} "
+                f"within {budget['limit']} tokens, using chunking mode"
+            )
+            return None
+
+        logger.info(f"Prompt fits token budget ({budget['prompt_tokens']}/{budget['limit']}), using standard analysis")
+        return {**commit_data, 'diff_data': packed_diff}
+
+    @staticmethod
+    def _complete_analysis(result: Dict[str, Any], commit_sha: str, commit_shas: List[str]) -> Dict[str, Any]:
+        result['commit_sha'] = commit_sha
+
+        if result.get('status') == 'success':
+            for sha in commit_shas:
+                mark_commit_as_processed(sha)
+
+        return result
+
+    def _should_analyze_per_push(
+        self,
+        webhook_data: Dict[str, Any],
+        commits: List[Dict],
+        new_commit_shas: set
+    ) -> bool:
+        if not settings.PUSH_ANALYSIS_MIN_COMMITS:
+            return False
+
+        before = webhook_data.get('before') or ''
+        if not before or set(before) == {'0'}:
+            # 신규 branch push 는 비교 기준이 없음
+            return False
+
+        if len(commits) < settings.PUSH_ANALYSIS_MIN_COMMITS:
+            return False
+
+        # 일부만 처리된 push (재전송 등) 는 compare diff 에 처리된 변경이 섞이므로 commit 단위로 처리
+        if any(commit.get('id') not in new_commit_shas for commit in commits):
+            return False
+
+        # 명시적 issue 참조가 있으면 commit 별 diff 로 issue 매핑이 필요
+        if any(parse_issue_id_from_message(commit.get('message', '')) for commit in commits):
+            return False
+
+        return True
+
+    def _process_push(
+        self,
+        project_id: int,
+        project_name: str,
+        commits: List[Dict],
+        webhook_data: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        before = webhook_data.get('before')
+        after = webhook_data.get('checkout_sha') or webhook_data.get('after')
+
+        target_commits = [commit for commit in commits if not self.should_skip_commit(commit)]
+        if not target_commits:
+            return None
+
+        logger.info(
+            f"Analyzing push {before[:8]}..{after[:8]} in {project_name} "
+            f"as a whole ({len(target_commits)} commits)"
+        )
+
+        compare_future = self.io_executor.submit(self.gitlab.compare_commits, project_id, before, after)
+        redmine_future = self.io_executor.submit(self._fetch_redmine_context, project_name)
+
+        compare = compare_future.result()
+        if not compare or compare.get('compare_timeout'):
+            logger.warning("Compare API unavailable for this push, falling back to per-commit analysis")
+            return None
+
+        redmine_project, open_issues = redmine_future.result()
+        if not redmine_project or open_issues is None:
+            # commit 단위 처리에서 동일한 실패 사유를 기록
+            return None
+
+        commit_data = self._push_commit_data(project_name, target_commits, webhook_data, compare)
+        open_issues = self._select_issues(
+            redmine_project['id'],
+            commit_data['commit_message'],
+            commit_data['diff_data'],
+            open_issues
+        )
+
+        push_result = self._analyze_and_apply(
+            redmine_project,
+            open_issues,
+            None,
+            commit_data,
+            [commit.get('id') for commit in target_commits]
+        )
+
+        return self._push_commit_results(push_result, commits, target_commits)
+
+    def _push_commit_data(
+        self,
+        project_name: str,
+        target_commits: List[Dict],
+        webhook_data: Dict[str, Any],
+        compare: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        commit_message = '\n'.join(
+            f"- {commit.get('message', '').strip().splitlines()[0]}"
+            for commit in target_commits
+            if commit.get('message', '').strip()
+        )
+
+        return {
+            'repository': project_name,
+            'branch': webhook_data.get('ref', 'unknown').split('/')[-1],
+            'author': webhook_data.get('user_name') or target_commits[-1].get('author', {}).get('name', 'Unknown'),
+            'commit_hash': webhook_data.get('checkout_sha') or webhook_data.get('after'),
+            'commit_message': commit_message,
+            'diff_data': self.gitlab.filter_and_summarize_diff(compare.get('diffs', []))
+        }
+
+    @staticmethod
+    def _push_commit_results(
+        push_result: Dict[str, Any],
+        commits: List[Dict],
+        target_commits: List[Dict]
+    ) -> List[Dict[str, Any]]:
+        push_result['mode'] = 'push'
+
+        skipped_results = [
+            {
+                'commit_sha': commit.get('id'),
+                'status': 'skipped',
+                'reason': 'Commit type should be skipped'
+            }
+            for commit in commits if commit not in target_commits
+        ]
+
+        return [
+            {**push_result, 'commit_sha': commit.get('id')}
+            for commit in target_commits
+        ] + skipped_results
+
+    async def process_commit_async(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+        # process_commit 과 동일한 흐름, GitLab 조회와 LLM 호출은 event loop 에서 비동기로 실행
+
+        result = {
+            'status': 'pending',
+            'timestamp': datetime.now().isoformat(),
+            'webhook_data': webhook_data
+        }
+
+        try:
+            project_id = webhook_data.get('project_id')
+            project_name = webhook_data.get('project', {}).get('name')
+            commits = webhook_data.get('commits', [])
+
+            if not commits:
+                result['status'] = 'skipped'
+                result['reason'] = 'No commits in webhook'
+                return result
+
+            new_commit_shas = set(await asyncio.to_thread(filter_new_commits, [commit.get('id') for commit in commits]))
+
+            if self._should_analyze_per_push(webhook_data, commits, new_commit_shas):
+                push_results = await self._process_push_async(project_id, project_name, commits, webhook_data)
+                if push_results is not None:
+                    result['commit_results'] = push_results
+                    result['status'] = 'success'
+                    return result
+
+            # 같은 issue 를 갱신하는 commit 들은 push 단위로 모아 issue 별로 한 번만 기록
+            writes = IssueWriteBatch(self.issue_writer)
+
+            for commit in commits:
+                commit_result = await self._process_single_commit_async(
+                    project_id,
+                    project_name,
+                    commit,
+                    webhook_data,
+                    already_processed=commit.get('id') not in new_commit_shas,
+                    writes=writes
+                )
+
+                result['commit_results'] = result.get('commit_results', [])
+                result['commit_results'].append(commit_result)
+
+            await writes.flush_async()
+
+            result['status'] = 'success'
+
+        except Exception as e:
+            logger.error(f"Error processing commit: {e}", exc_info=True)
+            result['status'] = 'failed'
+            result['error'] = str(e)
+
+        finally:
+            await asyncio.to_thread(log_sync_event, result)
+
+        return result
+
+    async def _process_single_commit_async(
+        self,
+        project_id: int,
+        project_name: str,
+        commit: Dict,
+        webhook_data: Dict,
+        already_processed: bool = False,
+        writes: Optional[IssueWriteBatch] = None
+    ) -> Dict[str, Any]:
+        commit_sha = commit.get('id')
+        commit_message = commit.get('message', '')
+        author_name = commit.get('author', {}).get('name', 'Unknown')
+
+        logger.info(f"Processing commit {commit_sha[:8]} in {project_name}")
+
+        result = self._precheck_commit(commit, already_processed)
+        if result['status'] == 'skipped':
+            return result
+
         explicit_issue_id = parse_issue_id_from_message(commit_message)
 
         if explicit_issue_id:
             logger.info(f"Commit explicitly references Redmine issue #{explicit_issue_id}")
-            return self._update_explicit_issue(
+            commit_diffs = await self.gitlab.get_commit_diff_async(project_id, commit_sha)
+            if commit_diffs is None:
+                result['status'] = 'failed'
+                result['error'] = 'Failed to fetch commit diff'
+                return result
+
+            return await self._update_explicit_issue_async(
                 explicit_issue_id,
                 commit_sha,
                 commit_message,
                 author_name,
-                diff_data
+                await asyncio.to_thread(self.gitlab.filter_and_summarize_diff, commit_diffs),
+                writes
             )
 
-        redmine_project = self.redmine.get_project_by_name(project_name)
+        # Redmine 컨텍스트는 캐시 갱신 시에만 동기 호출이 발생하므로 thread 에서 조회
+        commit_diffs, gitlab_issue, (redmine_project, open_issues) = await asyncio.gather(
+            self.gitlab.get_commit_diff_async(project_id, commit_sha),
+            self._fetch_gitlab_issue_async(project_id, commit_message),
+            asyncio.to_thread(self._fetch_redmine_context, project_name)
+        )
+
+        if commit_diffs is None:
+            result['status'] = 'failed'
+            result['error'] = 'Failed to fetch commit diff'
+            return result
+
+        diff_data = await asyncio.to_thread(self.gitlab.filter_and_summarize_diff, commit_diffs)
+
         if not redmine_project:
             result['status'] = 'failed'
             result['error'] = f'Redmine project not found: {project_name}'
             return result
 
-        # 최근 N일 이내 업데이트된 오픈 이슈만 가져옴 (new, in_progress)
-        # LLM 부하 감소를 위해 개수 제한
-        open_issues = self.redmine.get_issues(
-            project_id=redmine_project['id'],
-            status_id='open',
-            limit=settings.MAX_ISSUES_FOR_LLM,
-            updated_within_days=settings.REDMINE_ISSUE_SEARCH_DAYS
-        )
-
         if open_issues is None:
             result['status'] = 'failed'
             result['error'] = 'Failed to fetch Redmine issues'
             return result
 
-        gitlab_issue = None
-        gitlab_issue_number = self.gitlab.extract_gitlab_issue_from_commit(commit_message)
-        if gitlab_issue_number:
-            gitlab_issue = self.gitlab.get_issue(project_id, gitlab_issue_number)
+        # embedding 계산(OpenAI embedder 는 HTTP 호출)이 event loop 를 막지 않도록 thread 에서 실행
+        open_issues = await asyncio.to_thread(
+            self._select_issues,
+            redmine_project['id'],
+            commit_message,
+            diff_data,
+            open_issues
+        )
 
         commit_data = {
             'repository': project_name,
@@ -174,132 +623,305 @@ class CommitAnalyzer:
             'diff_data': diff_data
         }
 
-        estimated_prompt_size = len(commit_message) + len(format_redmine_issues(open_issues))
-        estimated_diff_tokens = estimate_tokens(json.dumps(diff_data.get('diffs', []), ensure_ascii=False))
-        total_estimated_tokens = estimated_prompt_size // 3 + estimated_diff_tokens + 3000
+        return await self._analyze_and_apply_async(
+            redmine_project,
+            open_issues,
+            gitlab_issue,
+            commit_data,
+            [commit_sha],
+            writes
+        )
 
-        logger.info(f"Estimated tokens: {total_estimated_tokens}")
+    async def _analyze_and_apply_async(
+        self,
+        redmine_project: Dict,
+        open_issues: list,
+        gitlab_issue: Optional[Dict],
+        commit_data: Dict[str, Any],
+        commit_shas: List[str],
+        writes: Optional[IssueWriteBatch] = None
+    ) -> Dict[str, Any]:
+        commit_sha = commit_data['commit_hash']
+        commit_message = commit_data['commit_message']
+        author_name = commit_data['author']
+        diff_data = commit_data['diff_data']
+
+        patch_id, cached = await asyncio.to_thread(
+            self._lookup_cache,
+            diff_data,
+            commit_message,
+            'analysis',
+            redmine_project['id']
+        )
 
-        if total_estimated_tokens > settings.TOKEN_BUDGET_LIMIT:
-            logger.info(f"Token limit exceeded ({total_estimated_tokens} > {settings.TOKEN_BUDGET_LIMIT}), using chunking mode")
-            analysis_result = self._analyze_with_chunking(
-                commit_data,
-                open_issues,
-                diff_data.get('diffs', [])
-            )
+        if cached:
+            analysis_result = self._reuse_cached_analysis(cached, commit_sha)
         else:
-            logger.info("Token budget within limit, using standard analysis")
-            analysis_result = self.chain.analyze(
-                commit_data,
-                open_issues,
-                gitlab_issue
-            )
+            # token 계산/SQLite 조회 등 blocking 작업은 event loop 밖에서 실행
+            packed_commit_data = await asyncio.to_thread(self._fit_prompt, commit_data, open_issues, gitlab_issue)
+            if packed_commit_data is None:
+                analysis_result = await self._analyze_with_chunking_async(
+                    commit_data,
+                    open_issues,
+                    diff_data.get('diffs', [])
+                )
+            else:
+                analysis_result = await self.chain.analyze_async(
+                    packed_commit_data,
+                    open_issues,
+                    gitlab_issue
+                )
 
         if not analysis_result:
-            result['status'] = 'failed'
-            result['error'] = 'LLM analysis failed'
-            return result
+            return {
+                'commit_sha': commit_sha,
+                'status': 'failed',
+                'error': 'LLM analysis failed'
+            }
+
+        finish = partial(
+            self._finish_analysis,
+            patch_id=patch_id,
+            analysis_result=analysis_result,
+            cached=bool(cached),
+            commit_sha=commit_sha,
+            commit_shas=commit_shas
+        )
 
         if analysis_result['action'] == 'create':
-            result = self._create_issue(
+            result = await self._create_issue_async(
                 redmine_project['id'],
                 analysis_result,
                 commit_sha,
                 author_name
             )
-        else:
-            result = self._update_issue(
-                analysis_result['redmine_issue_id'],
-                analysis_result,
-                commit_sha,
-                commit_message,
-                author_name
-            )
+            return await asyncio.to_thread(finish, result)
+
+        # 갱신은 push 단위로 모아 기록되므로 기록이 끝난 뒤 finish 가 호출됨
+        return await self._update_issue_async(
+            analysis_result['redmine_issue_id'],
+            analysis_result,
+            commit_sha,
+            commit_message,
+            author_name,
+            writes,
+            on_done=finish
+        )
 
-        if result.get('status') == 'success':
-            mark_commit_as_processed(commit_sha)
+    async def _process_push_async(
+        self,
+        project_id: int,
+        project_name: str,
+        commits: List[Dict],
+        webhook_data: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        before = webhook_data.get('before')
+        after = webhook_data.get('checkout_sha') or webhook_data.get('after')
+
+        target_commits = [commit for commit in commits if not self.should_skip_commit(commit)]
+        if not target_commits:
+            return None
+
+        logger.info(
+            f"Analyzing push {before[:8]}..{after[:8]} in {project_name} "
+            f"as a whole ({len(target_commits)} commits)"
+        )
+
+        compare, (redmine_project, open_issues) = await asyncio.gather(
+            self.gitlab.compare_commits_async(project_id, before, after),
+            asyncio.to_thread(self._fetch_redmine_context, project_name)
+        )
+
+        if not compare or compare.get('compare_timeout'):
+            logger.warning("Compare API unavailable for this push, falling back to per-commit analysis")
+            return None
+
+        if not redmine_project or open_issues is None:
+            return None
+
+        commit_data = await asyncio.to_thread(self._push_commit_data, project_name, target_commits, webhook_data, compare)
+        open_issues = await asyncio.to_thread(
+            self._select_issues,
+            redmine_project['id'],
+            commit_data['commit_message'],
+            commit_data['diff_data'],
+            open_issues
+        )
+
+        push_result = await self._analyze_and_apply_async(
+            redmine_project,
+            open_issues,
+            None,
+            commit_data,
+            [commit.get('id') for commit in target_commits]
+        )
+
+        return self._push_commit_results(push_result, commits, target_commits)
+
+    def _precheck_commit(self, commit: Dict, already_processed: bool) -> Dict[str, Any]:
+        commit_sha = commit.get('id')
+
+        result = {
+            'commit_sha': commit_sha,
+            'status': 'pending'
+        }
+
+        if self.should_skip_commit(commit):
+            result['status'] = 'skipped'
+            result['reason'] = 'Commit type should be skipped'
+            return result
+
+        if already_processed:
+            logger.info(f"Commit {commit_sha[:8]} already processed, skipping")
+            result['status'] = 'skipped'
+            result['reason'] = 'Commit already processed'
+            return result
 
         return result
 
+    def _fetch_gitlab_issue(self, project_id: int, commit_message: str) -> Optional[Dict]:
+        gitlab_issue_number = self.gitlab.extract_gitlab_issue_from_commit(commit_message)
+        if not gitlab_issue_number:
+            return None
+
+        return self.gitlab.get_issue(project_id, gitlab_issue_number)
+
+    async def _fetch_gitlab_issue_async(self, project_id: int, commit_message: str) -> Optional[Dict]:
+        gitlab_issue_number = self.gitlab.extract_gitlab_issue_from_commit(commit_message)
+        if not gitlab_issue_number:
+            return None
+
+        return await self.gitlab.get_issue_async(project_id, gitlab_issue_number)
+
+    def _fetch_redmine_context(self, project_name: str) -> Tuple[Optional[Dict], Optional[List[Dict]]]:
+        redmine_project = self.redmine.get_project_by_name(project_name)
+        if not redmine_project:
+            return None, None
+
+        # 최근 N일 이내 업데이트된 오픈 이슈만 가져옴 (new, in_progress)
+        # LLM 부하 감소를 위해 개수 제한, 공유 스냅샷에서 조회하므로 Redmine 호출 없음
+        open_issues = self.issue_snapshot.get_recent_issues(
+            redmine_project['id'],
+            limit=settings.MAX_ISSUES_FOR_LLM,
+            updated_within_days=settings.REDMINE_ISSUE_SEARCH_DAYS
+        )
+
+        return redmine_project, open_issues
+
+    def _select_issues(
+        self,
+        project_id: int,
+        commit_message: str,
+        diff_data: Dict[str, Any],
+        recent_issues: List[Dict]
+    ) -> List[Dict]:
+        # commit 과 관련도 높은 issue 를 먼저 채우고 남는 자리는 최근 갱신 issue 로 채움
+        if settings.ISSUE_RANKING == 'recent':
+            return recent_issues
+
+        diffs = diff_data.get('diffs', [])
+        ranked = self.issue_snapshot.rank_issues(
+            project_id,
+            build_commit_query(commit_message, diffs),
+            build_commit_text(commit_message, diffs),
+            settings.MAX_ISSUES_FOR_LLM
+        )
+        if not ranked:
+            return recent_issues
+
+        selected = {issue['id']: issue for issue in ranked}
+        for issue in recent_issues:
+            if len(selected) >= settings.MAX_ISSUES_FOR_LLM:
+                break
+            selected.setdefault(issue['id'], issue)
+
+        logger.info(f"Selected {len(ranked)} relevant issues for LLM: {[issue['id'] for issue in ranked]}")
+        return list(selected.values())
+
     def _update_explicit_issue(
         self,
         issue_id: int,
         commit_sha: str,
         commit_message: str,
         author: str,
-        diff_data: Dict
+        diff_data: Dict,
+        writes: Optional[IssueWriteBatch] = None
     ) -> Dict[str, Any]:
         result = {'status': 'pending', 'action': 'update', 'issue_id': issue_id}
 
         try:
-            existing_issue = self.redmine.get_issue(issue_id)
-            if not existing_issue:
+            # 없는 issue 번호면 문서화(LLM) 호출 전에 실패 처리
+            if not self._known_issue(issue_id, writes) and self.redmine.get_issue(issue_id) is None:
                 result['status'] = 'failed'
                 result['error'] = f'Issue #{issue_id} not found'
+                logger.warning(f"Explicitly referenced Redmine issue #{issue_id} not found")
                 return result
 
-            logger.info(f"Generating documentation for explicit issue #{issue_id}")
-            doc_result = self.chain.document_commit(
-                commit_message,
-                diff_data,
-                author
-            )
+            patch_id, cached = self._lookup_cache(diff_data, commit_message, 'documentation')
 
-            if not doc_result:
-                # LLM 실패 시 기본값
-                commit_documentation = f"* {commit_message}"
-                done_ratio = 50
-                status_id = 2
-                logger.warning("Failed to generate LLM documentation, using fallback values")
+            if cached:
+                logger.info(f"Reusing cached documentation for explicit issue #{issue_id}")
+                doc_result = cached['documentation']
             else:
-                commit_documentation = doc_result.get('documentation', f"* {commit_message}")
-                done_ratio = doc_result.get('done_ratio', 50)
-                status_id = doc_result.get('status_id', 2)
-
-            push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            existing_description = existing_issue.get('description', '')
-            if not existing_description:
-                existing_description = ''
-
-            update_history_marker = "\n\n----\n\nh3. 업데이트 이력\n\n"
+                logger.info(f"Generating documentation for explicit issue #{issue_id}")
+                doc_result = self.chain.document_commit(
+                    commit_message,
+                    diff_data,
+                    author
+                )
+                if doc_result:
+                    self.analysis_cache.set(patch_id, {'documentation': doc_result})
 
-            total_files = diff_data['summary']['total_files']
-            total_additions = diff_data['summary']['total_additions']
-            total_deletions = diff_data['summary']['total_deletions']
+            entry, fields = self._build_explicit_update(issue_id, commit_sha, commit_message, diff_data, doc_result)
+            batch = self._queue_update(result, issue_id, entry, fields, writes, commit_sha=commit_sha)
+            if writes is None:
+                batch.flush()
 
-            new_update_entry = (
-                f"h4. {push_timestamp}\n\n"
-                f"{commit_documentation}\n\n"
-                f"*Commit*: @{commit_sha[:8]}@\n"
-                f"*변경*: {total_files}개 파일 (@@+{total_additions}@@ / @@-{total_deletions}@@)\n"
-            )
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+            logger.error(f"Error updating explicit issue: {e}", exc_info=True)
 
-            if "h3. 업데이트 이력" in existing_description:
-                updated_description = existing_description + "\n----\n\n" + new_update_entry
-            else:
-                updated_description = existing_description + update_history_marker + new_update_entry
+        return result
 
-            update_data = {
-                'description': updated_description,
-                'done_ratio': done_ratio,
-                'status_id': status_id
-            }
+    async def _update_explicit_issue_async(
+        self,
+        issue_id: int,
+        commit_sha: str,
+        commit_message: str,
+        author: str,
+        diff_data: Dict,
+        writes: Optional[IssueWriteBatch] = None
+    ) -> Dict[str, Any]:
+        result = {'status': 'pending', 'action': 'update', 'issue_id': issue_id}
 
-            logger.info(
-                f"Updating issue #{issue_id}: done_ratio={done_ratio}%, status_id={status_id}"
-            )
+        try:
+            # 없는 issue 번호면 문서화(LLM) 호출 전에 실패 처리
+            if not self._known_issue(issue_id, writes) and await self.redmine.get_issue_async(issue_id) is None:
+                result['status'] = 'failed'
+                result['error'] = f'Issue #{issue_id} not found'
+                logger.warning(f"Explicitly referenced Redmine issue #{issue_id} not found")
+                return result
 
-            updated = self.redmine.update_issue(issue_id, update_data, notes=None)
+            patch_id, cached = await asyncio.to_thread(self._lookup_cache, diff_data, commit_message, 'documentation')
 
-            if updated:
-                result['status'] = 'success'
-                result['updated_issue'] = updated
-                logger.info(f"Successfully updated Redmine issue #{issue_id} with update history")
-                mark_commit_as_processed(commit_sha)
+            if cached:
+                logger.info(f"Reusing cached documentation for explicit issue #{issue_id}")
+                doc_result = cached['documentation']
             else:
-                result['status'] = 'failed'
-                result['error'] = 'Failed to update issue'
+                logger.info(f"Generating documentation for explicit issue #{issue_id}")
+                doc_result = await self.chain.document_commit_async(
+                    commit_message,
+                    diff_data,
+                    author
+                )
+                if doc_result:
+                    await asyncio.to_thread(self.analysis_cache.set, patch_id, {'documentation': doc_result})
+
+            entry, fields = self._build_explicit_update(issue_id, commit_sha, commit_message, diff_data, doc_result)
+            batch = self._queue_update(result, issue_id, entry, fields, writes, commit_sha=commit_sha)
+            if writes is None:
+                await batch.flush_async()
 
         except Exception as e:
             result['status'] = 'failed'
@@ -308,6 +930,143 @@ class CommitAnalyzer:
 
         return result
 
+    def _known_issue(self, issue_id: int, writes: Optional[IssueWriteBatch]) -> bool:
+        # 스냅샷의 open issue 이거나 같은 push 에서 이미 확인한 issue 면 Redmine 조회 생략
+        return (writes is not None and issue_id in writes) or self.issue_snapshot.find_issue(issue_id) is not None
+
+    def _build_explicit_update(
+        self,
+        issue_id: int,
+        commit_sha: str,
+        commit_message: str,
+        diff_data: Dict,
+        doc_result: Optional[Dict]
+    ) -> Tuple[str, Dict[str, Any]]:
+        if not doc_result:
+            # LLM 실패 시 기본값
+            commit_documentation = f"* {commit_message}"
+            done_ratio = 50
+            status_id = 2
+            logger.warning("Failed to generate LLM documentation, using fallback values")
+        else:
+            commit_documentation = doc_result.get('documentation', f"* {commit_message}")
+            done_ratio = doc_result.get('done_ratio', 50)
+            status_id = doc_result.get('status_id', 2)
+
+        push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        total_files = diff_data['summary']['total_files']
+        total_additions = diff_data['summary']['total_additions']
+        total_deletions = diff_data['summary']['total_deletions']
+
+        new_update_entry = (
+            f"h4. {push_timestamp}\n\n"
+            f"{commit_documentation}\n\n"
+            f"*Commit*: @{commit_sha[:8]}@\n"
+            f"*변경*: {total_files}개 파일 (@@+{total_additions}@@ / @@-{total_deletions}@@)\n"
+        )
+
+        logger.info(
+            f"Updating issue #{issue_id}: done_ratio={done_ratio}%, status_id={status_id}"
+        )
+
+        return new_update_entry, {
+            'done_ratio': done_ratio,
+            'status_id': status_id
+        }
+
+    def _build_analysis_update(self, issue_id: int, analysis: Dict, commit_sha: str) -> Tuple[str, Dict[str, Any]]:
+        push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        new_update_entry = (
+            f"h4. {push_timestamp}\n\n"
+            f"{analysis.get('description', '')}\n\n"
+            f"*Commit*: @{commit_sha[:8]}@\n"
+            f"*Confidence*: {analysis.get('confidence', 'N/A')}%\n"
+        )
+
+        logger.info(
+            f"Updating issue #{issue_id}: done_ratio={analysis['done_ratio']}%, "
+            f"priority_id={analysis['priority_id']}"
+        )
+
+        return new_update_entry, {
+            'done_ratio': analysis['done_ratio'],
+            'priority_id': analysis['priority_id']
+        }
+
+    def _queue_update(
+        self,
+        result: Dict[str, Any],
+        issue_id: int,
+        entry: str,
+        fields: Dict[str, Any],
+        writes: Optional[IssueWriteBatch],
+        commit_sha: Optional[str] = None,
+        on_done: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> IssueWriteBatch:
+        # push batch 가 없으면 호출한 쪽에서 바로 flush 할 단독 batch 사용
+        batch = writes if writes is not None else IssueWriteBatch(self.issue_writer)
+
+        def done(updated: Optional[Dict], error: Optional[str]):
+            self._finish_update(result, issue_id, updated, commit_sha, error)
+            if on_done:
+                on_done(result)
+
+        result['status'] = 'queued'
+        batch.add(issue_id, entry, fields, done)
+        return batch
+
+    def _build_create_data(self, project_id: int, analysis: Dict, commit_sha: str, author: str) -> Dict[str, Any]:
+        push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        return {
+            'project_id': project_id,
+            'subject': analysis['subject'],
+            'description': (
+                f"{analysis['description']}\n\n"
+                f"----\n\n"
+                f"h3. 업데이트 이력\n\n"
+                f"h4. {push_timestamp}\n\n"
+                f"*Commit*: @{commit_sha[:8]}@\n"
+                f"*Author*: {author}\n"
+                f"*Confidence*: {analysis.get('confidence', 'N/A')}%"
+            ),
+            'tracker_id': analysis['tracker_id'],
+            'priority_id': analysis['priority_id'],
+            'done_ratio': analysis['done_ratio'],
+            'start_date': datetime.now().strftime('%Y-%m-%d')
+        }
+
+    def _finish_update(
+        self,
+        result: Dict[str, Any],
+        issue_id: int,
+        updated: Optional[Dict],
+        commit_sha: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        if updated:
+            result['status'] = 'success'
+            result['updated_issue'] = updated
+            self.issue_snapshot.record_issue(updated)
+            logger.info(f"Successfully updated Redmine issue #{issue_id} with update history")
+            if commit_sha:
+                mark_commit_as_processed(commit_sha)
+        else:
+            result['status'] = 'failed'
+            result['error'] = error or 'Failed to update issue'
+
+    def _finish_create(self, result: Dict[str, Any], created_issue: Optional[Dict]):
+        if created_issue:
+            result['status'] = 'success'
+            result['created_issue'] = created_issue
+            self.issue_snapshot.record_issue(created_issue)
+            logger.info(f"Successfully created Redmine issue #{created_issue['id']}")
+        else:
+            result['status'] = 'failed'
+            result['error'] = 'Failed to create issue'
+
     def _create_issue(
         self,
         project_id: int,
@@ -318,35 +1077,9 @@ class CommitAnalyzer:
         result = {'status': 'pending', 'action': 'create'}
 
         try:
-            push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            issue_data = {
-                'project_id': project_id,
-                'subject': analysis['subject'],
-                'description': (
-                    f"{analysis['description']}\n\n"
-                    f"----\n\n"
-                    f"h3. 업데이트 이력\n\n"
-                    f"h4. {push_timestamp}\n\n"
-                    f"*Commit*: @{commit_sha[:8]}@\n"
-                    f"*Author*: {author}\n"
-                    f"*Confidence*: {analysis.get('confidence', 'N/A')}%"
-                ),
-                'tracker_id': analysis['tracker_id'],
-                'priority_id': analysis['priority_id'],
-                'done_ratio': analysis['done_ratio'],
-                'start_date': datetime.now().strftime('%Y-%m-%d')
-            }
-
+            issue_data = self._build_create_data(project_id, analysis, commit_sha, author)
             created_issue = self.redmine.create_issue(issue_data)
-
-            if created_issue:
-                result['status'] = 'success'
-                result['created_issue'] = created_issue
-                logger.info(f"Successfully created Redmine issue #{created_issue['id']}")
-            else:
-                result['status'] = 'failed'
-                result['error'] = 'Failed to create issue'
+            self._finish_create(result, created_issue)
 
         except Exception as e:
             result['status'] = 'failed'
@@ -355,68 +1088,78 @@ class CommitAnalyzer:
 
         return result
 
-    def _update_issue(
+    async def _create_issue_async(
         self,
-        issue_id: int,
+        project_id: int,
         analysis: Dict,
         commit_sha: str,
-        commit_message: str,
         author: str
     ) -> Dict[str, Any]:
-        result = {'status': 'pending', 'action': 'update', 'issue_id': issue_id}
+        result = {'status': 'pending', 'action': 'create'}
 
         try:
-            existing_issue = self.redmine.get_issue(issue_id)
-            if not existing_issue:
-                result['status'] = 'failed'
-                result['error'] = f'Issue #{issue_id} not found'
-                return result
+            issue_data = self._build_create_data(project_id, analysis, commit_sha, author)
+            created_issue = await self.redmine.create_issue_async(issue_data)
+            await asyncio.to_thread(self._finish_create, result, created_issue)
 
-            push_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            existing_description = existing_issue.get('description', '')
-            if not existing_description:
-                existing_description = ''
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+            logger.error(f"Error creating issue: {e}")
 
-            update_history_marker = "\n\n----\n\nh3. 업데이트 이력\n\n"
+        return result
 
-            new_update_entry = (
-                f"h4. {push_timestamp}\n\n"
-                f"{analysis.get('description', '')}\n\n"
-                f"*Commit*: @{commit_sha[:8]}@\n"
-                f"*Confidence*: {analysis.get('confidence', 'N/A')}%\n"
-            )
+    def _update_issue(
+        self,
+        issue_id: int,
+        analysis: Dict,
+        commit_sha: str,
+        commit_message: str,
+        author: str,
+        writes: Optional[IssueWriteBatch] = None,
+        on_done: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        result = {'status': 'pending', 'action': 'update', 'issue_id': issue_id}
 
-            if "h3. 업데이트 이력" in existing_description:
-                updated_description = existing_description + "\n----\n\n" + new_update_entry
-            else:
-                updated_description = existing_description + update_history_marker + new_update_entry
+        try:
+            entry, fields = self._build_analysis_update(issue_id, analysis, commit_sha)
+            batch = self._queue_update(result, issue_id, entry, fields, writes, on_done=on_done)
+            if writes is None:
+                batch.flush()
 
-            update_data = {
-                'description': updated_description,
-                'done_ratio': analysis['done_ratio'],
-                'priority_id': analysis['priority_id']
-            }
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+            logger.error(f"Error updating issue: {e}")
+            if on_done:
+                on_done(result)
 
-            logger.info(
-                f"Updating issue #{issue_id}: done_ratio={analysis['done_ratio']}%, "
-                f"priority_id={analysis['priority_id']}"
-            )
+        return result
 
-            updated_issue = self.redmine.update_issue(issue_id, update_data, notes=None)
+    async def _update_issue_async(
+        self,
+        issue_id: int,
+        analysis: Dict,
+        commit_sha: str,
+        commit_message: str,
+        author: str,
+        writes: Optional[IssueWriteBatch] = None,
+        on_done: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        result = {'status': 'pending', 'action': 'update', 'issue_id': issue_id}
 
-            if updated_issue:
-                result['status'] = 'success'
-                result['updated_issue'] = updated_issue
-                logger.info(f"Successfully updated Redmine issue #{issue_id} with update history")
-            else:
-                result['status'] = 'failed'
-                result['error'] = 'Failed to update issue'
+        try:
+            entry, fields = self._build_analysis_update(issue_id, analysis, commit_sha)
+            batch = self._queue_update(result, issue_id, entry, fields, writes, on_done=on_done)
+            if writes is None:
+                await batch.flush_async()
 
         except Exception as e:
             result['status'] = 'failed'
             result['error'] = str(e)
             logger.error(f"Error updating issue: {e}")
+            if on_done:
+                await asyncio.to_thread(on_done, result)
 
         return result
 
@@ -427,26 +1170,32 @@ class CommitAnalyzer:
         diffs: list
     ) -> Optional[Dict[str, Any]]:
         try:
-            chunks = chunk_diff_data(
-                diffs,
-                max_lines=settings.CHUNK_MAX_LINES,
-                max_files=settings.CHUNK_MAX_FILES
-            )
+            # offset 기반 계획으로 청크 수를 먼저 확정하고, 청크 내용은 worker 에서 실행 직전에 생성
+            plan = self.chunk_planner.plan(diffs)
 
-            total_chunks = len(chunks)
+            total_chunks = len(plan)
             logger.info(f"Split into {total_chunks} chunks")
 
-            chunk_results = []
+            # 청크 분석은 서로 독립적이므로 동시에 실행하고, 결과는 청크 순서대로 수집
+            results = self._run_chunk_calls(
+                [
+                    partial(
+                        self._analyze_planned_chunk,
+                        diffs,
+                        pieces,
+                        idx,
+                        total_chunks,
+                        commit_data,
+                        open_issues
+                    )
+                    for idx, pieces in enumerate(plan, 1)
+                ],
+                lambda idx: f"Chunk {idx} analysis"
+            )
 
-            for idx, chunk in enumerate(chunks, 1):
-                chunk_result = self.chain.analyze_chunk(
-                    chunk_data=chunk,
-                    chunk_index=idx,
-                    total_chunks=total_chunks,
-                    commit_data=commit_data,
-                    redmine_issues=open_issues
-                )
+            chunk_results = []
 
+            for idx, chunk_result in enumerate(results, 1):
                 if chunk_result:
                     chunk_results.append(chunk_result)
                 else:
@@ -456,6 +1205,8 @@ class CommitAnalyzer:
                 logger.error("All chunk analyses failed")
                 return None
 
+            chunk_results = self._reduce_chunk_results(chunk_results, commit_data)
+
             logger.info("Synthesizing chunk results...")
             final_result = self.chain.synthesize_results(
                 chunk_results=chunk_results,
@@ -468,3 +1219,200 @@ class CommitAnalyzer:
         except Exception as e:
             logger.error(f"Error in chunking analysis: {e}", exc_info=True)
             return None
+
+    def _reduce_chunk_results(self, chunk_results: list, commit_data: Dict[str, Any]) -> list:
+        # 결과가 많으면 fan-in 개씩 묶어 mini 모델로 병렬 병합하고, 마지막 단계만 gpt-4o 로 종합
+        level = 0
+
+        while self._needs_merge(chunk_results, level):
+            level += 1
+            groups = self._merge_groups(chunk_results)
+
+            results = self._run_chunk_calls(
+                [
+                    partial(
+                        self.chain.merge_chunk_results,
+                        group,
+                        commit_data,
+                        level,
+                        idx,
+                        len(groups)
+                    ) if len(group) > 1 else None
+                    for idx, group in enumerate(groups, 1)
+                ],
+                lambda idx, level=level: f"Chunk merge (level {level}, group {idx})"
+            )
+
+            merged = []
+            for group, merged_result in zip(groups, results):
+                # 병합에 실패한 그룹은 원래 결과를 그대로 다음 단계로 넘김
+                merged.extend([merged_result] if merged_result else group)
+
+            if not self._merge_progressed(chunk_results, merged, level):
+                break
+            chunk_results = merged
+
+        return chunk_results
+
+    def _run_chunk_calls(self, calls: List[Optional[Callable[[], Any]]], describe: Callable[[int], str]) -> List[Any]:
+        # 공유 chunk_executor 에서 실행. 제한 시간은 대기열에서 꺼내 실제로 시작한 시점부터 계산하며,
+        # 시간을 넘긴 호출은 결과를 기다리지 않고 None 으로 처리 (실행 중인 호출은 취소할 수 없음)
+        timeout = settings.CHUNK_ANALYSIS_TIMEOUT
+        started: Dict[int, float] = {}
+
+        def run(idx: int, call: Callable[[], Any]) -> Any:
+            started[idx] = time.monotonic()
+            return call()
+
+        futures = {
+            self.chunk_executor.submit(run, idx, call): idx
+            for idx, call in enumerate(calls)
+            if call is not None
+        }
+        results: List[Any] = [None] * len(calls)
+        pending = set(futures)
+
+        while pending:
+            deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+            # 아직 시작하지 않은 호출이 있으면 시작 시점을 놓치지 않도록 짧게 대기
+            if len(deadlines) < len(pending):
+                deadlines.append(time.monotonic() + self.CHUNK_POLL_INTERVAL)
+
+            done, pending = wait(pending, timeout=max(0.0, min(deadlines) - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+
+            now = time.monotonic()
+            for future in list(pending):
+                idx = futures[future]
+                if idx in started and now - started[idx] >= timeout:
+                    pending.discard(future)
+                    logger.warning(f"{describe(idx + 1)} timed out after {timeout}s")
+
+        return results
+
+    async def _reduce_chunk_results_async(self, chunk_results: list, commit_data: Dict[str, Any]) -> list:
+        level = 0
+        semaphore = asyncio.Semaphore(settings.CHUNK_ANALYSIS_CONCURRENCY)
+
+        async def merge(group: list, level: int, idx: int, group_count: int) -> Optional[Dict[str, Any]]:
+            if len(group) < 2:
+                return None
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self.chain.merge_chunk_results_async(group, commit_data, level, idx, group_count),
+                        timeout=settings.CHUNK_ANALYSIS_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"Chunk merge (level {level}, group {idx}) timed out")
+                    return None
+
+        while self._needs_merge(chunk_results, level):
+            level += 1
+            groups = self._merge_groups(chunk_results)
+
+            results = await asyncio.gather(
+                *(merge(group, level, idx, len(groups)) for idx, group in enumerate(groups, 1))
+            )
+
+            merged = []
+            for group, merged_result in zip(groups, results):
+                merged.extend([merged_result] if merged_result else group)
+
+            if not self._merge_progressed(chunk_results, merged, level):
+                break
+            chunk_results = merged
+
+        return chunk_results
+
+    @staticmethod
+    def _needs_merge(chunk_results: list, level: int) -> bool:
+        return len(chunk_results) > max(2, settings.SYNTHESIS_FAN_IN) and level < settings.SYNTHESIS_MAX_DEPTH
+
+    @staticmethod
+    def _merge_groups(chunk_results: list) -> List[list]:
+        fan_in = max(2, settings.SYNTHESIS_FAN_IN)
+        return [chunk_results[i:i + fan_in] for i in range(0, len(chunk_results), fan_in)]
+
+    @staticmethod
+    def _merge_progressed(before: list, after: list, level: int) -> bool:
+        logger.info(f"Merge level {level}: {len(before)} -> {len(after)} chunk results")
+        return len(after) < len(before)
+
+    def _analyze_planned_chunk(
+        self,
+        diffs: list,
+        pieces: list,
+        chunk_index: int,
+        total_chunks: int,
+        commit_data: Dict[str, Any],
+        open_issues: list
+    ) -> Optional[Dict[str, Any]]:
+        return self.chain.analyze_chunk(
+            chunk_data=self.chunk_planner.materialize(diffs, pieces),
+            chunk_index=chunk_index,
+            total_chunks=total_chunks,
+            commit_data=commit_data,
+            redmine_issues=open_issues
+        )
+
+    async def _analyze_with_chunking_async(
+        self,
+        commit_data: Dict[str, Any],
+        open_issues: list,
+        diffs: list
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            plan = await asyncio.to_thread(self.chunk_planner.plan, diffs)
+
+            total_chunks = len(plan)
+            logger.info(f"Split into {total_chunks} chunks")
+
+            semaphore = asyncio.Semaphore(settings.CHUNK_ANALYSIS_CONCURRENCY)
+
+            async def analyze(idx: int, pieces: list) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    # 청크 내용은 실행 슬롯을 얻은 뒤에 생성
+                    chunk = await asyncio.to_thread(self.chunk_planner.materialize, diffs, pieces)
+                    try:
+                        return await asyncio.wait_for(
+                            self.chain.analyze_chunk_async(
+                                chunk_data=chunk,
+                                chunk_index=idx,
+                                total_chunks=total_chunks,
+                                commit_data=commit_data,
+                                redmine_issues=open_issues
+                            ),
+                            timeout=settings.CHUNK_ANALYSIS_TIMEOUT
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Chunk {idx} analysis timed out after {settings.CHUNK_ANALYSIS_TIMEOUT}s")
+                        return None
+
+            # gather 는 입력 순서대로 결과를 반환하므로 청크 순서가 유지됨
+            results = await asyncio.gather(*(analyze(idx, pieces) for idx, pieces in enumerate(plan, 1)))
+
+            chunk_results = []
+            for idx, chunk_result in enumerate(results, 1):
+                if chunk_result:
+                    chunk_results.append(chunk_result)
+                else:
+                    logger.warning(f"Chunk {idx} analysis failed, continuing...")
+
+            if not chunk_results:
+                logger.error("All chunk analyses failed")
+                return None
+
+            chunk_results = await self._reduce_chunk_results_async(chunk_results, commit_data)
+
+            logger.info("Synthesizing chunk results...")
+            return await self.chain.synthesize_results_async(
+                chunk_results=chunk_results,
+                commit_data=commit_data,
+                redmine_issues=open_issues
+            )
+
+        except Exception as e:
+            logger.error(f"Error in chunking analysis: {e}", exc_info=True)
+            return None
@@ -0,0 +1,157 @@
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+from app.config import LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessedCommitStore:
+    """
+    처리 완료 commit 인덱스 (SQLite, full SHA 기준).
+
+    최초 실행 시 기존 processed_commits.log / sync-*.log 내용을 한 번만 이관합니다.
+    """
+
+    # SQLite 기본 변수 개수 제한(999) 이내로 IN 쿼리를 나눔
+    BATCH_SIZE = 500
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or (LOGS_DIR / "processed_commits.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_commits ("
+            "sha TEXT PRIMARY KEY, processed_at TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+        self._migrate_legacy_logs()
+
+    def contains(self, commit_sha: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed_commits WHERE sha = ?",
+                (commit_sha,)
+            ).fetchone()
+        return row is not None
+
+    def filter_new(self, commit_shas: Iterable[str]) -> List[str]:
+        commit_shas = [sha for sha in commit_shas if sha]
+        processed = set()
+
+        with self._lock:
+            for start in range(0, len(commit_shas), self.BATCH_SIZE):
+                batch = commit_shas[start:start + self.BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT sha FROM processed_commits WHERE sha IN ({placeholders})",
+                    batch
+                ).fetchall()
+                processed.update(row[0] for row in rows)
+
+        return [sha for sha in commit_shas if sha not in processed]
+
+    def add(self, commit_sha: str):
+        self.add_many([commit_sha])
+
+    def add_many(self, commit_shas: Iterable[str]):
+        now = datetime.now().isoformat()
+        rows = [(sha, now) for sha in commit_shas if sha]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed_commits (sha, processed_at) VALUES (?, ?)",
+                rows
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM processed_commits").fetchone()[0]
+
+    def _migrate_legacy_logs(self):
+        with self._lock:
+            migrated = self._conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'legacy_migrated'"
+            ).fetchone()
+        if migrated:
+            return
+
+        shas = set()
+
+        tracking_file = LOGS_DIR / "processed_commits.log"
+        if tracking_file.exists():
+            with open(tracking_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    sha = line.strip().rsplit('|', 1)[-1]
+                    if sha:
+                        shas.add(sha)
+
+        # 기존 동작과 동일하게 sync 로그에 기록된 commit 은 모두 처리된 것으로 간주
+        for log_file in sorted(LOGS_DIR.glob("sync-*.log")):
+            try:
+                with open(log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        shas.update(self._shas_from_sync_event(line))
+            except Exception as e:
+                logger.warning(f"Error reading log file {log_file}: {e}")
+
+        self.add_many(shas)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_migrated', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        logger.info(f"Migrated {len(shas)} processed commit(s) from legacy log files")
+
+    @staticmethod
+    def _shas_from_sync_event(line: str) -> List[str]:
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+
+        shas = [
+            commit.get('id')
+            for commit in (event.get('webhook_data') or {}).get('commits', [])
+        ]
+        shas.extend(
+            commit_result.get('commit_sha')
+            for commit_result in event.get('commit_results', [])
+        )
+        return [sha for sha in shas if isinstance(sha, str)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[ProcessedCommitStore] = None
+_store_lock = threading.Lock()
+
+
+def get_processed_commit_store() -> ProcessedCommitStore:
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProcessedCommitStore()
+
+    return _store
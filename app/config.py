@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -26,6 +26,7 @@ class Settings(BaseSettings):
 
     PROJECT_MAPPING: Dict[str, str] = Field(default_factory=dict)
     REDMINE_PROJECT_SUFFIX: str = "::AI"
+    REDMINE_PROJECT_CACHE_TTL: int = 600  # Redmine project 목록 캐시 갱신 주기 (초)
 
     # Ignored file patterns for diff filtering
     IGNORED_PATTERNS: List[str] = Field(default_factory=lambda: [
@@ -50,17 +51,73 @@ class Settings(BaseSettings):
         "*.eot",
     ])
 
-    # Diff size limits
-    MAX_DIFF_LINES: int = 500  # Full diff까지 허용하는 최대 라인 수
-    MAX_SUMMARY_LINES: int = 2000  # Summary로 처리하는 최대 라인 수
-
     # LLM optimization
     MAX_ISSUES_FOR_LLM: int = 15
+    # Issue 후보 선택 - hybrid: BM25 + 벡터 유사도 순위 결합, bm25: commit message/경로/diff 식별자 기준 BM25,
+    # vector: 벡터 유사도, recent: 최근 갱신 순 (스냅샷의 전체 open issue 중에서 MAX_ISSUES_FOR_LLM 개만 prompt 에 포함)
+    ISSUE_RANKING: str = "hybrid"
+    ISSUE_QUERY_MAX_IDENTIFIERS: int = 50  # 관련 issue 검색에 사용하는 diff 식별자 최대 개수 (빈도순)
+    ISSUE_EMBEDDER: str = "hashing"  # hashing: 외부 호출 없는 hashing trick, openai: OpenAI embedding API
+    ISSUE_EMBEDDING_DIM: int = 1024  # hashing embedder 차원
+    ISSUE_EMBEDDING_MODEL: str = "text-embedding-3-small"  # openai embedder 모델
+    ISSUE_VECTOR_MIN_SIMILARITY: float = 0.2  # 이보다 낮은 cosine 유사도는 후보에서 제외 (hashing 충돌 잡음 제거)
+
+    # Model routing - 작은 commit 은 gpt-4o-mini 로 먼저 분석, 검증 실패/낮은 confidence 시 gpt-4o 로 재분석
+    MODEL_ROUTING_ENABLED: bool = True
+    ROUTING_SMALL_MAX_LINES: int = 80  # mini 모델로 보내는 최대 변경 라인 수
+    ROUTING_SMALL_MAX_FILES: int = 5  # mini 모델로 보내는 최대 파일 수
+    ROUTING_ESCALATE_CONFIDENCE: int = 70  # mini 결과 confidence 가 이보다 낮으면 gpt-4o 로 재분석
+    ROUTING_LARGE_FILE_PATTERNS: List[str] = Field(default_factory=lambda: [
+        "*.sql",
+        "*migrations/*",
+        "*.proto",
+        "Dockerfile",
+        "*.tf",
+    ])
 
     # Token optimization and chunking
     TOKEN_BUDGET_LIMIT: int = 25000
-    CHUNK_MAX_LINES: int = 1000
+    TOKEN_BUDGET_RESPONSE_RESERVE: int = 2000  # 응답 생성을 위해 남겨두는 token 수
+    DIFF_PREVIEW_LINES: int = 20  # 예산 부족 시 파일별 preview 최대 라인 수
+    PROMPT_MIN_DIFF_COVERAGE: float = 0.3  # prompt 에 담긴 변경 라인 비율이 이보다 낮으면 청킹 모드
+    TOKEN_MEMO_MAX_ENTRIES: int = 4096  # 반복 블록 token 수 memo 최대 개수
+    TOKEN_EXACT_MAX_CHARS: int = 200000  # 이보다 긴 입력은 구간 샘플링으로 token 수 추정
+    CHUNK_MAX_TOKENS: int = 8000  # 청크 하나에 담는 diff 최대 token 수 (큰 파일은 hunk 단위로 분할)
     CHUNK_MAX_FILES: int = 20
+    CHUNK_ANALYSIS_CONCURRENCY: int = 6  # 동시에 실행하는 청크 분석(LLM 호출) 개수
+    CHUNK_ANALYSIS_TIMEOUT: int = 90  # 청크 하나의 분석 대기 시간 (초)
+    CHUNK_ISSUE_CONTEXT: str = "none"  # none: 청크 prompt 에서 issue 목록 제외 (issue 매칭은 종합 단계에서), full: 청크마다 포함
+    SYNTHESIS_FAN_IN: int = 8  # 청크 결과가 이보다 많으면 이 개수씩 묶어 mini 모델로 단계별 병합
+    SYNTHESIS_MAX_DEPTH: int = 3  # 병합 단계 최대 깊이
+    SYNTHESIS_COMPACT_JSON: bool = True  # 청크/병합 결과를 공백 없는 JSON 으로 전달
+
+    # LLM 요청 타임아웃 (초, 비동기 호출은 초과 시 취소)
+    LLM_REQUEST_TIMEOUT: int = 180
+
+    # OpenAI rate limit - 모델별 분당 요청 수(rpm)/token 수(tpm) 한도, 응답 헤더의 실제 남은 한도로 보정
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, Dict[str, int]] = Field(default_factory=lambda: {
+        "gpt-4o": {"rpm": 5000, "tpm": 800000},
+        "gpt-4o-mini": {"rpm": 5000, "tpm": 4000000},
+        "text-embedding-3-small": {"rpm": 5000, "tpm": 5000000},
+    })
+    RATE_LIMIT_HEADROOM: float = 0.9  # 한도의 이 비율까지만 사용
+    RATE_LIMIT_OUTPUT_TOKENS: int = 1000  # 호출마다 응답용으로 미리 잡아두는 token 수 (응답 후 실제 사용량으로 정산)
+
+    # Structured output - JSON schema(strict) 로 응답 형식 강제, 파싱/검증 실패 시 mini 모델로 한 번만 복구 요청
+    STRUCTURED_OUTPUT_ENABLED: bool = True
+    JSON_REPAIR_ENABLED: bool = True
+
+    # Patch-id 분석 결과 캐시 (rebase/cherry-pick 으로 SHA 만 바뀐 commit 은 LLM 재호출 생략, 0: 비활성화)
+    ANALYSIS_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 20000
+
+    # Push 단위 분석 - commit 수가 이 값 이상이면 compare API 로 push 전체 diff 를 한 번에 분석 (0: 비활성화)
+    PUSH_ANALYSIS_MIN_COMMITS: int = 10
+
+    # Commit/diff cache (SHA 기준, 메모리 LRU + LOGS_DIR/commit_cache 디스크 저장소, 0: 비활성화)
+    COMMIT_CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    COMMIT_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
 
     # Log management
     LOG_RETENTION_DAYS: int = 30
@@ -72,11 +129,59 @@ class Settings(BaseSettings):
     # Redmine issue search period (days) - only search issues updated within this period
     REDMINE_ISSUE_SEARCH_DAYS: int = 7
 
+    # Open issue snapshot (project 별 메모리 캐시, 증분 동기화)
+    ISSUE_SNAPSHOT_MAX_STALENESS: int = 60  # 이 시간(초)이 지나면 백그라운드 증분 갱신
+    ISSUE_SNAPSHOT_FULL_RESYNC: int = 3600  # 삭제된 issue 정리를 위한 전체 재조회 주기 (초)
+    ISSUE_SNAPSHOT_DESCRIPTION_CHARS: int = 500  # 스냅샷에 보관하는 description 길이 (업데이트 이력 부분은 제외)
+
+    # Issue 업데이트 이력 저장 방식
+    # description (기본값): 기존 방식대로 description 에 계속 누적
+    # journal (opt-in): journal note 로 추가 (issue 조회 없이 PUT 1회, description 에는 이력이 남지 않음)
+    # rolling (opt-in): 최근 이력만 description 에 유지하고 오래된 이력은 첨부 파일로 이동
+    HISTORY_STORAGE: str = "description"
+    HISTORY_INLINE_MAX_ENTRIES: int = 10  # rolling 모드에서 description 에 남기는 최근 이력 수 (2배를 넘으면 오래된 항목을 첨부 파일로 이동)
+
+    # Webhook queue (disk-backed, under LOGS_DIR)
+    WEBHOOK_WORKERS: int = 4  # 큐를 소비하는 worker 개수 (ANALYSIS_MAX_CONCURRENCY 이하 권장)
+    WEBHOOK_MAX_ATTEMPTS: int = 3  # 실패 시 재시도 횟수 (초과하면 dead 처리)
+    WEBHOOK_RETRY_BACKOFF_SECONDS: int = 30  # 재시도 간격 (시도 횟수에 비례)
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # HTTP connection pool (GitLab / Redmine 공용)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # idle keep-alive 연결 유지 시간 (초)
+    HTTP2_ENABLED: bool = False  # 'h2' 패키지 설치 필요
+
+    # Analysis execution - 분석 파이프라인은 event loop 밖의 thread pool 에서 실행
+    ANALYSIS_EXECUTION_MODE: str = "thread"  # thread: thread pool 에서 동기 파이프라인 실행, async: event loop 에서 비동기 파이프라인 실행
+    ANALYSIS_MAX_CONCURRENCY: int = 4  # 동시에 분석 가능한 push 개수
+    ANALYZER_IO_WORKERS: int = 8  # commit 단위 GitLab/Redmine 동시 조회용 thread 개수
+
+    # 더 이상 사용하지 않는 설정 - 기존 .env 호환을 위해 받기만 하고 무시 (시작 시 경고)
+    MAX_DIFF_LINES: Optional[int] = None  # TOKEN_BUDGET_LIMIT 로 대체
+    MAX_SUMMARY_LINES: Optional[int] = None  # TOKEN_BUDGET_LIMIT 로 대체
+    CHUNK_MAX_LINES: Optional[int] = None  # CHUNK_MAX_TOKENS 로 대체
+
+    def deprecated_settings(self) -> List[str]:
+        return [
+            f"{name} is deprecated and ignored, use {replacement} instead"
+            for name, replacement in DEPRECATED_SETTINGS.items()
+            if getattr(self, name) is not None
+        ]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 
+# 제거된 설정 → 대체 설정
+DEPRECATED_SETTINGS = {
+    "MAX_DIFF_LINES": "TOKEN_BUDGET_LIMIT",
+    "MAX_SUMMARY_LINES": "TOKEN_BUDGET_LIMIT",
+    "CHUNK_MAX_LINES": "CHUNK_MAX_TOKENS",
+}
+
 # Global settings instance
 settings = Settings()
 
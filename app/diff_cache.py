@@ -0,0 +1,195 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.config import settings, LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class CommitCache:
+    """
+    SHA 기준 commit/diff 캐시 (메모리 LRU + gzip 디스크 저장소).
+
+    같은 SHA 의 commit 내용은 변하지 않으므로 만료 없이 크기 기준으로만 제거합니다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        memory_max_bytes: Optional[int] = None,
+        disk_max_bytes: Optional[int] = None
+    ):
+        self.cache_dir = cache_dir or (LOGS_DIR / "commit_cache")
+        self.memory_max_bytes = settings.COMMIT_CACHE_MEMORY_MAX_BYTES if memory_max_bytes is None else memory_max_bytes
+        self.disk_max_bytes = settings.COMMIT_CACHE_DISK_MAX_BYTES if disk_max_bytes is None else disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_max_bytes:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(kind: str, project_id: int, commit_sha: str) -> str:
+        return f"{kind}-{project_id}-{commit_sha}"
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+            on_disk = key in self._disk
+
+        if on_disk:
+            value, size = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._put_memory(key, value, size)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        raw = json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+        with self._lock:
+            self._put_memory(key, value, len(raw))
+
+        if self.disk_max_bytes:
+            self._write_disk(key, raw)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        # gzip 파일 읽기/압축 해제가 event loop 를 막지 않도록 thread 에서 실행
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Any):
+        await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes
+            }
+
+    def _put_memory(self, key: str, value: Any, size: int):
+        if size > self.memory_max_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def _load_disk_index(self):
+        entries = []
+        for path in self.cache_dir.glob("*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name[:-len(".json.gz")], stat.st_size))
+
+        # 오래 사용하지 않은 항목부터 제거되도록 mtime 순으로 정렬
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+        self._evict_disk()
+
+    def _read_disk(self, key: str) -> tuple:
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                raw = f.read()
+            os.utime(path)
+            return json.loads(raw), len(raw)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read commit cache entry {key}: {e}")
+            with self._lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None, 0
+
+    def _write_disk(self, key: str, raw: bytes):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+        try:
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except OSError as e:
+            logger.warning(f"Failed to write commit cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._evict_disk()
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+
+_cache: Optional[CommitCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_commit_cache() -> CommitCache:
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CommitCache()
+
+    return _cache
@@ -0,0 +1,203 @@
+import logging
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.config import settings
+from app.tokens import get_token_counter
+from app.prompt_budget import count_changed_lines
+
+logger = logging.getLogger(__name__)
+
+
+class DiffPiece(NamedTuple):
+    # diff 본문은 복사하지 않고 (파일 index, 시작/끝 offset) 만 보관
+    file_index: int
+    start: int
+    end: int
+    tokens: int
+    hunk_header: str = ""
+
+
+def _header_end(diff_content: str) -> int:
+    # 첫 '@@' 줄 이전까지가 파일 header
+    if diff_content.startswith('@@'):
+        return 0
+    pos = diff_content.find('\n@@')
+    return len(diff_content) if pos == -1 else pos + 1
+
+
+def _hunk_spans(diff_content: str) -> Tuple[int, List[Tuple[int, int]]]:
+    # '@@' 로 시작하는 줄 위치를 찾아 (header 끝 offset, hunk 구간 목록) 반환
+    starts = []
+    pos = _header_end(diff_content)
+    while pos < len(diff_content):
+        starts.append(pos)
+        next_pos = diff_content.find('\n@@', pos)
+        pos = len(diff_content) if next_pos == -1 else next_pos + 1
+
+    if not starts:
+        return len(diff_content), []
+
+    ends = starts[1:] + [len(diff_content)]
+    return starts[0], list(zip(starts, ends))
+
+
+class DiffChunkPlanner:
+    """
+    Token 기준 diff 청크 분할기.
+
+    큰 파일은 '@@' hunk 경계에서, 그래도 큰 hunk 는 줄 경계에서 나누고, 각 조각에는
+    파일 header 와 hunk header 를 붙입니다. 먼저 offset 만으로 계획을 세워 전체 청크 수를
+    확정한 뒤, 청크 내용은 필요할 때 하나씩 만듭니다.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_files: Optional[int] = None):
+        self.max_tokens = max_tokens or settings.CHUNK_MAX_TOKENS
+        self.max_files = max_files or settings.CHUNK_MAX_FILES
+        self.counter = get_token_counter()
+
+    def plan(self, diffs: List[Dict[str, Any]]) -> List[List[DiffPiece]]:
+        pieces: List[DiffPiece] = []
+        for file_index, diff in enumerate(diffs):
+            pieces.extend(self._file_pieces(file_index, diff.get('diff', '') or ''))
+
+        if not pieces:
+            return []
+
+        # 청크 수를 먼저 정하고 목표 크기를 평균으로 잡아 마지막 청크만 작아지지 않도록 균형 배분
+        total_tokens = sum(piece.tokens for piece in pieces)
+        target = total_tokens / max(1, math.ceil(total_tokens / self.max_tokens))
+
+        chunks: List[List[DiffPiece]] = []
+        current: List[DiffPiece] = []
+        current_tokens = 0
+        current_files = set()
+
+        for piece in pieces:
+            new_file = piece.file_index not in current_files
+            if current and (
+                current_tokens + piece.tokens > self.max_tokens
+                or current_tokens + piece.tokens / 2 > target
+                or (new_file and len(current_files) >= self.max_files)
+            ):
+                chunks.append(current)
+                current, current_tokens, current_files = [], 0, set()
+
+            current.append(piece)
+            current_tokens += piece.tokens
+            current_files.add(piece.file_index)
+
+        if current:
+            chunks.append(current)
+
+        logger.info(
+            f"Planned {len(chunks)} chunks from {len(diffs)} files "
+            f"({total_tokens} diff tokens, max {self.max_tokens}/chunk)"
+        )
+        return chunks
+
+    def _file_pieces(self, file_index: int, diff_content: str) -> List[DiffPiece]:
+        tokens = self.counter.count(diff_content)
+        if tokens <= self.max_tokens:
+            return [DiffPiece(file_index, 0, len(diff_content), tokens)]
+
+        _, spans = _hunk_spans(diff_content)
+        if not spans:
+            spans = [(0, len(diff_content))]
+
+        pieces: List[DiffPiece] = []
+        for start, end in spans:
+            hunk_tokens = self.counter.count(diff_content[start:end])
+            if hunk_tokens <= self.max_tokens:
+                pieces.append(DiffPiece(file_index, start, end, hunk_tokens))
+            else:
+                pieces.extend(self._split_hunk(file_index, diff_content, start, end, hunk_tokens))
+
+        return pieces
+
+    def _split_hunk(self, file_index: int, diff_content: str, start: int, end: int, tokens: int) -> List[DiffPiece]:
+        # hunk 하나가 예산을 넘으면 줄 경계에서 예산을 채우는 크기로 분할, 이어지는 조각에는 hunk header 를 다시 붙임
+        header_end = diff_content.find('\n', start, end)
+        hunk_header = diff_content[start:header_end] if diff_content.startswith('@@', start) and header_end != -1 else ""
+        header_tokens = self.counter.count(hunk_header) if hunk_header else 0
+        budget = max(1, self.max_tokens - header_tokens)
+
+        # hunk 전체의 글자/token 비율로 예산 크기만큼 잘라 본 뒤, 넘치면 줄 단위로 줄임
+        chars_per_token = (end - start) / max(1, tokens)
+
+        pieces: List[DiffPiece] = []
+        pos = start
+        while pos < end:
+            limit = pos + int(budget * chars_per_token)
+            cut = end if limit >= end else diff_content.rfind('\n', pos, limit) + 1
+            if cut <= pos:
+                # 예산보다 긴 한 줄은 그대로 한 조각으로
+                cut = diff_content.find('\n', limit, end)
+                cut = end if cut == -1 else cut + 1
+
+            piece_tokens = self.counter.count(diff_content[pos:cut])
+            while piece_tokens > budget:
+                shorter = diff_content.rfind('\n', pos, pos + int((cut - pos) * budget / piece_tokens)) + 1
+                if shorter <= pos or shorter >= cut:
+                    shorter = diff_content.rfind('\n', pos, cut - 1) + 1
+                if shorter <= pos:
+                    break
+                cut = shorter
+                piece_tokens = self.counter.count(diff_content[pos:cut])
+
+            pieces.append(self._hunk_piece(file_index, start, pos, cut, piece_tokens, hunk_header, header_tokens))
+            pos = cut
+
+        return pieces
+
+    @staticmethod
+    def _hunk_piece(
+        file_index: int,
+        hunk_start: int,
+        start: int,
+        end: int,
+        tokens: int,
+        hunk_header: str,
+        header_tokens: int
+    ) -> DiffPiece:
+        # 첫 조각은 hunk header 를 이미 포함하므로 이어지는 조각에만 header 와 그 token 수를 더함
+        if start == hunk_start:
+            return DiffPiece(file_index, start, end, tokens)
+        return DiffPiece(file_index, start, end, tokens + header_tokens, hunk_header)
+
+    @staticmethod
+    def materialize(diffs: List[Dict[str, Any]], chunk: List[DiffPiece]) -> List[Dict[str, Any]]:
+        # 같은 파일의 연속 조각은 하나의 항목으로 합치고, 파일 header 는 조각마다 포함
+        grouped: List[Tuple[int, List[str]]] = []
+
+        for piece in chunk:
+            diff_content = diffs[piece.file_index].get('diff', '') or ''
+            body = diff_content[piece.start:piece.end].rstrip('\n')
+            if piece.hunk_header:
+                body = f"{piece.hunk_header}\n{body}"
+
+            if grouped and grouped[-1][0] == piece.file_index:
+                grouped[-1][1].append(body)
+                continue
+
+            header_end = _header_end(diff_content)
+            if 0 < header_end <= piece.start:
+                body = f"{diff_content[:header_end].rstrip()}\n{body}"
+            grouped.append((piece.file_index, [body]))
+
+        entries = []
+        for file_index, bodies in grouped:
+            diff = diffs[file_index]
+            text = '\n'.join(bodies)
+            additions, deletions = count_changed_lines(text)
+
+            entry = {
+                'path': diff.get('path'),
+                'additions': additions,
+                'deletions': deletions,
+                'diff': text,
+            }
+            if additions + deletions < diff.get('additions', 0) + diff.get('deletions', 0):
+                entry['partial'] = True
+            entries.append(entry)
+
+        return entries
@@ -1,8 +1,10 @@
 import logging
 from typing import Dict, List, Optional, Any
-import requests
 from app.config import settings
+from app.http_client import REQUEST_ERRORS, get_http_client, get_async_http_client
+from app.diff_cache import CommitCache, get_commit_cache
 from app.utils import should_ignore_file
+from app.prompt_budget import count_changed_lines
 
 logger = logging.getLogger(__name__)
 
@@ -16,69 +18,137 @@ class GitLabClient:
         self.headers = {
             "PRIVATE-TOKEN": self.token
         }
+        self.cache = get_commit_cache()
+
+    def _get(self, path: str, timeout: float = 10, params: Optional[Dict] = None) -> Any:
+        response = get_http_client().get(
+            f"{self.api_url}{path}",
+            headers=self.headers,
+            params=params,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_async(self, path: str, timeout: float = 10, params: Optional[Dict] = None) -> Any:
+        response = await get_async_http_client().get(
+            f"{self.api_url}{path}",
+            headers=self.headers,
+            params=params,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
 
     def get_commit(self, project_id: int, commit_sha: str) -> Optional[Dict]:
+        cache_key = CommitCache.make_key('commit', project_id, commit_sha)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.api_url}/projects/{project_id}/repository/commits/{commit_sha}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            result = self._get(f"/projects/{project_id}/repository/commits/{commit_sha}")
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get commit {commit_sha}: {e}")
             return None
 
-    def get_commit_diff(self, project_id: int, commit_sha: str) -> Optional[List[Dict]]:
+        self.cache.set(cache_key, result)
+        return result
+
+    async def get_commit_async(self, project_id: int, commit_sha: str) -> Optional[Dict]:
+        cache_key = CommitCache.make_key('commit', project_id, commit_sha)
+        cached = await self.cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.api_url}/projects/{project_id}/repository/commits/{commit_sha}/diff"
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to get commit diff {commit_sha}: {e}")
+            result = await self._get_async(f"/projects/{project_id}/repository/commits/{commit_sha}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get commit {commit_sha}: {e}")
             return None
 
-    def get_project(self, project_id: int) -> Optional[Dict]:
+        await self.cache.set_async(cache_key, result)
+        return result
+
+    def get_commit_diff(self, project_id: int, commit_sha: str) -> Optional[List[Dict]]:
+        cache_key = CommitCache.make_key('diff', project_id, commit_sha)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.api_url}/projects/{project_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to get project {project_id}: {e}")
+            result = self._get(f"/projects/{project_id}/repository/commits/{commit_sha}/diff", timeout=30)
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get commit diff {commit_sha}: {e}")
             return None
 
-    def get_merge_request(self, project_id: int, mr_iid: int) -> Optional[Dict]:
+        self.cache.set(cache_key, result)
+        return result
+
+    async def get_commit_diff_async(self, project_id: int, commit_sha: str) -> Optional[List[Dict]]:
+        cache_key = CommitCache.make_key('diff', project_id, commit_sha)
+        cached = await self.cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to get MR {mr_iid}: {e}")
+            result = await self._get_async(f"/projects/{project_id}/repository/commits/{commit_sha}/diff", timeout=30)
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get commit diff {commit_sha}: {e}")
             return None
 
-    def _truncate_diff(self, diff_content: str, max_lines: int = 20) -> str:
+        await self.cache.set_async(cache_key, result)
+        return result
 
-        if not diff_content:
-            return ""
+    def compare_commits(self, project_id: int, from_sha: str, to_sha: str) -> Optional[Dict]:
+        try:
+            return self._get(
+                f"/projects/{project_id}/repository/compare",
+                timeout=60,
+                params={'from': from_sha, 'to': to_sha}
+            )
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to compare {from_sha[:8]}..{to_sha[:8]}: {e}")
+            return None
 
-        lines = diff_content.split('\n')
+    async def compare_commits_async(self, project_id: int, from_sha: str, to_sha: str) -> Optional[Dict]:
+        try:
+            return await self._get_async(
+                f"/projects/{project_id}/repository/compare",
+                timeout=60,
+                params={'from': from_sha, 'to': to_sha}
+            )
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to compare {from_sha[:8]}..{to_sha[:8]}: {e}")
+            return None
 
-        if len(lines) <= max_lines:
-            return diff_content
+    def get_project(self, project_id: int) -> Optional[Dict]:
+        try:
+            return self._get(f"/projects/{project_id}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get project {project_id}: {e}")
+            return None
 
-        important_lines = []
-        for line in lines:
-            if line.startswith('@@') or line.startswith('+') or line.startswith('-'):
-                important_lines.append(line)
-                if len(important_lines) >= max_lines:
-                    break
+    async def get_project_async(self, project_id: int) -> Optional[Dict]:
+        try:
+            return await self._get_async(f"/projects/{project_id}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get project {project_id}: {e}")
+            return None
 
-        result = '\n'.join(important_lines)
-        if len(lines) > len(important_lines):
-            result += f"\n... ({len(lines) - len(important_lines)} more lines)"
+    def get_merge_request(self, project_id: int, mr_iid: int) -> Optional[Dict]:
+        try:
+            return self._get(f"/projects/{project_id}/merge_requests/{mr_iid}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get MR {mr_iid}: {e}")
+            return None
 
-        return result
+    async def get_merge_request_async(self, project_id: int, mr_iid: int) -> Optional[Dict]:
+        try:
+            return await self._get_async(f"/projects/{project_id}/merge_requests/{mr_iid}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get MR {mr_iid}: {e}")
+            return None
 
     def filter_and_summarize_diff(self, diffs: List[Dict]) -> Dict[str, Any]:
 
@@ -90,63 +160,32 @@ class GitLabClient:
             )
         ]
 
-        total_additions = sum(diff.get('additions', 0) for diff in filtered_diffs)
-        total_deletions = sum(diff.get('deletions', 0) for diff in filtered_diffs)
-        total_lines = total_additions + total_deletions
-
-        summary = {
-            'total_files': len(filtered_diffs),
-            'total_additions': total_additions,
-            'total_deletions': total_deletions,
-            'total_lines': total_lines,
-        }
-
-        if total_lines < settings.MAX_DIFF_LINES:
-            return {
-                'type': 'full',
-                'diffs': [
-                    {
-                        'path': diff.get('new_path', diff.get('old_path')),
-                        'additions': diff.get('additions', 0),
-                        'deletions': diff.get('deletions', 0),
-                        'diff': diff.get('diff', ''),  # Include actual diff content
-                    }
-                    for diff in filtered_diffs
-                ],
-                'summary': summary
-            }
-        elif total_lines < settings.MAX_SUMMARY_LINES:
-            return {
-                'type': 'summary',
-                'diffs': [
-                    {
-                        'path': diff.get('new_path', diff.get('old_path')),
-                        'additions': diff.get('additions', 0),
-                        'deletions': diff.get('deletions', 0),
-                        'diff_preview': self._truncate_diff(diff.get('diff', ''), max_lines=20),
-                    }
-                    for diff in filtered_diffs
-                ],
-                'summary': summary
-            }
-        else:
-            sorted_diffs = sorted(
-                filtered_diffs,
-                key=lambda d: d.get('additions', 0) + d.get('deletions', 0),
-                reverse=True
-            )[:10]
-
-            return {
-                'type': 'high_level',
-                'diffs': [
-                    {
-                        'path': diff.get('new_path', diff.get('old_path')),
-                        'lines': diff.get('additions', 0) + diff.get('deletions', 0),
-                    }
-                    for diff in sorted_diffs
-                ],
-                'summary': summary
+        # GitLab diff API 는 additions/deletions 를 주지 않으므로 diff 본문에서 직접 계산
+        entries = []
+        for diff in filtered_diffs:
+            diff_content = diff.get('diff', '')
+            additions, deletions = count_changed_lines(diff_content)
+            entries.append({
+                'path': diff.get('new_path', diff.get('old_path')),
+                'additions': diff.get('additions', additions),
+                'deletions': diff.get('deletions', deletions),
+                'diff': diff_content,
+            })
+
+        total_additions = sum(entry['additions'] for entry in entries)
+        total_deletions = sum(entry['deletions'] for entry in entries)
+
+        # 어느 정도까지 diff 를 prompt 에 넣을지는 PromptBudgeter 가 token 예산 기준으로 결정
+        return {
+            'type': 'full',
+            'diffs': entries,
+            'summary': {
+                'total_files': len(entries),
+                'total_additions': total_additions,
+                'total_deletions': total_deletions,
+                'total_lines': total_additions + total_deletions,
             }
+        }
 
     def extract_gitlab_issue_from_commit(self, commit_message: str) -> Optional[int]:
         import re
@@ -166,10 +205,14 @@ class GitLabClient:
 
     def get_issue(self, project_id: int, issue_iid: int) -> Optional[Dict]:
         try:
-            url = f"{self.api_url}/projects/{project_id}/issues/{issue_iid}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._get(f"/projects/{project_id}/issues/{issue_iid}")
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get issue {issue_iid}: {e}")
+            return None
+
+    async def get_issue_async(self, project_id: int, issue_iid: int) -> Optional[Dict]:
+        try:
+            return await self._get_async(f"/projects/{project_id}/issues/{issue_iid}")
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get issue {issue_iid}: {e}")
             return None
@@ -0,0 +1,73 @@
+import logging
+import threading
+from typing import Optional
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# requests.RequestException 처럼 응답 본문 JSON 파싱 실패(ValueError, 예: proxy 의 HTML 오류 페이지)도 요청 실패로 처리
+REQUEST_ERRORS = (httpx.HTTPError, ValueError)
+
+# GitLab / Redmine 클라이언트가 공유하는 connection pool (keep-alive 재사용)
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+    )
+
+
+def _http2_enabled() -> bool:
+    if not settings.HTTP2_ENABLED:
+        return False
+
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but 'h2' is not installed, falling back to HTTP/1.1")
+        return False
+
+    return True
+
+
+def get_http_client() -> httpx.Client:
+    global _sync_client
+
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(limits=_limits(), http2=_http2_enabled())
+                logger.info("Created shared HTTP client")
+
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    global _async_client
+
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(limits=_limits(), http2=_http2_enabled())
+                logger.info("Created shared async HTTP client")
+
+    return _async_client
+
+
+async def close_http_clients():
+    global _sync_client, _async_client
+
+    with _lock:
+        sync_client, _sync_client = _sync_client, None
+        async_client, _async_client = _async_client, None
+
+    if sync_client:
+        sync_client.close()
+    if async_client:
+        await async_client.aclose()
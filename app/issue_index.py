@@ -0,0 +1,168 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+from app.config import settings
+
+# 영문 단어/식별자, 숫자, 한글 연속 구간
+_WORD = re.compile(r'[A-Za-z][A-Za-z0-9]*|[0-9]+|[가-힣]+')
+# camelCase / PascalCase / 약어 분리
+_CAMEL_PART = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+_HANGUL = re.compile(r'[가-힣]+')
+
+_STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'from', 'this', 'that', 'into', 'to', 'of', 'in', 'on', 'is', 'be',
+    'if', 'else', 'return', 'import', 'def', 'class', 'self', 'true', 'false', 'none', 'null',
+    'const', 'let', 'var', 'function', 'public', 'private', 'static', 'void', 'new',
+})
+
+
+def tokenize(text: str) -> List[str]:
+    # 한글은 조사/어미가 붙어도 매칭되도록 2-gram, 식별자는 전체 + camelCase 조각
+    tokens: List[str] = []
+
+    for word in _WORD.findall(text or ''):
+        if _HANGUL.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+            continue
+
+        lower = word.lower()
+        if lower.isdigit():
+            if len(lower) >= 2:
+                tokens.append(lower)
+            continue
+
+        parts = [part.lower() for part in _CAMEL_PART.findall(word)]
+        if len(parts) > 1 and lower not in _STOPWORDS:
+            tokens.append(lower)
+        tokens.extend(part for part in parts if len(part) > 1 and part not in _STOPWORDS)
+
+    return tokens
+
+
+def diff_identifiers(diffs: List[Dict[str, Any]]) -> List[str]:
+    # 추가/삭제 라인에서 자주 등장한 식별자 (빈도순)
+    identifiers: Counter = Counter()
+    for diff in diffs:
+        for line in (diff.get('diff') or '').split('\n'):
+            if line[:1] in ('+', '-') and not line.startswith(('+++', '---')):
+                identifiers.update(tokenize(line[1:]))
+
+    return [token for token, _ in identifiers.most_common(settings.ISSUE_QUERY_MAX_IDENTIFIERS)]
+
+
+def build_commit_query(commit_message: str, diffs: List[Dict[str, Any]]) -> Dict[str, float]:
+    # commit message > 파일 경로 > diff 식별자 순으로 가중치
+    query: Dict[str, float] = {}
+
+    def add(tokens: Iterable[str], weight: float):
+        for token in tokens:
+            query[token] = max(query.get(token, 0.0), weight)
+
+    add(diff_identifiers(diffs), 0.5)
+    add(tokenize(' '.join(diff.get('path') or '' for diff in diffs)), 1.0)
+    add(tokenize(commit_message), 2.0)
+
+    return query
+
+
+class IssueIndex:
+    """
+    Redmine issue 역색인 (BM25).
+
+    subject 와 description 을 토큰화해 issue 별 term 빈도를 보관하고, issue 가 추가/변경/종료될
+    때마다 해당 issue 만 갱신합니다. subject 토큰은 description 보다 높은 가중치로 반영합니다.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    SUBJECT_WEIGHT = 2
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def rebuild(self, issues: Iterable[Dict]):
+        documents = {issue['id']: self._terms(issue) for issue in issues}
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for issue_id, terms in documents.items():
+            for term, count in terms.items():
+                postings.setdefault(term, {})[issue_id] = count
+
+        lengths = {issue_id: sum(terms.values()) for issue_id, terms in documents.items()}
+
+        with self._lock:
+            self._postings = postings
+            self._doc_terms = documents
+            self._doc_lengths = lengths
+            self._total_length = sum(lengths.values())
+
+    def add(self, issue: Dict):
+        terms = self._terms(issue)
+        with self._lock:
+            self._remove(issue['id'])
+            self._doc_terms[issue['id']] = terms
+            self._doc_lengths[issue['id']] = sum(terms.values())
+            self._total_length += self._doc_lengths[issue['id']]
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[issue['id']] = count
+
+    def remove(self, issue_id: int):
+        with self._lock:
+            self._remove(issue_id)
+
+    def search(self, query: Dict[str, float], limit: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            total_docs = len(self._doc_terms)
+            if not total_docs or not query:
+                return []
+
+            average_length = max(1.0, self._total_length / total_docs)
+            scores: Dict[int, float] = {}
+
+            for term, weight in query.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for issue_id, tf in postings.items():
+                    norm = tf + self.K1 * (1 - self.B + self.B * self._doc_lengths[issue_id] / average_length)
+                    scores[issue_id] = scores.get(issue_id, 0.0) + weight * idf * tf * (self.K1 + 1) / norm
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'documents': len(self._doc_terms), 'terms': len(self._postings)}
+
+    def _remove(self, issue_id: int):
+        terms = self._doc_terms.pop(issue_id, None)
+        if terms is None:
+            return
+
+        self._total_length -= self._doc_lengths.pop(issue_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(issue_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _terms(self, issue: Dict) -> Counter:
+        terms = Counter(tokenize(issue.get('description') or ''))
+        for term in tokenize(issue.get('subject') or ''):
+            terms[term] += self.SUBJECT_WEIGHT
+        return terms
@@ -0,0 +1,306 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.issue_writer import UPDATE_HISTORY_MARKER
+from app.issue_index import IssueIndex
+from app.issue_vectors import IssueVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectIssueSnapshot:
+
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+        self.issues: Dict[int, Dict] = {}
+        self.index = IssueIndex()
+        self.vectors = IssueVectorIndex() if settings.ISSUE_RANKING in ('hybrid', 'vector') else None
+        self.loaded = False
+        self.last_sync: Optional[datetime] = None
+        self.last_full_sync = 0.0
+        self.synced_at = 0.0
+        self.refreshing = False
+        self.lock = threading.Lock()
+
+
+class IssueSnapshotStore:
+    """
+    project 별 open issue 스냅샷 (모든 worker 공유).
+
+    최초 1회 전체 조회 후에는 updated_on>=last_sync 조건으로 변경분만 반영하고,
+    MAX_STALENESS 를 넘기면 백그라운드에서 갱신합니다. 스냅샷이 바뀔 때마다 BM25 역색인과
+    벡터 색인도 해당 issue 만 갱신합니다.
+    """
+
+    # 서버/로컬 시계 오차를 고려한 증분 조회 여유 시간
+    SYNC_OVERLAP = timedelta(seconds=60)
+    # hybrid 순위 결합 (reciprocal rank fusion) 상수, 검색기별로 limit 의 몇 배까지 후보를 볼지
+    RRF_K = 60
+    FUSION_CANDIDATES = 3
+
+    def __init__(self, redmine_client):
+        self.redmine = redmine_client
+        self._snapshots: Dict[int, ProjectIssueSnapshot] = {}
+        self._lock = threading.Lock()
+        # Redmine 의 종료 상태 id (최초 사용 시 조회)
+        self._closed_statuses: Optional[Set[int]] = None
+
+    def get_open_issues(self, project_id: int) -> Optional[List[Dict]]:
+        snapshot = self._snapshot(project_id)
+
+        if not snapshot.loaded:
+            with snapshot.lock:
+                if not snapshot.loaded and not self._sync(snapshot):
+                    return None
+        elif time.monotonic() - snapshot.synced_at > settings.ISSUE_SNAPSHOT_MAX_STALENESS:
+            self._refresh_in_background(snapshot)
+
+        return list(snapshot.issues.values())
+
+    def get_recent_issues(
+        self,
+        project_id: int,
+        limit: int,
+        updated_within_days: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        issues = self.get_open_issues(project_id)
+        if issues is None:
+            return None
+
+        if updated_within_days:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=updated_within_days)).strftime('%Y-%m-%d')
+            issues = [issue for issue in issues if issue.get('updated_on', '') >= cutoff]
+
+        issues.sort(key=lambda issue: issue.get('updated_on', ''), reverse=True)
+        return issues[:limit]
+
+    def rank_issues(
+        self,
+        project_id: int,
+        query: Dict[str, float],
+        text: str,
+        limit: int
+    ) -> Optional[List[Dict]]:
+        # commit 과 관련도 높은 순 (get_open_issues 로 스냅샷이 로딩된 뒤에만 사용)
+        snapshot = self._snapshot(project_id)
+        if not snapshot.loaded:
+            return None
+
+        if snapshot.vectors is None:
+            issue_ids = [issue_id for issue_id, _ in snapshot.index.search(query, limit)]
+        elif settings.ISSUE_RANKING == 'vector':
+            issue_ids = [issue_id for issue_id, _ in snapshot.vectors.search(text, limit)]
+        else:
+            candidates = limit * self.FUSION_CANDIDATES
+            issue_ids = self._fuse(
+                [snapshot.index.search(query, candidates), snapshot.vectors.search(text, candidates)],
+                limit
+            )
+
+        ranked = [snapshot.issues.get(issue_id) for issue_id in issue_ids]
+        return [issue for issue in ranked if issue]
+
+    def find_issue(self, issue_id: int) -> Optional[Dict]:
+        # 로딩된 스냅샷에서만 찾으므로 종료된 issue 나 아직 로딩되지 않은 project 의 issue 는 None
+        with self._lock:
+            snapshots = [snapshot for snapshot in self._snapshots.values() if snapshot.loaded]
+
+        for snapshot in snapshots:
+            issue = snapshot.issues.get(issue_id)
+            if issue is not None:
+                return issue
+        return None
+
+    def record_issue(self, issue: Dict):
+        # 직접 생성/수정한 issue 는 다음 동기화를 기다리지 않고 바로 반영
+        # 갱신 결과는 바꾼 필드만 담겨 있을 수 있으므로 (journal 모드는 id 와 변경 필드뿐) 스냅샷의 기존 항목에 합침
+        with self._lock:
+            snapshots = [snapshot for snapshot in self._snapshots.values() if snapshot.loaded]
+
+        previous = next((s.issues[issue['id']] for s in snapshots if issue['id'] in s.issues), None)
+        merged = self._merge_partial(previous, issue)
+
+        project_id = (merged.get('project') or {}).get('id')
+        if previous is None and not any(snapshot.project_id == project_id for snapshot in snapshots):
+            return
+
+        moved = previous is not None and project_id != (previous.get('project') or {}).get('id')
+        closed = self._is_closed(issue, merged, previous)
+
+        for snapshot in snapshots:
+            # 전체 재조회(_sync)가 issues 를 교체하고 색인을 다시 만드는 중에 끼어들지 않도록 스냅샷 lock 안에서 반영
+            with snapshot.lock:
+                if issue['id'] in snapshot.issues:
+                    # 하위 project issue 도 상위 project 스냅샷에 포함되므로 project 가 바뀐 경우에만 제외
+                    if closed or moved:
+                        self._evict(snapshot, issue['id'])
+                        continue
+                elif closed or snapshot.project_id != project_id:
+                    continue
+
+                snapshot.issues[issue['id']] = self._compact(merged)
+                snapshot.index.add(snapshot.issues[issue['id']])
+                if snapshot.vectors is not None:
+                    snapshot.vectors.add([snapshot.issues[issue['id']]])
+
+    def stats(self) -> Dict[int, Dict]:
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+
+        now = time.monotonic()
+        return {
+            snapshot.project_id: {
+                'open_issues': len(snapshot.issues),
+                'index': snapshot.index.stats(),
+                'vectors': snapshot.vectors.stats() if snapshot.vectors is not None else None,
+                'age_seconds': round(now - snapshot.synced_at, 1) if snapshot.loaded else None
+            }
+            for snapshot in snapshots
+        }
+
+    @staticmethod
+    def _merge_partial(previous: Optional[Dict], issue: Dict) -> Dict:
+        merged = {**(previous or {}), **issue}
+        # PUT 에 사용한 *_id 필드는 조회 결과 형태({'id': ...})로 맞춤
+        for field in ('status', 'project'):
+            if f'{field}_id' in merged:
+                merged[field] = {'id': merged.pop(f'{field}_id')}
+        return merged
+
+    def _is_closed(self, issue: Dict, merged: Dict, previous: Optional[Dict]) -> bool:
+        status = merged.get('status') or {}
+        if 'is_closed' in status:
+            return bool(status['is_closed'])
+
+        # 스냅샷에 있던 (open) issue 의 상태가 그대로면 조회 생략
+        if previous is not None and status.get('id') == (previous.get('status') or {}).get('id'):
+            return False
+
+        # 상태를 바꾼 갱신은 is_closed 가 없으므로 Redmine 의 종료 상태 목록으로 판단
+        closed_ids = self._closed_status_ids()
+        if closed_ids is not None:
+            return status.get('id') in closed_ids
+
+        current = self.redmine.get_issue(issue['id'])
+        return bool(current and (current.get('status') or {}).get('is_closed'))
+
+    def _closed_status_ids(self) -> Optional[Set[int]]:
+        if self._closed_statuses is None:
+            statuses = self.redmine.get_issue_statuses()
+            if statuses is not None:
+                self._closed_statuses = {status['id'] for status in statuses if status.get('is_closed')}
+        return self._closed_statuses
+
+    @staticmethod
+    def _evict(snapshot: ProjectIssueSnapshot, issue_id: int):
+        snapshot.issues.pop(issue_id, None)
+        snapshot.index.remove(issue_id)
+        if snapshot.vectors is not None:
+            snapshot.vectors.remove(issue_id)
+
+    @classmethod
+    def _fuse(cls, rankings: List[List[Tuple[int, float]]], limit: int) -> List[int]:
+        # 점수 척도가 다른 검색 결과를 순위만으로 결합
+        scores: Dict[int, float] = {}
+        for ranking in rankings:
+            for rank, (issue_id, _) in enumerate(ranking):
+                scores[issue_id] = scores.get(issue_id, 0.0) + 1.0 / (cls.RRF_K + rank + 1)
+
+        return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+    @staticmethod
+    def _compact(issue: Dict) -> Dict:
+        # 업데이트 이력이 누적된 description 전체를 들고 있지 않도록 본문 앞부분만 보관
+        description = issue.get('description') or ''
+        pos = description.find(UPDATE_HISTORY_MARKER)
+        if pos != -1:
+            description = description[:pos].rstrip('-\n ')
+
+        limit = settings.ISSUE_SNAPSHOT_DESCRIPTION_CHARS
+        if len(description) > limit:
+            description = description[:limit]
+
+        if description == issue.get('description'):
+            return issue
+        return {**issue, 'description': description}
+
+    def _snapshot(self, project_id: int) -> ProjectIssueSnapshot:
+        with self._lock:
+            snapshot = self._snapshots.get(project_id)
+            if snapshot is None:
+                snapshot = self._snapshots[project_id] = ProjectIssueSnapshot(project_id)
+            return snapshot
+
+    def _refresh_in_background(self, snapshot: ProjectIssueSnapshot):
+        with self._lock:
+            if snapshot.refreshing:
+                return
+            snapshot.refreshing = True
+
+        def run():
+            try:
+                with snapshot.lock:
+                    self._sync(snapshot)
+            finally:
+                snapshot.refreshing = False
+
+        threading.Thread(target=run, name=f"issue-snapshot-{snapshot.project_id}", daemon=True).start()
+
+    def _sync(self, snapshot: ProjectIssueSnapshot) -> bool:
+        sync_started = datetime.now(timezone.utc)
+        full_sync = (
+            not snapshot.loaded
+            or time.monotonic() - snapshot.last_full_sync > settings.ISSUE_SNAPSHOT_FULL_RESYNC
+        )
+
+        if full_sync:
+            issues = self.redmine.get_all_issues(project_id=snapshot.project_id, status_id='open')
+            if issues is None:
+                logger.warning(f"Failed to load open issues for project {snapshot.project_id}")
+                return False
+
+            snapshot.issues = {issue['id']: self._compact(issue) for issue in issues}
+            snapshot.index.rebuild(snapshot.issues.values())
+            if snapshot.vectors is not None:
+                snapshot.vectors.rebuild(snapshot.issues.values())
+            snapshot.last_full_sync = time.monotonic()
+            logger.info(f"Loaded issue snapshot for project {snapshot.project_id}: {len(issues)} open issues")
+        else:
+            since = snapshot.last_sync - self.SYNC_OVERLAP
+            opened = self.redmine.get_all_issues(
+                project_id=snapshot.project_id,
+                status_id='open',
+                updated_since=since
+            )
+            closed = self.redmine.get_all_issues(
+                project_id=snapshot.project_id,
+                status_id='closed',
+                updated_since=since
+            )
+            if opened is None or closed is None:
+                logger.warning(f"Failed to refresh issue snapshot for project {snapshot.project_id}")
+                return False
+
+            # 하위 project 의 issue 도 함께 조회되므로 그대로 반영 (전체 조회와 동일한 범위)
+            for issue in opened:
+                snapshot.issues[issue['id']] = self._compact(issue)
+                snapshot.index.add(snapshot.issues[issue['id']])
+            for issue in closed:
+                self._evict(snapshot, issue['id'])
+            if opened and snapshot.vectors is not None:
+                # 조회 구간 안에서 열렸다 닫힌 issue 는 위에서 이미 제외됨
+                snapshot.vectors.add(snapshot.issues[issue['id']] for issue in opened if issue['id'] in snapshot.issues)
+
+            if opened or closed:
+                logger.info(
+                    f"Issue snapshot for project {snapshot.project_id} updated: "
+                    f"{len(opened)} changed, {len(closed)} closed"
+                )
+
+        snapshot.last_sync = sync_started
+        snapshot.synced_at = time.monotonic()
+        snapshot.loaded = True
+        return True
@@ -0,0 +1,213 @@
+import logging
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.issue_index import diff_identifiers, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def issue_text(issue: Dict) -> str:
+    return f"{issue.get('subject') or ''}\n{issue.get('description') or ''}"
+
+
+def build_commit_text(commit_message: str, diffs: List[Dict[str, Any]]) -> str:
+    # commit message + 변경 파일 경로 + 자주 등장한 diff 식별자
+    paths = ' '.join(diff.get('path') or '' for diff in diffs)
+    return f"{commit_message}\n{paths}\n{' '.join(diff_identifiers(diffs))}"
+
+
+class HashingEmbedder:
+    """
+    Hashing trick 기반 embedding (외부 호출 없음).
+
+    토큰을 crc32 로 고정 차원에 사상하고 부호 해시로 충돌을 상쇄합니다. 프로세스와
+    무관하게 같은 텍스트는 같은 벡터가 되므로 오프라인 환경에서도 그대로 동작합니다.
+    """
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or settings.ISSUE_EMBEDDING_DIM
+        self.name = f"hashing-{self.dim}"
+
+    def embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token, count in Counter(tokenize(text)).items():
+                h = zlib.crc32(token.encode('utf-8'))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                # 같은 토큰 반복은 로그 스케일로만 반영
+                vectors[row, h % self.dim] += sign * (1.0 + np.log(count))
+        return vectors
+
+
+class OpenAIEmbedder:
+    """
+    OpenAI embedding API 기반 embedding.
+
+    호출 전에 rate governor 로 예산을 확보하고, 실패 시 None 을 반환해 해당 issue 는
+    벡터 검색에서만 빠지도록 합니다.
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        from langchain_openai import OpenAIEmbeddings
+        from app.rate_governor import get_rate_governor
+        from app.tokens import get_token_counter
+
+        self.model = model or settings.ISSUE_EMBEDDING_MODEL
+        self.name = self.model
+        self.client = OpenAIEmbeddings(
+            model=self.model,
+            openai_api_key=settings.OPENAI_API_KEY,
+            max_retries=3,
+        )
+        self.governor = get_rate_governor()
+        self.tokens = get_token_counter()
+
+    def embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        try:
+            self.governor.acquire(self.model, sum(self.tokens.count_many(texts)), 'embedding')
+            return np.asarray(self.client.embed_documents(texts), dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Error embedding {len(texts)} texts with {self.model}: {e}")
+            return None
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    global _embedder
+
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                if settings.ISSUE_EMBEDDER == 'openai':
+                    _embedder = OpenAIEmbedder()
+                else:
+                    _embedder = HashingEmbedder()
+
+    return _embedder
+
+
+class IssueVectorIndex:
+    """
+    Redmine issue 벡터 색인.
+
+    정규화한 embedding 을 NumPy 행렬 한 개에 모아 두고 내적으로 top-K 를 구합니다.
+    issue 가 추가/변경되면 해당 행만 다시 embedding 하고, 종료된 issue 의 행은 비워 재사용합니다.
+    """
+
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder if embedder is not None else get_embedder()
+
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._rows: Dict[int, int] = {}
+        self._ids: List[Optional[int]] = []
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def rebuild(self, issues: Iterable[Dict]):
+        issues = list(issues)
+        vectors = self._embed([issue_text(issue) for issue in issues]) if issues else None
+
+        with self._lock:
+            self._matrix = None
+            self._rows = {}
+            self._ids = []
+            self._free = []
+            if vectors is not None:
+                self._put([issue['id'] for issue in issues], vectors)
+
+    def add(self, issues: Iterable[Dict]):
+        issues = list(issues)
+        if not issues:
+            return
+
+        vectors = self._embed([issue_text(issue) for issue in issues])
+        if vectors is None:
+            return
+
+        with self._lock:
+            self._put([issue['id'] for issue in issues], vectors)
+
+    def remove(self, issue_id: int):
+        with self._lock:
+            row = self._rows.pop(issue_id, None)
+            if row is None:
+                return
+            self._matrix[row] = 0.0
+            self._ids[row] = None
+            self._free.append(row)
+
+    def search(self, text: str, limit: int) -> List[Tuple[int, float]]:
+        if not self._rows or not text.strip():
+            return []
+
+        vectors = self._embed([text])
+        if vectors is None:
+            return []
+
+        with self._lock:
+            if self._matrix is None or vectors.shape[1] != self._matrix.shape[1]:
+                return []
+
+            scores = self._matrix[:len(self._ids)] @ vectors[0]
+            count = min(limit, len(scores))
+            if count <= 0:
+                return []
+
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (self._ids[row], float(scores[row]))
+                for row in top
+                if self._ids[row] is not None and scores[row] >= settings.ISSUE_VECTOR_MIN_SIMILARITY
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'embedder': self.embedder.name,
+                'vectors': len(self._rows),
+                'capacity': 0 if self._matrix is None else self._matrix.shape[0],
+            }
+
+    def _embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        vectors = self.embedder.embed(texts)
+        if vectors is None:
+            return None
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _put(self, issue_ids: List[int], vectors: np.ndarray):
+        # lock 안에서 호출. 기존 행 덮어쓰기 → 빈 행 재사용 → 행렬 확장 순
+        if self._matrix is None:
+            self._matrix = np.zeros((max(self.INITIAL_CAPACITY, len(issue_ids)), vectors.shape[1]), dtype=np.float32)
+
+        for issue_id, vector in zip(issue_ids, vectors):
+            row = self._rows.get(issue_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = len(self._ids)
+                    self._ids.append(None)
+                    if row >= self._matrix.shape[0]:
+                        grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+                        grown[:row] = self._matrix[:row]
+                        self._matrix = grown
+                self._rows[issue_id] = row
+                self._ids[row] = issue_id
+
+            self._matrix[row] = vector
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPDATE_HISTORY_MARKER = "h3. 업데이트 이력"
+ARCHIVE_NOTE = "_이전 업데이트 이력은 첨부 파일(update-history-*.textile)에 보관되어 있습니다._"
+ENTRY_SEPARATOR = "\n\n----\n\n"
+
+# 이력 항목은 'h4. <시각>' 으로 시작
+_ENTRY_SPLIT = re.compile(r'\n+----\n+(?=h4\. )')
+
+# (갱신된 issue 또는 None, 실패 사유) 를 받아 commit 별 결과를 채우는 콜백
+UpdateCallback = Callable[[Optional[Dict], Optional[str]], None]
+
+
+class PendingUpdate(NamedTuple):
+    entry: str
+    fields: Dict[str, Any]
+    on_done: UpdateCallback
+
+
+def append_update_history(description: Optional[str], entries: List[str]) -> str:
+    description = description or ''
+
+    for entry in entries:
+        if UPDATE_HISTORY_MARKER in description:
+            description += "\n----\n\n" + entry
+        else:
+            description += f"\n\n----\n\n{UPDATE_HISTORY_MARKER}\n\n" + entry
+
+    return description
+
+
+def roll_update_history(description: str, keep: int) -> Tuple[str, List[str]]:
+    # 이력이 keep 의 2배를 넘으면 최근 keep 개만 남기고 나머지를 (description, 이동할 항목) 으로 분리
+    pos = description.find(UPDATE_HISTORY_MARKER)
+    if keep <= 0 or pos == -1:
+        return description, []
+
+    head = description[:pos + len(UPDATE_HISTORY_MARKER)]
+    body = description[len(head):].strip('\n')
+    if body.startswith(ARCHIVE_NOTE):
+        body = body[len(ARCHIVE_NOTE):].strip('\n')
+
+    entries = [entry.rstrip('\n') for entry in _ENTRY_SPLIT.split(body) if entry.strip()]
+    if len(entries) <= keep * 2:
+        return description, []
+
+    kept = ENTRY_SEPARATOR.join(entries[-keep:])
+    return f"{head}\n\n{ARCHIVE_NOTE}\n\n{kept}\n", entries[:-keep]
+
+
+class IssueWriter:
+    """
+    Redmine issue 갱신기.
+
+    같은 issue 에 대한 갱신은 issue 별 lock 안에서 GET → 이력 추가 → PUT 한 번으로
+    적용하므로, 동시에 처리 중인 다른 push 의 이력 항목을 덮어쓰지 않습니다.
+    HISTORY_STORAGE 에 따라 이력을 journal note 로 남기거나(조회 없음), 오래된 이력을
+    첨부 파일로 옮겨 description 크기를 일정하게 유지합니다.
+    """
+
+    def __init__(self, redmine_client):
+        self.redmine = redmine_client
+
+        self._locks_lock = threading.Lock()
+        self._locks: Dict[int, threading.Lock] = {}
+        self._async_locks: Dict[int, asyncio.Lock] = {}
+
+        self._stats_lock = threading.Lock()
+        self.writes = 0
+        self.entries = 0
+        self.archived_entries = 0
+
+    def apply(self, issue_id: int, updates: List[PendingUpdate]) -> Optional[Dict]:
+        try:
+            if settings.HISTORY_STORAGE == 'journal':
+                # journal 은 Redmine 이 append 하므로 조회/lock 없이 PUT 한 번
+                updated = self.redmine.update_issue(
+                    issue_id,
+                    self._fields(updates),
+                    notes=self._notes(updates),
+                    current={'id': issue_id}
+                )
+                return self._done(issue_id, updates, updated, None if updated else 'Failed to update issue')
+
+            with self._lock_for(issue_id):
+                existing_issue = self.redmine.get_issue(issue_id)
+                if not existing_issue:
+                    return self._done(issue_id, updates, None, f'Issue #{issue_id} not found')
+
+                issue_data = self._merge(existing_issue, updates)
+                archive = self._roll(issue_id, issue_data)
+                if archive:
+                    token = self.redmine.upload_file(archive[0], archive[1])
+                    self._attach(issue_data, archive, token, existing_issue)
+                updated = self.redmine.update_issue(issue_id, issue_data, current=existing_issue)
+
+        except Exception as e:
+            logger.error(f"Error updating issue #{issue_id}: {e}", exc_info=True)
+            return self._done(issue_id, updates, None, str(e))
+
+        return self._done(issue_id, updates, updated, None if updated else 'Failed to update issue')
+
+    async def apply_async(self, issue_id: int, updates: List[PendingUpdate]) -> Optional[Dict]:
+        try:
+            if settings.HISTORY_STORAGE == 'journal':
+                updated = await self.redmine.update_issue_async(
+                    issue_id,
+                    self._fields(updates),
+                    notes=self._notes(updates),
+                    current={'id': issue_id}
+                )
+                return await self._done_async(issue_id, updates, updated, None if updated else 'Failed to update issue')
+
+            async with self._async_lock_for(issue_id):
+                existing_issue = await self.redmine.get_issue_async(issue_id)
+                if not existing_issue:
+                    return await self._done_async(issue_id, updates, None, f'Issue #{issue_id} not found')
+
+                issue_data = self._merge(existing_issue, updates)
+                archive = self._roll(issue_id, issue_data)
+                if archive:
+                    token = await self.redmine.upload_file_async(archive[0], archive[1])
+                    self._attach(issue_data, archive, token, existing_issue)
+                updated = await self.redmine.update_issue_async(issue_id, issue_data, current=existing_issue)
+
+        except Exception as e:
+            logger.error(f"Error updating issue #{issue_id}: {e}", exc_info=True)
+            return await self._done_async(issue_id, updates, None, str(e))
+
+        return await self._done_async(issue_id, updates, updated, None if updated else 'Failed to update issue')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'writes': self.writes,
+                'entries': self.entries,
+                'coalesced': self.entries - self.writes,
+                'history_storage': settings.HISTORY_STORAGE,
+                'archived_entries': self.archived_entries,
+            }
+
+    @staticmethod
+    def _fields(updates: List[PendingUpdate]) -> Dict[str, Any]:
+        # done_ratio 등 이력 외 필드는 마지막 commit 기준
+        issue_data: Dict[str, Any] = {}
+        for update in updates:
+            issue_data.update(update.fields)
+        return issue_data
+
+    @staticmethod
+    def _notes(updates: List[PendingUpdate]) -> str:
+        return ENTRY_SEPARATOR.join(update.entry.rstrip('\n') for update in updates)
+
+    def _merge(self, existing_issue: Dict, updates: List[PendingUpdate]) -> Dict[str, Any]:
+        # 이력은 순서대로 모두 추가
+        issue_data = self._fields(updates)
+        issue_data['description'] = append_update_history(
+            existing_issue.get('description'),
+            [update.entry for update in updates]
+        )
+        return issue_data
+
+    @staticmethod
+    def _roll(issue_id: int, issue_data: Dict[str, Any]) -> Optional[Tuple[str, bytes, str, int]]:
+        # (첨부 파일명, 내용, 이동 후 description, 이동한 항목 수)
+        if settings.HISTORY_STORAGE != 'rolling':
+            return None
+
+        description, archived = roll_update_history(issue_data['description'], settings.HISTORY_INLINE_MAX_ENTRIES)
+        if not archived:
+            return None
+
+        filename = f"update-history-{issue_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.textile"
+        content = (ENTRY_SEPARATOR.join(archived) + "\n").encode('utf-8')
+        return filename, content, description, len(archived)
+
+    def _attach(
+        self,
+        issue_data: Dict[str, Any],
+        archive: Tuple[str, bytes, str, int],
+        token: Optional[str],
+        existing_issue: Dict
+    ):
+        filename, _, description, count = archive
+        if not token:
+            # 업로드 실패 시 이력은 description 에 그대로 두고 다음 갱신 때 다시 시도
+            logger.warning(f"Keeping update history inline for issue #{existing_issue.get('id')}")
+            return
+
+        issue_data['description'] = description
+        issue_data['uploads'] = [{'token': token, 'filename': filename, 'content_type': 'text/plain'}]
+        with self._stats_lock:
+            self.archived_entries += count
+        logger.info(f"Archived {count} update history entries of issue #{existing_issue.get('id')} to {filename}")
+
+    def _done(
+        self,
+        issue_id: int,
+        updates: List[PendingUpdate],
+        updated: Optional[Dict],
+        error: Optional[str]
+    ) -> Optional[Dict]:
+        if updated:
+            with self._stats_lock:
+                self.writes += 1
+                self.entries += len(updates)
+            if len(updates) > 1:
+                logger.info(f"Coalesced {len(updates)} updates into one write for issue #{issue_id}")
+
+        for update in updates:
+            try:
+                update.on_done(updated, error)
+            except Exception as e:
+                logger.error(f"Error completing update for issue #{issue_id}: {e}", exc_info=True)
+
+        return updated
+
+    async def _done_async(
+        self,
+        issue_id: int,
+        updates: List[PendingUpdate],
+        updated: Optional[Dict],
+        error: Optional[str]
+    ) -> Optional[Dict]:
+        # 콜백은 스냅샷/벡터 색인 갱신, SQLite 기록 등 blocking 작업을 하므로 event loop 밖에서 실행
+        return await asyncio.to_thread(self._done, issue_id, updates, updated, error)
+
+    def _lock_for(self, issue_id: int) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(issue_id, threading.Lock())
+
+    def _async_lock_for(self, issue_id: int) -> asyncio.Lock:
+        # async 모드는 하나의 event loop 에서만 실행되므로 loop 안에서 생성한 lock 재사용
+        with self._locks_lock:
+            return self._async_locks.setdefault(issue_id, asyncio.Lock())
+
+
+class IssueWriteBatch:
+    """
+    Push 하나에서 나온 issue 갱신 모음.
+
+    같은 issue 를 참조하는 commit 들의 이력 항목을 모았다가 flush 시 issue 별로
+    한 번만 기록합니다.
+    """
+
+    def __init__(self, writer: IssueWriter):
+        self.writer = writer
+        self._updates: "OrderedDict[int, List[PendingUpdate]]" = OrderedDict()
+
+    def __contains__(self, issue_id: int) -> bool:
+        return issue_id in self._updates
+
+    def add(self, issue_id: int, entry: str, fields: Dict[str, Any], on_done: UpdateCallback):
+        self._updates.setdefault(issue_id, []).append(PendingUpdate(entry, fields, on_done))
+
+    def flush(self):
+        updates, self._updates = self._updates, OrderedDict()
+        for issue_id, pending in updates.items():
+            self.writer.apply(issue_id, pending)
+
+    async def flush_async(self):
+        updates, self._updates = self._updates, OrderedDict()
+        await asyncio.gather(*(
+            self.writer.apply_async(issue_id, pending)
+            for issue_id, pending in updates.items()
+        ))
@@ -1,18 +1,22 @@
 import logging
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Header, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Request, Header, HTTPException
 from fastapi.responses import JSONResponse
 from app.config import settings
 from app.utils import setup_logging, cleanup_old_logs
+from app.http_client import close_http_clients
+from app.tokens import get_token_counter, get_prompt_cache_stats
+from app.rate_governor import get_rate_governor
 from app.analyzer import CommitAnalyzer
-from app.webhook import WebhookHandler, WebhookQueue
+from app.webhook import WebhookHandler, WebhookQueue, WebhookWorkerPool
 
 logger = setup_logging(settings.LOG_LEVEL)
 
 analyzer = None
 webhook_handler = None
-webhook_queue = WebhookQueue()
+webhook_queue = None
+worker_pool = None
 cleanup_task = None
 
 
@@ -29,9 +33,11 @@ async def periodic_log_cleanup():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global analyzer, webhook_handler, cleanup_task
+    global analyzer, webhook_handler, webhook_queue, worker_pool, cleanup_task
 
     logger.info("Starting Redmine Task Manager...")
+    for message in settings.deprecated_settings():
+        logger.warning(message)
     logger.info(f"GitLab URL: {settings.GITLAB_URL}")
     logger.info(f"Redmine URL: {settings.REDMINE_URL}")
 
@@ -42,12 +48,21 @@ async def lifespan(app: FastAPI):
     analyzer = CommitAnalyzer()
     webhook_handler = WebhookHandler(analyzer)
 
+    webhook_queue = WebhookQueue()
+    worker_pool = WebhookWorkerPool(webhook_queue, webhook_handler, workers=settings.WEBHOOK_WORKERS)
+    worker_pool.start()
+
     logger.info("Application started successfully")
 
     yield
 
     logger.info("Shutting down...")
 
+    await worker_pool.stop()
+    webhook_queue.close()
+    webhook_handler.shutdown()
+    await close_http_clients()
+
     if cleanup_task:
         cleanup_task.cancel()
         try:
@@ -79,14 +94,22 @@ async def health_check():
         "status": "healthy",
         "gitlab_url": settings.GITLAB_URL,
         "redmine_url": settings.REDMINE_URL,
-        "queue_size": webhook_queue.size()
+        "queue": webhook_queue.stats(),
+        "analysis": webhook_handler.stats(),
+        "commit_cache": analyzer.gitlab.cache.stats(),
+        "analysis_cache": analyzer.analysis_cache.stats(),
+        "issue_snapshots": analyzer.issue_snapshot.stats(),
+        "tokens": get_token_counter().stats(),
+        "prompt_cache": get_prompt_cache_stats().stats(),
+        "model_routing": analyzer.chain.router.stats(),
+        "rate_limits": get_rate_governor().stats(),
+        "issue_writes": analyzer.issue_writer.stats()
     }
 
 
 @app.post("/webhook/gitlab")
 async def gitlab_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     x_gitlab_token: str = Header(None, alias="X-Gitlab-Token"),
     x_gitlab_event: str = Header(None, alias="X-Gitlab-Event")
 ):
@@ -100,31 +123,29 @@ async def gitlab_webhook(
             logger.warning("Invalid webhook token")
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        background_tasks.add_task(process_webhook, body, x_gitlab_token)
+        queue_id = webhook_queue.add(body)
+        worker_pool.notify()
 
         return {
             "status": "queued",
+            "queue_id": queue_id,
             "message": "Webhook received and queued for processing"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error handling webhook: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def process_webhook(payload: dict, gitlab_token: str):
-    try:
-        result = await webhook_handler.handle_push_event(payload, gitlab_token)
-        logger.info(f"Webhook processed: {result.get('status')}")
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}", exc_info=True)
-
-
 @app.get("/queue/status")
 async def queue_status():
+    stats = webhook_queue.stats()
     return {
-        "queue_size": webhook_queue.size(),
-        "is_empty": webhook_queue.is_empty()
+        "queue_size": stats['depth'],
+        "is_empty": stats['depth'] == 0,
+        **stats
     }
 
 
@@ -132,7 +153,7 @@ async def queue_status():
 async def test_analyze(commit_data: dict):
 
     try:
-        result = analyzer.process_commit(commit_data)
+        result = await webhook_handler.run_analysis(commit_data)
         return result
     except Exception as e:
         logger.error(f"Error in test analyze: {e}", exc_info=True)
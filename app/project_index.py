@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedmineProjectIndex:
+    """
+    Redmine project 조회용 인메모리 인덱스.
+
+    전체 project 목록(페이지네이션 포함)을 TTL 주기로 갱신하고,
+    GitLab repo 이름 -> Redmine project 매핑 결과를 미리 계산해 둡니다.
+    찾지 못한 이름은 캐시하지 않고, 새로 만든 project 가 바로 잡히도록 간격을 두고 목록을 다시 받습니다.
+    """
+
+    # 갱신 실패 시 재시도 간격 (초)
+    RETRY_INTERVAL = 30
+    # project 를 찾지 못했을 때 목록을 다시 받는 최소 간격 (초)
+    MISS_REFRESH_INTERVAL = 60
+
+    def __init__(self, redmine_client, ttl_seconds: Optional[int] = None):
+        self.redmine = redmine_client
+        self.ttl_seconds = settings.REDMINE_PROJECT_CACHE_TTL if ttl_seconds is None else ttl_seconds
+
+        self._by_name: Dict[str, Dict] = {}
+        self._by_identifier: Dict[str, Dict] = {}
+        self._by_lower_name: Dict[str, Dict] = {}
+        self._resolved: Dict[str, Dict] = {}
+
+        self._loaded = False
+        self._next_refresh_at = 0.0
+        self._next_miss_refresh_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def mapped_name(gitlab_name: str) -> str:
+        if gitlab_name in settings.PROJECT_MAPPING:
+            return settings.PROJECT_MAPPING[gitlab_name]
+        return f"{gitlab_name}{settings.REDMINE_PROJECT_SUFFIX}"
+
+    def resolve(self, gitlab_name: str) -> Optional[Dict]:
+        self._ensure_fresh()
+
+        project = self._resolved.get(gitlab_name)
+        if project is not None:
+            return project
+
+        project = self._lookup(self.mapped_name(gitlab_name))
+        if project is None and self._refresh_on_miss():
+            project = self._lookup(self.mapped_name(gitlab_name))
+
+        if project is not None:
+            self._resolved[gitlab_name] = project
+        self._log_resolution(gitlab_name, project)
+        return project
+
+    def invalidate(self):
+        self._next_refresh_at = 0.0
+
+    def _lookup(self, mapped_name: str) -> Optional[Dict]:
+        return (
+            self._by_name.get(mapped_name)
+            or self._by_identifier.get(mapped_name.lower())
+            or self._by_lower_name.get(mapped_name.lower())
+        )
+
+    def _ensure_fresh(self):
+        if self._loaded and time.monotonic() < self._next_refresh_at:
+            return
+
+        # single-flight: 한 thread 만 갱신하고, 기존 데이터가 있으면 나머지는 기다리지 않음
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+
+        try:
+            if self._loaded and time.monotonic() < self._next_refresh_at:
+                return
+            self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_on_miss(self) -> bool:
+        # 없는 repo 로 push 가 몰려도 Redmine 을 두드리지 않도록 간격 제한 + single-flight
+        if time.monotonic() < self._next_miss_refresh_at:
+            return False
+
+        with self._refresh_lock:
+            if time.monotonic() < self._next_miss_refresh_at:
+                # 기다리는 동안 다른 thread 가 갱신함
+                return True
+            self._next_miss_refresh_at = time.monotonic() + self.MISS_REFRESH_INTERVAL
+            self._refresh()
+        return True
+
+    def _refresh(self):
+        projects = self.redmine.get_projects()
+        if projects is None:
+            logger.warning("Failed to refresh Redmine project index, keeping previous data")
+            self._next_refresh_at = time.monotonic() + self.RETRY_INTERVAL
+            return
+
+        self._build(projects)
+        self._loaded = True
+        self._next_refresh_at = time.monotonic() + self.ttl_seconds
+
+    def _build(self, projects: List[Dict]):
+        by_name = {}
+        by_identifier = {}
+        by_lower_name = {}
+
+        for project in projects:
+            by_name.setdefault(project['name'], project)
+            by_identifier.setdefault(project['identifier'], project)
+            by_lower_name.setdefault(project['name'].lower(), project)
+
+        self._by_name = by_name
+        self._by_identifier = by_identifier
+        self._by_lower_name = by_lower_name
+
+        # PROJECT_MAPPING 및 이전에 조회된 repo 이름은 미리 매핑
+        gitlab_names = set(settings.PROJECT_MAPPING) | set(self._resolved)
+        resolved = {}
+        for gitlab_name in gitlab_names:
+            project = self._lookup(self.mapped_name(gitlab_name))
+            if project is not None:
+                resolved[gitlab_name] = project
+        self._resolved = resolved
+
+        logger.info(
+            f"Redmine project index refreshed: {len(projects)} projects, "
+            f"{len(self._resolved)} precomputed mappings"
+        )
+
+    def _log_resolution(self, gitlab_name: str, project: Optional[Dict]):
+        mapped_name = self.mapped_name(gitlab_name)
+
+        if project:
+            logger.info(f"Resolved Redmine project: {gitlab_name} -> {project['name']} (id: {project['id']})")
+            return
+
+        logger.warning(f"Redmine project not found for GitLab repo '{gitlab_name}' (looking for: '{mapped_name}')")
+        logger.info(f"To fix: Create a Redmine project named '{mapped_name}' or add mapping in PROJECT_MAPPING")
@@ -0,0 +1,315 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.utils import format_file_changes
+from app.tokens import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+
+def split_hunks(diff_content: str) -> Tuple[str, List[str]]:
+    # GitLab diff 는 '@@' 줄로 hunk 가 시작됨, 첫 hunk 이전 내용은 header 로 취급
+    if not diff_content:
+        return "", []
+
+    header_lines: List[str] = []
+    hunks: List[List[str]] = []
+
+    for line in diff_content.split('\n'):
+        if line.startswith('@@'):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            header_lines.append(line)
+
+    return '\n'.join(header_lines), ['\n'.join(hunk) for hunk in hunks]
+
+
+def count_changed_lines(diff_content: str) -> Tuple[int, int]:
+    additions = 0
+    deletions = 0
+
+    for line in (diff_content or '').split('\n'):
+        if line.startswith('+') and not line.startswith('+++'):
+            additions += 1
+        elif line.startswith('-') and not line.startswith('---'):
+            deletions += 1
+
+    return additions, deletions
+
+
+def truncate_diff(diff_content: str, max_lines: int = 20) -> str:
+
+    if not diff_content:
+        return ""
+
+    lines = diff_content.split('\n')
+
+    if len(lines) <= max_lines:
+        return diff_content
+
+    important_lines = []
+    for line in lines:
+        if line.startswith('@@') or line.startswith('+') or line.startswith('-'):
+            important_lines.append(line)
+            if len(important_lines) >= max_lines:
+                break
+
+    result = '\n'.join(important_lines)
+    if len(lines) > len(important_lines):
+        result += f"\n... ({len(lines) - len(important_lines)} more lines)"
+
+    return result
+
+
+class PromptBudgeter:
+    """
+    실제 prompt 를 만들어 token 수를 세고, 예산 안에서 diff 를 우선순위대로 채워 넣습니다.
+
+    파일별로 전체 hunk -> 변경량이 큰 hunk 일부 (몫이 남으면 다음 hunk 를 줄 단위로 잘라 채움)
+    -> preview -> 경로만 순서로 시도하며,
+    예산은 작은 파일부터 균등 분배하고 남는 몫은 큰 파일로 넘깁니다.
+    """
+
+    # 예산 초과 시 재조정 최대 횟수 (파일 경계 token 오차 보정용)
+    MAX_SHRINK_ROUNDS = 5
+
+    def __init__(self, limit: Optional[int] = None, preview_lines: Optional[int] = None):
+        self.limit = limit or (settings.TOKEN_BUDGET_LIMIT - settings.TOKEN_BUDGET_RESPONSE_RESERVE)
+        self.preview_lines = preview_lines or settings.DIFF_PREVIEW_LINES
+        self.counter = get_token_counter()
+
+    def pack(
+        self,
+        diff_data: Dict[str, Any],
+        render: Callable[[Dict[str, Any]], Dict[str, str]],
+        label: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # render 는 prompt 를 구간별(system, issues, diff 등) 문자열로 반환, 변하지 않는 구간은 memo 로 재사용
+        diffs = diff_data.get('diffs', [])
+        summary = diff_data.get('summary', {})
+        total_changed = sum(d.get('additions', 0) + d.get('deletions', 0) for d in diffs)
+
+        # 작은 commit 은 잘라내지 않음: 전체 diff 로 만든 prompt 가 예산 안이면 그대로 사용
+        full_data = {'type': 'full', 'diffs': diffs, 'summary': summary}
+        sections = self.counter.count_sections(render(full_data))
+        if sum(sections.values()) <= self.limit:
+            return self._result(full_data, render, label, 1.0, {'full': len(diffs)})
+
+        files = [self._plan_file(diff) for diff in diffs]
+
+        packed = self._packed_data(files, summary)
+        base_tokens = self._count(render(packed))
+        if base_tokens > self.limit:
+            logger.info(f"Prompt exceeds budget with path-only entries ({base_tokens} > {self.limit})")
+            return self._result(packed, render, label, 0.0, self._levels(files))
+
+        self._allocate(files, self.limit - base_tokens)
+
+        for _ in range(self.MAX_SHRINK_ROUNDS):
+            packed = self._packed_data(files, summary)
+            if self._count(render(packed)) <= self.limit or not self._shrink(files):
+                break
+
+        included = sum(f['included_lines'] for f in files)
+        coverage = included / total_changed if total_changed else 1.0
+
+        return self._result(packed, render, label, coverage, self._levels(files))
+
+    def _count(self, sections: Dict[str, str]) -> int:
+        return sum(self.counter.count_sections(sections).values())
+
+    def _plan_file(self, diff: Dict[str, Any]) -> Dict[str, Any]:
+        path_entry = {
+            'path': diff.get('path'),
+            'additions': diff.get('additions', 0),
+            'deletions': diff.get('deletions', 0),
+        }
+        header, hunks = split_hunks(diff.get('diff', ''))
+
+        return {
+            'diff': diff,
+            'path_entry': path_entry,
+            'path_tokens': self.counter.count(format_file_changes([path_entry])),
+            'header': header,
+            'hunks': hunks,
+            'entry': path_entry,
+            'level': 'path',
+            'cost': 0,
+            'included_lines': 0,
+        }
+
+    def _entry_cost(self, file: Dict[str, Any], entry: Dict[str, Any]) -> int:
+        return self.counter.count(format_file_changes([entry], include_diff=True)) - file['path_tokens']
+
+    def _allocate(self, files: List[Dict[str, Any]], remaining: int):
+        for file in files:
+            file['full_cost'] = self._entry_cost(file, {**file['path_entry'], 'diff': file['diff'].get('diff', '')})
+
+        # 작은 파일부터 균등 몫을 배정하고, 쓰고 남은 몫은 뒤의 큰 파일로 이월
+        ordered = sorted(files, key=lambda f: f['full_cost'])
+        for idx, file in enumerate(ordered):
+            share = remaining // (len(ordered) - idx)
+            self._fit_file(file, share)
+            remaining -= file['cost']
+
+    def _fit_file(self, file: Dict[str, Any], share: int):
+        path_entry = file['path_entry']
+        changed = path_entry['additions'] + path_entry['deletions']
+        self._set_level(file, 'path', path_entry, 0, 0)
+
+        if not file['diff'].get('diff'):
+            return
+
+        if file['full_cost'] <= share:
+            self._set_level(file, 'full', {**path_entry, 'diff': file['diff']['diff']}, file['full_cost'], changed)
+            return
+
+        partial = self._select_hunks(file, share)
+        if partial:
+            entry, cost, lines = partial
+            self._set_level(file, 'hunks', entry, cost, lines)
+            return
+
+        preview = truncate_diff(file['diff']['diff'], max_lines=self.preview_lines)
+        preview_entry = {**path_entry, 'diff_preview': preview}
+        cost = self._entry_cost(file, preview_entry)
+        if cost <= share:
+            self._set_level(file, 'preview', preview_entry, cost, sum(count_changed_lines(preview)))
+
+    def _select_hunks(self, file: Dict[str, Any], share: int) -> Optional[Tuple[Dict[str, Any], int, int]]:
+        hunks = file['hunks']
+        if not hunks:
+            return None
+
+        # 변경 줄 수가 많은 hunk 가 더 많은 정보를 담는다고 보고 우선 선택
+        hunk_tokens = self.counter.count_many(hunks)
+        scored = sorted(
+            ((sum(count_changed_lines(hunk)), idx, tokens) for idx, (hunk, tokens) in enumerate(zip(hunks, hunk_tokens))),
+            key=lambda item: (-item[0], item[2])
+        )
+
+        selected = []
+        used = 0
+        cut_idx = None
+        for changed, idx, tokens in scored:
+            if used + tokens <= share:
+                selected.append((idx, changed))
+                used += tokens
+            elif cut_idx is None:
+                cut_idx = idx
+
+        # 통째로 들어가지 않는 다음 hunk 는 남은 몫만큼 줄 단위로 잘라 채움
+        cut_budget = share - used
+        cut = self._truncate_hunk(hunks[cut_idx], hunk_tokens[cut_idx], cut_budget) if cut_idx is not None else None
+
+        while selected or cut:
+            texts = {idx: hunks[idx] for idx, _ in selected}
+            if cut:
+                texts[cut_idx] = cut[0]
+
+            parts = [file['header']] if file['header'] else []
+            parts.extend(texts[idx] for idx in sorted(texts))
+            omitted = len(hunks) - len(texts)
+            if omitted:
+                parts.append(f"... ({omitted} more hunks omitted)")
+
+            entry = {**file['path_entry'], 'diff': '\n'.join(parts)}
+            cost = self._entry_cost(file, entry)
+            if cost <= share:
+                lines = sum(changed for _, changed in selected) + (cut[1] if cut else 0)
+                return entry, cost, lines
+
+            # 들여쓰기/구분 줄로 인한 오차: 잘라 넣은 hunk 를 먼저 줄이고, 그다음 정보량이 적은 hunk 부터 제외
+            if cut:
+                cut_budget -= cost - share
+                cut = self._truncate_hunk(hunks[cut_idx], hunk_tokens[cut_idx], cut_budget)
+            else:
+                selected.remove(min(selected, key=lambda item: item[1]))
+
+        return None
+
+    @staticmethod
+    def _truncate_hunk(hunk: str, hunk_tokens: int, budget: int) -> Optional[Tuple[str, int]]:
+        # hunk 전체의 글자당 token 비율로 budget 에 맞는 앞부분 줄만 남김 (정확한 비용은 호출 측에서 확인)
+        if budget <= 0 or not hunk_tokens:
+            return None
+
+        lines = hunk.split('\n')
+        max_chars = len(hunk) * budget // hunk_tokens
+        kept = 0
+        chars = 0
+        for line in lines:
+            chars += len(line) + 1
+            if chars > max_chars:
+                break
+            kept += 1
+
+        # '@@' 줄만 남으면 의미가 없으므로 제외
+        if kept < 2 or kept >= len(lines):
+            return None
+
+        text = '\n'.join(lines[:kept]) + f"\n... ({len(lines) - kept} more lines)"
+        return text, sum(count_changed_lines(text))
+
+    @staticmethod
+    def _set_level(file: Dict[str, Any], level: str, entry: Dict[str, Any], cost: int, included_lines: int):
+        file['level'] = level
+        file['entry'] = entry
+        file['cost'] = cost
+        file['included_lines'] = included_lines
+
+    def _shrink(self, files: List[Dict[str, Any]]) -> bool:
+        candidates = [f for f in files if f['level'] != 'path']
+        if not candidates:
+            return False
+
+        # 가장 큰 항목의 몫을 절반으로 줄여 다시 배치
+        largest = max(candidates, key=lambda f: f['cost'])
+        self._fit_file(largest, largest['cost'] // 2)
+        return True
+
+    @staticmethod
+    def _packed_data(files: List[Dict[str, Any]], summary: Dict[str, Any]) -> Dict[str, Any]:
+        all_full = files and all(f['level'] == 'full' for f in files)
+        return {
+            'type': 'full' if all_full else 'summary',
+            'diffs': [f['entry'] for f in files],
+            'summary': summary,
+        }
+
+    @staticmethod
+    def _levels(files: List[Dict[str, Any]]) -> Dict[str, int]:
+        levels: Dict[str, int] = {}
+        for f in files:
+            levels[f['level']] = levels.get(f['level'], 0) + 1
+        return levels
+
+    def _result(
+        self,
+        data: Dict[str, Any],
+        render: Callable[[Dict[str, Any]], Dict[str, str]],
+        label: Optional[str],
+        coverage: float,
+        levels: Dict[str, int]
+    ) -> Dict[str, Any]:
+        # 최종 prompt 는 구간별 token 수를 label 기준 사용량 통계에 기록
+        sections = self.counter.count_sections(render(data), label=label)
+        prompt_tokens = sum(sections.values())
+
+        logger.info(
+            f"Prompt {prompt_tokens}/{self.limit} tokens "
+            f"(coverage {coverage:.0%}, levels {levels}, sections {sections})"
+        )
+
+        return {
+            **data,
+            'budget': {
+                'prompt_tokens': prompt_tokens,
+                'limit': self.limit,
+                'coverage': round(coverage, 3),
+                'levels': levels,
+                'sections': sections,
+            }
+        }
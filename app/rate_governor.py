@@ -0,0 +1,290 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 낮을수록 먼저 처리 (명시적 issue 문서화 > commit 분석/종합 > 청크 병합 > 청크 분석)
+PRIORITIES = {
+    'documentation': 0,
+    'analysis': 1,
+    'synthesis': 1,
+    'merge': 2,
+    'chunk': 3,
+}
+DEFAULT_PRIORITY = 2
+
+# x-ratelimit-reset-* 헤더 값 (예: "1s", "6m0s", "20ms")
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Dict[str, Any], name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class _ModelBudget:
+    # 분당 한도를 초당 비율로 채우는 token bucket (requests / tokens 두 개)
+
+    def __init__(self, rpm: int, tpm: int, headroom: float):
+        self.configured_rpm = rpm
+        self.configured_tpm = tpm
+        self.headroom = headroom
+
+        self.rpm = rpm * headroom
+        self.tpm = tpm * headroom
+        self.requests = self.rpm
+        self.tokens = self.tpm
+        self.updated = time.monotonic()
+
+        self.admitted = 0
+        self.waited_seconds = 0.0
+        self.rate_limited = 0
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+            self.updated = now
+
+    def wait_time(self, tokens: int) -> float:
+        # 한도보다 큰 요청은 bucket 이 가득 찼을 때 통과시킴 (영원히 대기하지 않도록)
+        tokens = min(tokens, self.tpm)
+        request_wait = max(0.0, (1 - self.requests) * 60 / self.rpm) if self.rpm else 0.0
+        token_wait = max(0.0, (tokens - self.tokens) * 60 / self.tpm) if self.tpm else 0.0
+        return max(request_wait, token_wait)
+
+    def consume(self, tokens: int):
+        self.requests -= 1
+        self.tokens -= min(tokens, self.tpm)
+        self.admitted += 1
+
+
+class RateGovernor:
+    """
+    OpenAI 호출 admission controller.
+
+    모든 chain 호출은 실행 전에 모델별 RPM/TPM 예산을 확보합니다. 대기 중인 호출은
+    우선순위(문서화 > 분석 > 청크) 순서로 통과하고, 응답의 x-ratelimit-* 헤더로
+    실제 남은 한도를 반영해 429 재시도 없이 한도 바로 아래에서 처리량을 유지합니다.
+    """
+
+    # 대기 중 재확인 최대 간격 (초)
+    POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, int]]] = None,
+        headroom: Optional[float] = None,
+        max_wait: Optional[float] = None
+    ):
+        self.limits = settings.RATE_LIMITS if limits is None else limits
+        self.headroom = settings.RATE_LIMIT_HEADROOM if headroom is None else headroom
+        self.max_wait = settings.LLM_REQUEST_TIMEOUT if max_wait is None else max_wait
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._budgets: Dict[str, _ModelBudget] = {}
+        # 모델별 대기열 (priority, 순번)
+        self._queues: Dict[str, list] = {}
+        self._sequence = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RATE_LIMIT_ENABLED
+
+    def acquire(self, model: str, tokens: int, label: str = 'analysis'):
+        if not self.enabled:
+            return
+
+        ticket = self._enqueue(model, label)
+        deadline = time.monotonic() + self.max_wait
+        started = time.monotonic()
+
+        with self._condition:
+            try:
+                while True:
+                    wait = self._try_admit(model, ticket, tokens, started)
+                    if wait is None:
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Rate governor wait exceeded {self.max_wait}s for {model} ({label})")
+                    self._condition.wait(min(wait, remaining, self.POLL_INTERVAL))
+            finally:
+                self._discard(model, ticket)
+
+    async def acquire_async(self, model: str, tokens: int, label: str = 'analysis'):
+        if not self.enabled:
+            return
+
+        ticket = self._enqueue(model, label)
+        deadline = time.monotonic() + self.max_wait
+        started = time.monotonic()
+
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_admit(model, ticket, tokens, started)
+                if wait is None:
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(f"Rate governor wait exceeded {self.max_wait}s for {model} ({label})")
+                await asyncio.sleep(min(wait, remaining, self.POLL_INTERVAL))
+        finally:
+            with self._condition:
+                self._discard(model, ticket)
+
+    def settle(self, model: str, reserved: int, used: Optional[int]):
+        # 예약한 token 과 실제 사용량의 차이를 반영
+        if not self.enabled or used is None:
+            return
+
+        with self._condition:
+            budget = self._budget(model)
+            budget.tokens = min(budget.tpm, budget.tokens + min(reserved, budget.tpm) - used)
+            self._condition.notify_all()
+
+    def observe(self, model: str, headers: Optional[Dict[str, Any]]):
+        # 다른 프로세스/서비스가 같은 org 한도를 쓰므로 서버가 알려준 남은 양에 맞춰 bucket 을 낮춤
+        if not self.enabled or not headers:
+            return
+
+        headers = {str(key).lower(): value for key, value in headers.items()}
+        limit_requests = _header_int(headers, 'x-ratelimit-limit-requests')
+        limit_tokens = _header_int(headers, 'x-ratelimit-limit-tokens')
+        remaining_requests = _header_int(headers, 'x-ratelimit-remaining-requests')
+        remaining_tokens = _header_int(headers, 'x-ratelimit-remaining-tokens')
+
+        with self._condition:
+            budget = self._budget(model)
+            budget.refill(time.monotonic())
+
+            if limit_requests:
+                budget.rpm = min(budget.configured_rpm, limit_requests) * self.headroom
+            if limit_tokens:
+                budget.tpm = min(budget.configured_tpm, limit_tokens) * self.headroom
+
+            reserve_requests = (limit_requests or budget.configured_rpm) * (1 - self.headroom)
+            reserve_tokens = (limit_tokens or budget.configured_tpm) * (1 - self.headroom)
+            if remaining_requests is not None:
+                budget.requests = min(budget.requests, remaining_requests - reserve_requests)
+            if remaining_tokens is not None:
+                budget.tokens = min(budget.tokens, remaining_tokens - reserve_tokens)
+
+    def penalize(self, model: str, headers: Optional[Dict[str, Any]] = None):
+        # 429 를 받으면 reset 시점까지 새 요청을 보내지 않도록 bucket 을 비움
+        if not self.enabled:
+            return
+
+        headers = {str(key).lower(): value for key, value in (headers or {}).items()}
+        reset = max(
+            _parse_duration(headers.get('x-ratelimit-reset-tokens')) or 0.0,
+            _parse_duration(headers.get('x-ratelimit-reset-requests')) or 0.0,
+            float(_header_int(headers, 'retry-after') or 0),
+            1.0,
+        )
+
+        with self._condition:
+            budget = self._budget(model)
+            budget.refill(time.monotonic())
+            budget.rate_limited += 1
+            budget.tokens = min(budget.tokens, -reset * budget.tpm / 60)
+            budget.requests = min(budget.requests, -reset * budget.rpm / 60)
+
+        logger.warning(f"Rate limited on {model}, pausing admissions for {reset:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            now = time.monotonic()
+            models = {}
+            for model, budget in self._budgets.items():
+                budget.refill(now)
+                models[model] = {
+                    'rpm_limit': round(budget.rpm),
+                    'tpm_limit': round(budget.tpm),
+                    'available_requests': round(budget.requests, 1),
+                    'available_tokens': round(budget.tokens),
+                    'queued': len(self._queues.get(model, [])),
+                    'admitted': budget.admitted,
+                    'waited_seconds': round(budget.waited_seconds, 3),
+                    'rate_limited': budget.rate_limited,
+                }
+            return {'enabled': self.enabled, 'models': models}
+
+    def _budget(self, model: str) -> _ModelBudget:
+        budget = self._budgets.get(model)
+        if budget is None:
+            limits = self.limits.get(model) or self.limits.get('default') or {}
+            budget = _ModelBudget(limits.get('rpm', 500), limits.get('tpm', 30000), self.headroom)
+            self._budgets[model] = budget
+        return budget
+
+    def _enqueue(self, model: str, label: str) -> Tuple[int, int]:
+        priority = PRIORITIES.get(label.split('_')[0], DEFAULT_PRIORITY)
+        ticket = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._queues.setdefault(model, []), ticket)
+        return ticket
+
+    def _discard(self, model: str, ticket: Tuple[int, int]):
+        queue = self._queues.get(model, [])
+        if ticket in queue:
+            queue.remove(ticket)
+            heapq.heapify(queue)
+        self._condition.notify_all()
+
+    def _try_admit(self, model: str, ticket: Tuple[int, int], tokens: int, started: float) -> Optional[float]:
+        # lock 안에서 호출. 통과하면 None, 아니면 다시 확인할 때까지의 대기 시간 반환
+        queue = self._queues[model]
+        budget = self._budget(model)
+        now = time.monotonic()
+        budget.refill(now)
+
+        # 앞선 우선순위의 호출이 있으면 예산이 있어도 양보
+        if queue[0] != ticket:
+            return self.POLL_INTERVAL
+
+        wait = budget.wait_time(tokens)
+        if wait > 0:
+            return wait
+
+        budget.consume(tokens)
+        budget.waited_seconds += now - started
+        heapq.heappop(queue)
+        return None
+
+
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateGovernor:
+    global _governor
+
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = RateGovernor()
+
+    return _governor
@@ -1,8 +1,10 @@
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-import requests
+from datetime import datetime, timedelta, timezone
+import httpx
 from app.config import settings
+from app.http_client import REQUEST_ERRORS, get_http_client, get_async_http_client
+from app.project_index import RedmineProjectIndex
 
 logger = logging.getLogger(__name__)
 
@@ -15,42 +17,113 @@ class RedmineClient:
             "X-Redmine-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self.project_index = RedmineProjectIndex(self)
+
+    def _request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+        response = get_http_client().request(
+            method,
+            f"{self.base_url}{path}",
+            headers={**self.headers, **(headers or {})},
+            timeout=10,
+            **kwargs
+        )
+        response.raise_for_status()
+        return response
+
+    async def _request_async(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> httpx.Response:
+        response = await get_async_http_client().request(
+            method,
+            f"{self.base_url}{path}",
+            headers={**self.headers, **(headers or {})},
+            timeout=10,
+            **kwargs
+        )
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _log_error_response(e: Exception):
+        if isinstance(e, httpx.HTTPStatusError):
+            logger.error(f"Response: {e.response.text}")
+
+    # Redmine API 한 페이지 최대 크기
+    PAGE_SIZE = 100
 
     def get_projects(self) -> Optional[List[Dict]]:
         try:
-            url = f"{self.base_url}/projects.json"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json().get('projects', [])
-        except requests.RequestException as e:
+            projects = []
+            offset = 0
+            while True:
+                data = self._request(
+                    'GET',
+                    '/projects.json',
+                    params={'limit': self.PAGE_SIZE, 'offset': offset}
+                ).json()
+                page = data.get('projects', [])
+                projects.extend(page)
+                offset += len(page)
+                if not page or offset >= data.get('total_count', 0):
+                    return projects
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get projects: {e}")
             return None
 
-    def get_project_by_name(self, name: str) -> Optional[Dict]:
-        if name in settings.PROJECT_MAPPING:
-            mapped_name = settings.PROJECT_MAPPING[name]
-            logger.info(f"Using PROJECT_MAPPING: {name} -> {mapped_name}")
-        else:
-            mapped_name = f"{name}{settings.REDMINE_PROJECT_SUFFIX}"
-            logger.info(f"Using suffix mapping: {name} -> {mapped_name}")
-
-        projects = self.get_projects()
-        if not projects:
+    async def get_projects_async(self) -> Optional[List[Dict]]:
+        try:
+            projects = []
+            offset = 0
+            while True:
+                response = await self._request_async(
+                    'GET',
+                    '/projects.json',
+                    params={'limit': self.PAGE_SIZE, 'offset': offset}
+                )
+                data = response.json()
+                page = data.get('projects', [])
+                projects.extend(page)
+                offset += len(page)
+                if not page or offset >= data.get('total_count', 0):
+                    return projects
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get projects: {e}")
             return None
 
-        for project in projects:
-            if project['name'] == mapped_name or project['identifier'] == mapped_name.lower():
-                logger.info(f"Found Redmine project: {project['name']} (id: {project['id']})")
-                return project
-
-        for project in projects:
-            if project['name'].lower() == mapped_name.lower():
-                logger.info(f"Found Redmine project (case-insensitive): {project['name']} (id: {project['id']})")
-                return project
+    def get_project_by_name(self, name: str) -> Optional[Dict]:
+        return self.project_index.resolve(name)
 
-        logger.warning(f"Redmine project not found for GitLab repo '{name}' (looking for: '{mapped_name}')")
-        logger.info(f"To fix: Create a Redmine project named '{mapped_name}' or add mapping in PROJECT_MAPPING")
-        return None
+    def _issue_params(
+        self,
+        project_id: Optional[int],
+        status_id: Optional[str],
+        limit: int,
+        updated_within_days: Optional[int]
+    ) -> Dict[str, Any]:
+        params = {'limit': limit}
+
+        if project_id:
+            params['project_id'] = project_id
+
+        if status_id == 'in_progress':
+            params['status_id'] = settings.REDMINE_STATUS_IN_PROGRESS
+        elif status_id == 'open':
+            params['status_id'] = 'open'
+        elif status_id:
+            params['status_id'] = status_id
+
+        # 최근 N일 이내 업데이트된 이슈만 검색
+        if updated_within_days:
+            cutoff_date = datetime.now() - timedelta(days=updated_within_days)
+            date_str = cutoff_date.strftime('%Y-%m-%d')
+            params['updated_on'] = f'>={date_str}'
+            logger.info(f"Filtering issues updated on or after {date_str}")
+
+        return params
 
     def get_issues(
         self,
@@ -61,125 +134,204 @@ class RedmineClient:
     ) -> Optional[List[Dict]]:
 
         try:
-            url = f"{self.base_url}/issues.json"
-            params = {'limit': limit}
-
-            if project_id:
-                params['project_id'] = project_id
-
-            if status_id == 'in_progress':
-                params['status_id'] = settings.REDMINE_STATUS_IN_PROGRESS
-            elif status_id == 'open':
-                params['status_id'] = 'open'
-            elif status_id:
-                params['status_id'] = status_id
-
-            # 최근 N일 이내 업데이트된 이슈만 검색
-            if updated_within_days:
-                cutoff_date = datetime.now() - timedelta(days=updated_within_days)
-                date_str = cutoff_date.strftime('%Y-%m-%d')
-                params['updated_on'] = f'>={date_str}'
-                logger.info(f"Filtering issues updated on or after {date_str}")
-
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
+            params = self._issue_params(project_id, status_id, limit, updated_within_days)
+            return self._request('GET', '/issues.json', params=params).json().get('issues', [])
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get issues: {e}")
+            return None
+
+    async def get_issues_async(
+        self,
+        project_id: Optional[int] = None,
+        status_id: Optional[str] = None,
+        limit: int = 100,
+        updated_within_days: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+
+        try:
+            params = self._issue_params(project_id, status_id, limit, updated_within_days)
+            response = await self._request_async('GET', '/issues.json', params=params)
             return response.json().get('issues', [])
-        except requests.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get issues: {e}")
             return None
 
+    def get_all_issues(
+        self,
+        project_id: Optional[int] = None,
+        status_id: Optional[str] = None,
+        updated_since: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+
+        try:
+            params = self._issue_params(project_id, status_id, self.PAGE_SIZE, None)
+            params['sort'] = 'id'
+            if updated_since:
+                params['updated_on'] = f">={updated_since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+            issues = []
+            offset = 0
+            while True:
+                params['offset'] = offset
+                data = self._request('GET', '/issues.json', params=params).json()
+                page = data.get('issues', [])
+                issues.extend(page)
+                offset += len(page)
+                if not page or offset >= data.get('total_count', 0):
+                    return issues
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get issues: {e}")
+            return None
+
+    def get_issue_statuses(self) -> Optional[List[Dict]]:
+        try:
+            return self._request('GET', '/issue_statuses.json').json().get('issue_statuses', [])
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get issue statuses: {e}")
+            return None
+
     def get_issue(self, issue_id: int) -> Optional[Dict]:
         try:
-            url = f"{self.base_url}/issues/{issue_id}.json"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            return self._request('GET', f'/issues/{issue_id}.json').json().get('issue')
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to get issue {issue_id}: {e}")
+            return None
+
+    async def get_issue_async(self, issue_id: int) -> Optional[Dict]:
+        try:
+            response = await self._request_async('GET', f'/issues/{issue_id}.json')
             return response.json().get('issue')
-        except requests.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get issue {issue_id}: {e}")
             return None
 
     def create_issue(self, issue_data: Dict[str, Any]) -> Optional[Dict]:
 
         try:
-            url = f"{self.base_url}/issues.json"
-            payload = {"issue": issue_data}
+            response = self._request('POST', '/issues.json', json={"issue": issue_data})
 
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            created_issue = response.json().get('issue')
+            logger.info(f"Created Redmine issue #{created_issue['id']}: {issue_data['subject']}")
+            return created_issue
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to create issue: {e}")
+            self._log_error_response(e)
+            return None
+
+    async def create_issue_async(self, issue_data: Dict[str, Any]) -> Optional[Dict]:
+
+        try:
+            response = await self._request_async('POST', '/issues.json', json={"issue": issue_data})
 
             created_issue = response.json().get('issue')
             logger.info(f"Created Redmine issue #{created_issue['id']}: {issue_data['subject']}")
             return created_issue
 
-        except requests.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to create issue: {e}")
-            if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+            self._log_error_response(e)
             return None
 
     def update_issue(
         self,
         issue_id: int,
         issue_data: Dict[str, Any],
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        current: Optional[Dict] = None
     ) -> Optional[Dict]:
 
         try:
-            url = f"{self.base_url}/issues/{issue_id}.json"
             payload = {"issue": issue_data}
 
             if notes:
                 payload["issue"]["notes"] = notes
 
-            response = requests.put(
-                url,
-                headers=self.headers,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._request('PUT', f'/issues/{issue_id}.json', json=payload)
 
             logger.info(f"Updated Redmine issue #{issue_id}")
+            if current is not None:
+                return self._merge_issue(current, issue_data)
             return self.get_issue(issue_id)
 
-        except requests.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to update issue {issue_id}: {e}")
-            if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+            self._log_error_response(e)
             return None
 
-    def search_issues_by_subject(
+    async def update_issue_async(
         self,
-        project_id: int,
-        keywords: List[str],
-        status_id: Optional[str] = 'in_progress'
-    ) -> List[Dict]:
-
-        issues = self.get_issues(project_id=project_id, status_id=status_id)
-        if not issues:
-            return []
-
-        scored_issues = []
-        for issue in issues:
-            subject = issue.get('subject', '').lower()
-            description = issue.get('description', '').lower()
-
-            score = 0
-            for keyword in keywords:
-                keyword = keyword.lower()
-                if keyword in subject:
-                    score += 3 
-                if keyword in description:
-                    score += 1
-
-            if score > 0:
-                scored_issues.append((score, issue))
-
-        scored_issues.sort(key=lambda x: x[0], reverse=True)
-
-        return [issue for score, issue in scored_issues]
+        issue_id: int,
+        issue_data: Dict[str, Any],
+        notes: Optional[str] = None,
+        current: Optional[Dict] = None
+    ) -> Optional[Dict]:
+
+        try:
+            payload = {"issue": issue_data}
+
+            if notes:
+                payload["issue"]["notes"] = notes
+
+            await self._request_async('PUT', f'/issues/{issue_id}.json', json=payload)
+
+            logger.info(f"Updated Redmine issue #{issue_id}")
+            if current is not None:
+                return self._merge_issue(current, issue_data)
+            return await self.get_issue_async(issue_id)
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"Failed to update issue {issue_id}: {e}")
+            self._log_error_response(e)
+            return None
+
+    # 첨부 파일 업로드는 본문을 그대로 전송
+    UPLOAD_HEADERS = {"Content-Type": "application/octet-stream"}
+
+    def upload_file(self, filename: str, content: bytes) -> Optional[str]:
+        try:
+            response = self._request(
+                'POST',
+                '/uploads.json',
+                headers=self.UPLOAD_HEADERS,
+                params={'filename': filename},
+                content=content
+            )
+            return response.json()['upload']['token']
+        except REQUEST_ERRORS + (KeyError,) as e:
+            logger.error(f"Failed to upload {filename}: {e}")
+            return None
+
+    async def upload_file_async(self, filename: str, content: bytes) -> Optional[str]:
+        try:
+            response = await self._request_async(
+                'POST',
+                '/uploads.json',
+                headers=self.UPLOAD_HEADERS,
+                params={'filename': filename},
+                content=content
+            )
+            return response.json()['upload']['token']
+        except REQUEST_ERRORS + (KeyError,) as e:
+            logger.error(f"Failed to upload {filename}: {e}")
+            return None
+
+    @staticmethod
+    def _merge_issue(current: Dict, issue_data: Dict[str, Any]) -> Dict:
+        # PUT 직전에 조회한 issue 에 변경 필드를 반영해 재조회(GET) 없이 갱신 결과 구성
+        merged = dict(current)
+        for key, value in issue_data.items():
+            if key in ('notes', 'uploads'):
+                continue
+
+            # status_id 등은 조회 결과에서 {'id', 'name'} 형태이므로 id 가 바뀐 경우에만 교체 (name 은 다음 동기화 때 반영)
+            field = key[:-3] if key.endswith('_id') else None
+            if field and isinstance(current.get(field), dict):
+                if current[field].get('id') != value:
+                    merged[field] = {'id': value}
+                continue
+
+            merged[key] = value
+
+        merged['updated_on'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return merged
@@ -0,0 +1,246 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """
+    Prompt token 계산기.
+
+    tiktoken encoder 는 처음 사용할 때 한 번만 로딩하고, 반복되는 블록(system prompt,
+    issue 목록 등)은 내용 해시 기준으로 결과를 재사용합니다. 매우 큰 입력은 일부 구간만
+    정확히 세어 비율로 추정합니다.
+    """
+
+    # encoder 를 쓸 수 없을 때 사용하는 글자당 token 비율 (코드/영문 기준)
+    FALLBACK_TOKENS_PER_CHAR = 0.3
+    # 큰 입력 추정 시 정확히 세는 구간 수
+    SAMPLE_WINDOWS = 4
+
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        memo_max_entries: Optional[int] = None,
+        exact_max_chars: Optional[int] = None
+    ):
+        self.model = model
+        self.memo_max_entries = settings.TOKEN_MEMO_MAX_ENTRIES if memo_max_entries is None else memo_max_entries
+        self.exact_max_chars = settings.TOKEN_EXACT_MAX_CHARS if exact_max_chars is None else exact_max_chars
+
+        self._encoding = None
+        self._encoding_failed = False
+        self._load_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[bytes, int]" = OrderedDict()
+        self._sections: Dict[str, Dict[str, int]] = {}
+
+        self.exact_counts = 0
+        self.estimated_counts = 0
+        self.memo_hits = 0
+
+    def _get_encoding(self):
+        if self._encoding is not None or self._encoding_failed:
+            return self._encoding
+
+        with self._load_lock:
+            if self._encoding is None and not self._encoding_failed:
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                    logger.info(f"Loaded token encoder '{self._encoding.name}' for {self.model}")
+                except Exception as e:
+                    # 패키지 미설치/BPE 파일 다운로드 실패 시에도 분석은 계속되도록 추정치로 대체
+                    self._encoding_failed = True
+                    logger.warning(f"Token encoder unavailable, using estimation: {e}")
+
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+
+        key = self._memo_key(text)
+        cached = self._memo_get(key)
+        if cached is not None:
+            return cached
+
+        tokens = self._count_uncached(text)
+        self._memo_set(key, tokens)
+        return tokens
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        results: List[Optional[int]] = []
+        pending: Dict[int, tuple] = {}
+
+        for idx, text in enumerate(texts):
+            if not text:
+                results.append(0)
+                continue
+
+            key = self._memo_key(text)
+            cached = self._memo_get(key)
+            results.append(cached)
+            if cached is None:
+                pending[idx] = (key, text)
+
+        encoding = self._get_encoding()
+        batch = [idx for idx, (_, text) in pending.items() if encoding and len(text) <= self.exact_max_chars]
+
+        if batch:
+            # 작은 입력들은 encode_ordinary_batch 로 한 번에 계산
+            encoded = encoding.encode_ordinary_batch([pending[idx][1] for idx in batch])
+            with self._lock:
+                self.exact_counts += len(batch)
+            for idx, tokens in zip(batch, encoded):
+                results[idx] = len(tokens)
+                self._memo_set(pending[idx][0], len(tokens))
+
+        for idx, (key, text) in pending.items():
+            if results[idx] is None:
+                results[idx] = self._count_uncached(text)
+                self._memo_set(key, results[idx])
+
+        return results
+
+    def count_sections(self, sections: Dict[str, str], label: Optional[str] = None) -> Dict[str, int]:
+        names = list(sections)
+        counts = dict(zip(names, self.count_many([sections[name] for name in names])))
+
+        # label 이 주어지면 실제 전송된 prompt 로 보고 구간별 누적 사용량에 반영
+        if label:
+            with self._lock:
+                usage = self._sections.setdefault(label, {'calls': 0})
+                usage['calls'] += 1
+                for name, tokens in counts.items():
+                    usage[name] = usage.get(name, 0) + tokens
+
+        return counts
+
+    def estimate(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return int(len(text) * self.FALLBACK_TOKENS_PER_CHAR) + 1
+
+        # 전체를 encode 하는 대신 균등 간격 구간만 정확히 세어 글자당 비율로 환산
+        window = max(1, self.exact_max_chars // (self.SAMPLE_WINDOWS * 4))
+        step = max(window, len(text) // self.SAMPLE_WINDOWS)
+        samples = [text[start:start + window] for start in range(0, len(text), step)][:self.SAMPLE_WINDOWS]
+
+        sampled_chars = sum(len(sample) for sample in samples)
+        sampled_tokens = sum(len(tokens) for tokens in encoding.encode_ordinary_batch(samples))
+
+        return int(len(text) * sampled_tokens / sampled_chars) + 1
+
+    def _count_uncached(self, text: str) -> int:
+        encoding = self._get_encoding()
+
+        if encoding is not None and len(text) <= self.exact_max_chars:
+            with self._lock:
+                self.exact_counts += 1
+            return len(encoding.encode_ordinary(text))
+
+        with self._lock:
+            self.estimated_counts += 1
+        return self.estimate(text)
+
+    @staticmethod
+    def _memo_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def _memo_get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            tokens = self._memo.get(key)
+            if tokens is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+            return tokens
+
+    def _memo_set(self, key: bytes, tokens: int):
+        if self.memo_max_entries <= 0:
+            return
+
+        with self._lock:
+            self._memo[key] = tokens
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_max_entries:
+                self._memo.popitem(last=False)
+
+    def stats(self) -> Dict:
+        encoding = self._encoding
+        with self._lock:
+            return {
+                'encoder': encoding.name if encoding is not None else ('estimation' if self._encoding_failed else 'not_loaded'),
+                'exact_counts': self.exact_counts,
+                'estimated_counts': self.estimated_counts,
+                'memo_hits': self.memo_hits,
+                'memo_entries': len(self._memo),
+                'prompt_sections': {label: dict(usage) for label, usage in self._sections.items()},
+            }
+
+
+class PromptCacheStats:
+    """
+    LLM 응답의 usage 정보로 project 별 prompt cache 적중률을 집계합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._projects: Dict[str, Dict[str, int]] = {}
+
+    def record(self, project: Optional[str], label: str, input_tokens: int, cached_tokens: int):
+        with self._lock:
+            usage = self._projects.setdefault(project or 'unknown', {})
+            for key, value in (
+                ('calls', 1),
+                ('input_tokens', input_tokens),
+                ('cached_tokens', cached_tokens),
+                (f'{label}_calls', 1),
+                (f'{label}_cached_tokens', cached_tokens),
+            ):
+                usage[key] = usage.get(key, 0) + value
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                project: {
+                    **usage,
+                    'cached_ratio': round(usage['cached_tokens'] / usage['input_tokens'], 3) if usage['input_tokens'] else 0.0,
+                }
+                for project, usage in self._projects.items()
+            }
+
+
+_counter: Optional[TokenCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    global _counter
+
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = TokenCounter()
+
+    return _counter
+
+
+_cache_stats: Optional[PromptCacheStats] = None
+_cache_stats_lock = threading.Lock()
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    global _cache_stats
+
+    if _cache_stats is None:
+        with _cache_stats_lock:
+            if _cache_stats is None:
+                _cache_stats = PromptCacheStats()
+
+    return _cache_stats
@@ -2,14 +2,13 @@ import re
 import json
 import yaml
 import logging
-import tiktoken
-import glob
 from pathlib import Path
 from fnmatch import fnmatch
-from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
 from app.config import PROMPTS_DIR, LOGS_DIR
+from app.commit_store import get_processed_commit_store
+from app.tokens import get_token_counter
 
 
 
@@ -74,29 +73,6 @@ def should_ignore_file(file_path: str, ignored_patterns: list) -> bool:
     return False
 
 
-def extract_json_from_text(text: str) -> Optional[Dict]:
-
-    json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-    match = re.search(json_pattern, text, re.DOTALL)
-
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
-
-    json_pattern = r'\{.*\}'
-    match = re.search(json_pattern, text, re.DOTALL)
-
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
-
-    return None
-
-
 def sanitize_sensitive_data(text: str) -> str:
     text = re.sub(
         r'(password|passwd|pwd)\s*[:=]\s*["\']?[^"\'\s]+["\']?',
@@ -134,6 +110,8 @@ def format_file_changes(diffs: list, include_diff: bool = False) -> str:
         path = diff.get('path', diff.get('new_path', 'unknown'))
 
         line = f"- {path} (+{additions}, -{deletions})"
+        if diff.get('partial'):
+            line += " [일부]"
 
         if include_diff:
             diff_content = diff.get('diff') or diff.get('diff_preview')
@@ -170,78 +148,22 @@ def format_redmine_issues(issues: list) -> str:
 
 
 def is_commit_already_processed(commit_sha: str) -> bool:
+    return get_processed_commit_store().contains(commit_sha)
 
-    tracking_file = LOGS_DIR / "processed_commits.log"
-
-    if tracking_file.exists():
-        try:
-            with open(tracking_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if commit_sha in content or commit_sha[:8] in content:
-                    logger.debug(f"Commit {commit_sha[:8]} found in tracking file")
-                    return True
-        except Exception as e:
-            logger.warning(f"Error reading tracking file: {e}")
-
-    log_files = glob.glob(str(LOGS_DIR / "sync-*.log"))
 
-    for log_file in log_files:
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if commit_sha in content or commit_sha[:8] in content:
-                    logger.info(f"Migrating commit {commit_sha[:8]} to tracking file")
-                    mark_commit_as_processed(commit_sha)
-                    return True
-        except Exception as e:
-            logger.warning(f"Error reading log file {log_file}: {e}")
-            continue
-
-    return False
+def filter_new_commits(commit_shas: list) -> list:
+    return get_processed_commit_store().filter_new(commit_shas)
 
 
 def mark_commit_as_processed(commit_sha: str):
-    tracking_file = LOGS_DIR / "processed_commits.log"
-
     try:
-        with open(tracking_file, 'a', encoding='utf-8') as f:
-            f.write(f"{datetime.now().isoformat()}|{commit_sha}\n")
+        get_processed_commit_store().add(commit_sha)
     except Exception as e:
         logger.error(f"Failed to mark commit as processed: {e}")
 
 
 def estimate_tokens(text: str) -> int:
-    try:
-        encoding = tiktoken.encoding_for_model("gpt-4o")
-        return len(encoding.encode(text))
-    except ImportError:
-        return len(text) // 3
-
-
-def chunk_diff_data(diff_data: list, max_lines: int = 1000, max_files: int = 20) -> list:
-    if not diff_data:
-        return []
-
-    chunks = []
-    current_chunk = []
-    current_lines = 0
-
-    for file_diff in diff_data:
-        diff_content = file_diff.get('diff', '')
-        lines_count = len(diff_content.split('\n')) if diff_content else 0
-
-        if current_chunk and (current_lines + lines_count > max_lines or len(current_chunk) >= max_files):
-            chunks.append(current_chunk)
-            current_chunk = []
-            current_lines = 0
-
-        current_chunk.append(file_diff)
-        current_lines += lines_count
-
-    if current_chunk:
-        chunks.append(current_chunk)
-
-    return chunks
+    return get_token_counter().count(text)
 
 
 def cleanup_old_logs(days: int = 30):
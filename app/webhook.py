@@ -1,9 +1,16 @@
 import logging
 import hmac
 import hashlib
-from typing import Dict, Any
-from fastapi import HTTPException, Header, Request
-from app.config import settings
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+from app.config import settings, LOGS_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +27,55 @@ def verify_gitlab_signature(payload: bytes, signature: str) -> bool:
 
 class WebhookHandler:
 
-    def __init__(self, analyzer):
+    def __init__(self, analyzer, max_concurrency: Optional[int] = None):
 
         self.analyzer = analyzer
+        self.max_concurrency = max_concurrency or settings.ANALYSIS_MAX_CONCURRENCY
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="analysis"
+        )
+        self.execution_mode = settings.ANALYSIS_EXECUTION_MODE
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
 
-    async def handle_push_event(
-        self,
-        payload: Dict[str, Any],
-        gitlab_token: str
-    ) -> Dict[str, Any]:
-
-        if not self.verify_token(gitlab_token):
-            raise HTTPException(status_code=401, detail="Invalid webhook token")
-
-        event_name = payload.get('event_name')
+    async def process_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         object_kind = payload.get('object_kind')
 
-        logger.info(f"Received webhook: event={event_name}, kind={object_kind}")
-
         if object_kind != 'push':
             return {
                 'status': 'skipped',
                 'reason': f'Not a push event: {object_kind}'
             }
 
-        result = self.analyzer.process_commit(payload)
+        return await self.run_analysis(payload)
+
+    async def run_analysis(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.execution_mode == 'async':
+            async with self._semaphore:
+                self.in_flight += 1
+                try:
+                    return await self.analyzer.process_commit_async(payload)
+                finally:
+                    self.in_flight -= 1
 
-        return result
+        # 동기 분석 파이프라인(GitLab/Redmine/LLM 호출)을 event loop 밖에서 실행
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self.executor, self.analyzer.process_commit, payload)
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'execution_mode': self.execution_mode,
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
     def verify_token(self, provided_token: str) -> bool:
         if not settings.GITLAB_WEBHOOK_SECRET:
@@ -58,22 +87,224 @@ class WebhookHandler:
 
 
 class WebhookQueue:
+    """
+    SQLite(WAL) 기반 영속 webhook 큐.
+
+    수신 즉시 디스크에 기록하고, 처리 성공 후 ack 될 때만 삭제합니다.
+    재시작 시 처리 중이던 항목은 다시 pending 으로 돌아갑니다.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or (LOGS_DIR / "webhook_queue.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                last_error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_webhook_queue_status "
+            "ON webhook_queue (status, available_at, id)"
+        )
+
+        # 이전 프로세스가 처리 도중 종료된 항목 복구
+        recovered = self._conn.execute(
+            "UPDATE webhook_queue SET status = 'pending' WHERE status = 'processing'"
+        ).rowcount
+        if recovered:
+            logger.warning(f"Recovered {recovered} in-flight webhook(s) from previous run")
+
+        self.processed_count = 0
+        self.failed_count = 0
+        self._completed_at = deque()
+
+    def add(self, event_data: Dict[str, Any]) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO webhook_queue (payload, enqueued_at, available_at) VALUES (?, ?, ?)",
+                (json.dumps(event_data, ensure_ascii=False), now, now)
+            )
+        item_id = cursor.lastrowid
+        logger.info(f"Added to queue: id={item_id}")
+        return item_id
+
+    def get_next(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, payload, attempts, enqueued_at FROM webhook_queue "
+                "WHERE status = 'pending' AND available_at <= ? "
+                "ORDER BY available_at, id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if not row:
+                return None
+
+            self._conn.execute(
+                "UPDATE webhook_queue SET status = 'processing' WHERE id = ?",
+                (row[0],)
+            )
+
+        return {
+            'id': row[0],
+            'payload': json.loads(row[1]),
+            'attempts': row[2],
+            'enqueued_at': row[3]
+        }
+
+    def ack(self, item_id: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM webhook_queue WHERE id = ?", (item_id,))
+            self.processed_count += 1
+            self._record_completion()
 
-    def __init__(self):
-        self.queue = []
-        self.processing = False
+    def nack(self, item_id: int, error: Optional[str] = None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM webhook_queue WHERE id = ?",
+                (item_id,)
+            ).fetchone()
+            if not row:
+                return
 
-    def add(self, event_data: Dict[str, Any]):
-        self.queue.append(event_data)
-        logger.info(f"Added to queue. Queue size: {len(self.queue)}")
+            attempts = row[0] + 1
+            if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                status = 'dead'
+                logger.error(f"Webhook {item_id} failed {attempts} times, moving to dead letter")
+            else:
+                status = 'pending'
+                logger.warning(f"Webhook {item_id} failed (attempt {attempts}), will retry")
 
-    def get_next(self) -> Dict[str, Any]:
-        if self.queue:
-            return self.queue.pop(0)
-        return None
+            available_at = time.time() + settings.WEBHOOK_RETRY_BACKOFF_SECONDS * attempts
+            self._conn.execute(
+                "UPDATE webhook_queue SET status = ?, attempts = ?, available_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (status, attempts, available_at, error, item_id)
+            )
+            self.failed_count += 1
+            self._record_completion()
+
+    def _record_completion(self):
+        now = time.time()
+        self._completed_at.append(now)
+        while self._completed_at and self._completed_at[0] < now - 60:
+            self._completed_at.popleft()
 
     def size(self) -> int:
-        return len(self.queue)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM webhook_queue WHERE status IN ('pending', 'processing')"
+            ).fetchone()
+        return row[0]
 
     def is_empty(self) -> bool:
-        return len(self.queue) == 0
+        return self.size() == 0
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM webhook_queue GROUP BY status"
+            ).fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(enqueued_at) FROM webhook_queue WHERE status IN ('pending', 'processing')"
+            ).fetchone()[0]
+            while self._completed_at and self._completed_at[0] < now - 60:
+                self._completed_at.popleft()
+            completed_last_minute = len(self._completed_at)
+
+        return {
+            'depth': counts.get('pending', 0) + counts.get('processing', 0),
+            'pending': counts.get('pending', 0),
+            'processing': counts.get('processing', 0),
+            'dead': counts.get('dead', 0),
+            'oldest_age_seconds': round(now - oldest, 1) if oldest else 0,
+            'throughput_per_minute': completed_last_minute,
+            'processed_total': self.processed_count,
+            'failed_total': self.failed_count
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WebhookWorkerPool:
+
+    def __init__(self, queue: WebhookQueue, handler: WebhookHandler, workers: int = 2):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self):
+        for idx in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(idx)))
+        logger.info(f"Started {self.workers} webhook worker(s)")
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: int):
+        while True:
+            item = self.queue.get_next()
+            if item is None:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=settings.WEBHOOK_POLL_INTERVAL_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                result = await self.handler.process_event(item['payload'])
+            except asyncio.CancelledError:
+                # 재시작 시 processing -> pending 으로 복구됨
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed on webhook {item['id']}: {e}", exc_info=True)
+                self.queue.nack(item['id'], str(e))
+                continue
+
+            if self._is_success(result):
+                self.queue.ack(item['id'])
+                logger.info(f"Webhook {item['id']} processed: {result.get('status')}")
+            else:
+                self.queue.nack(item['id'], result.get('error') or 'commit processing failed')
+
+    @staticmethod
+    def _is_success(result: Dict[str, Any]) -> bool:
+        if result.get('status') == 'failed':
+            return False
+
+        # 실패한 commit 은 재시도 (성공한 commit 은 중복 처리 방지 로직으로 건너뜀)
+        return not any(
+            commit_result.get('status') == 'failed'
+            for commit_result in result.get('commit_results', [])
+        )
@@ -0,0 +1,102 @@
+import logging
+import threading
+from fnmatch import fnmatch
+from typing import Any, Dict, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    """
+    분석 모델 선택기.
+
+    작은 commit 은 mini 모델로 먼저 분석하고, 결과 검증 실패나 낮은 confidence 일 때만
+    큰 모델로 다시 분석합니다. tier 별 호출 수/지연/token 과 escalation 비율을 집계합니다.
+    """
+
+    MINI = 'mini'
+    LARGE = 'large'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, Any]] = {
+            tier: {'calls': 0, 'latency_seconds': 0.0, 'input_tokens': 0, 'output_tokens': 0}
+            for tier in (self.MINI, self.LARGE)
+        }
+        self._routed = {self.MINI: 0, self.LARGE: 0}
+        self._escalations: Dict[str, int] = {}
+
+    def choose(self, diff_data: Dict[str, Any]) -> str:
+        tier = self._choose(diff_data)
+        with self._lock:
+            self._routed[tier] += 1
+        return tier
+
+    def _choose(self, diff_data: Dict[str, Any]) -> str:
+        if not settings.MODEL_ROUTING_ENABLED:
+            return self.LARGE
+
+        # 예산에 맞춰 잘린 diff 는 이미 큰 commit 이므로 큰 모델 사용
+        if diff_data.get('type') != 'full':
+            return self.LARGE
+
+        summary = diff_data.get('summary', {})
+        if (
+            summary.get('total_lines', 0) > settings.ROUTING_SMALL_MAX_LINES
+            or summary.get('total_files', 0) > settings.ROUTING_SMALL_MAX_FILES
+        ):
+            return self.LARGE
+
+        for diff in diff_data.get('diffs', []):
+            path = diff.get('path') or ''
+            if any(fnmatch(path, pattern) for pattern in settings.ROUTING_LARGE_FILE_PATTERNS):
+                return self.LARGE
+
+        return self.MINI
+
+    @staticmethod
+    def escalation_reason(result: Optional[Dict[str, Any]], check_confidence: bool = True) -> Optional[str]:
+        if not result:
+            return 'invalid_result'
+
+        if check_confidence:
+            try:
+                confidence = float(result.get('confidence', 0))
+            except (TypeError, ValueError):
+                confidence = 0
+            if confidence < settings.ROUTING_ESCALATE_CONFIDENCE:
+                return 'low_confidence'
+
+        return None
+
+    def record_escalation(self, reason: str):
+        with self._lock:
+            self._escalations[reason] = self._escalations.get(reason, 0) + 1
+
+    def record_call(self, tier: str, latency: float, usage: Optional[Dict[str, Any]]):
+        with self._lock:
+            stats = self._tiers[tier]
+            stats['calls'] += 1
+            stats['latency_seconds'] += latency
+            if usage:
+                stats['input_tokens'] += usage.get('input_tokens', 0)
+                stats['output_tokens'] += usage.get('output_tokens', 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            escalated = sum(self._escalations.values())
+            return {
+                'enabled': settings.MODEL_ROUTING_ENABLED,
+                'routed': dict(self._routed),
+                'escalations': dict(self._escalations),
+                'escalation_rate': round(escalated / self._routed[self.MINI], 3) if self._routed[self.MINI] else 0.0,
+                'tiers': {
+                    tier: {
+                        **stats,
+                        'latency_seconds': round(stats['latency_seconds'], 3),
+                        'avg_latency_seconds': round(stats['latency_seconds'] / stats['calls'], 3) if stats['calls'] else 0.0,
+                    }
+                    for tier, stats in self._tiers.items()
+                },
+            }
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+# OpenAI structured output (response_format=json_schema, strict) 용 응답 스키마
+# strict 모드에서는 모든 속성이 required 이고 additionalProperties 는 false 여야 함
+
+_ANALYSIS_PROPERTIES: Dict[str, Any] = {
+    "action": {"type": "string", "enum": ["create", "update"]},
+    "redmine_issue_id": {"type": ["integer", "null"], "description": "update 일 때 대상 issue ID, create 이면 null"},
+    "tracker_id": {"type": "integer", "enum": [1, 2, 3], "description": "1(결함) 2(기능) 3(개선)"},
+    "priority_id": {"type": "integer", "enum": [1, 2, 3, 4], "description": "1(긴급) 2(높음) 3(보통) 4(낮음)"},
+    "subject": {"type": "string"},
+    "description": {"type": "string"},
+    "done_ratio": {"type": "integer", "description": "0-100"},
+    "confidence": {"type": "integer", "description": "0-100"},
+}
+
+_CHUNK_PROPERTIES: Dict[str, Any] = {
+    "main_changes": {"type": "string"},
+    "change_nature": {"type": "string", "enum": ["bug_fix", "feature", "refactor", "documentation"]},
+    "suggested_issue_ids": {"type": "array", "items": {"type": "integer"}},
+    "confidence": {"type": "integer", "description": "0-100"},
+}
+
+
+def _schema(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False,
+        },
+    }
+
+
+ANALYSIS_SCHEMA = _schema("commit_analysis", _ANALYSIS_PROPERTIES)
+
+SYNTHESIS_SCHEMA = _schema("commit_synthesis", {
+    **_ANALYSIS_PROPERTIES,
+    "reasoning": {"type": "string"},
+})
+
+DOCUMENTATION_SCHEMA = _schema("commit_documentation", {
+    "documentation": {"type": "string", "description": "Textile 형식 불릿 포인트"},
+    "done_ratio": {"type": "integer", "description": "0-100"},
+    "status_id": {"type": "integer", "enum": [1, 2, 3, 5]},
+})
+
+CHUNK_SCHEMA = _schema("chunk_analysis", _CHUNK_PROPERTIES)
+
+MERGE_SCHEMA = _schema("chunk_merge", _CHUNK_PROPERTIES)
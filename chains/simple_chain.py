@@ -1,30 +1,50 @@
 import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Tuple
+import openai
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from app.config import settings
-from app.utils import load_yaml_prompt, extract_json_from_text
+from app.utils import load_yaml_prompt
 from app.utils import format_file_changes, format_redmine_issues
+from app.prompt_budget import PromptBudgeter
+from app.tokens import get_prompt_cache_stats, get_token_counter
+from app.rate_governor import get_rate_governor
+from chains.model_router import ModelRouter
+from chains.schemas import ANALYSIS_SCHEMA, SYNTHESIS_SCHEMA, DOCUMENTATION_SCHEMA, CHUNK_SCHEMA, MERGE_SCHEMA
 
 logger = logging.getLogger(__name__)
 
 
 class CommitAnalysisChain:
 
+    # 렌더링한 issue 목록 보관 개수
+    ISSUE_BLOCK_CACHE_SIZE = 32
+    # rate governor 사용 시 429 재시도 횟수 (SDK 자체 재시도 대신 governor 를 거쳐 재시도)
+    RATE_LIMIT_RETRIES = 3
+
     def __init__(self):
+        # governor 를 쓰면 429 가 SDK 안에서 재시도되지 않고 penalize 까지 올라오도록 함
         self.llm = ChatOpenAI(
             model="gpt-4o",
             temperature=0,
             openai_api_key=settings.OPENAI_API_KEY,
-            max_retries=3,
+            max_retries=0 if settings.RATE_LIMIT_ENABLED else 3,
+            include_response_headers=True,
         )
 
         self.llm_mini = ChatOpenAI(
             model="gpt-4o-mini",
             temperature=0,
             openai_api_key=settings.OPENAI_API_KEY,
-            max_retries=3,
+            max_retries=0 if settings.RATE_LIMIT_ENABLED else 3,
+            timeout=settings.CHUNK_ANALYSIS_TIMEOUT,
+            include_response_headers=True,
         )
 
         self.system_prompt = load_yaml_prompt("system.yaml")
@@ -32,6 +52,37 @@ class CommitAnalysisChain:
         self.documentation_prompt = load_yaml_prompt("documentation.yaml")
         self.chunk_analysis_template = load_yaml_prompt("chunk_analysis.yaml")
         self.synthesis_template = load_yaml_prompt("synthesis.yaml")
+        self.chunk_merge_template = load_yaml_prompt("chunk_merge.yaml")
+        self.json_repair_template = load_yaml_prompt("json_repair.yaml")
+
+        # prompt/모델이 바뀌면 이전 분석 결과 캐시가 재사용되지 않도록 버전에 반영
+        self.prompt_version = hashlib.sha256(json.dumps(
+            [
+                self.llm.model_name,
+                self.llm_mini.model_name,
+                self.system_prompt,
+                self.analysis_template,
+                self.documentation_prompt,
+                self.chunk_analysis_template,
+                self.synthesis_template,
+                self.chunk_merge_template,
+                settings.STRUCTURED_OUTPUT_ENABLED,
+                [ANALYSIS_SCHEMA, SYNTHESIS_SCHEMA, DOCUMENTATION_SCHEMA, CHUNK_SCHEMA, MERGE_SCHEMA],
+            ],
+            ensure_ascii=False,
+            sort_keys=True
+        ).encode('utf-8')).hexdigest()[:16]
+
+        self.budgeter = PromptBudgeter()
+        self.router = ModelRouter()
+        self.governor = get_rate_governor()
+
+        # commit 단위로 같은 issue 목록이 여러 prompt(분석/청크/종합)에 쓰이므로 렌더링 결과 재사용
+        self._issue_blocks: "OrderedDict[tuple, str]" = OrderedDict()
+        self._issue_blocks_lock = threading.Lock()
+
+        # (모델, schema) 별 response_format 을 bind 한 runnable
+        self._structured_llms: Dict[tuple, Any] = {}
 
     def analyze(
         self,
@@ -41,34 +92,356 @@ class CommitAnalysisChain:
     ) -> Optional[Dict[str, Any]]:
 
         try:
-            system_msg = SystemMessage(content=self.system_prompt['content'])
+            messages = self._analysis_messages(commit_data, redmine_issues, gitlab_issue)
+
+            project = commit_data.get('repository')
+            logger.info(f"Analyzing commit {commit_data.get('commit_hash', 'unknown')}")
 
-            user_content = self._format_user_prompt(
-                commit_data,
-                redmine_issues,
-                gitlab_issue
+            if self.router.choose(commit_data.get('diff_data', {})) == ModelRouter.MINI:
+                response = self._call(self.llm_mini, messages, project, 'analysis', ANALYSIS_SCHEMA)
+                # mini 결과가 잘못되면 escalation 이 재시도 역할을 하므로 복구 요청은 생략
+                result = self._parse_structured(response.content, self._validate_result, 'analysis')
+                if not self._escalate(result):
+                    return self._handle_analysis_response(result)
+
+            response = self._call(self.llm, messages, project, 'analysis', ANALYSIS_SCHEMA)
+            result = self._parse_or_repair(
+                response.content, ANALYSIS_SCHEMA, self._validate_result, project, 'analysis'
             )
-            user_msg = HumanMessage(content=user_content)
 
+            return self._handle_analysis_response(result)
+
+        except Exception as e:
+            logger.error(f"Error during commit analysis: {e}", exc_info=True)
+            return None
+
+    async def analyze_async(
+        self,
+        commit_data: Dict[str, Any],
+        redmine_issues: list,
+        gitlab_issue: Optional[Dict] = None
+    ) -> Optional[Dict[str, Any]]:
+
+        try:
+            messages = await asyncio.to_thread(self._analysis_messages, commit_data, redmine_issues, gitlab_issue)
+
+            project = commit_data.get('repository')
             logger.info(f"Analyzing commit {commit_data.get('commit_hash', 'unknown')}")
-            response = self.llm.invoke([system_msg, user_msg])
 
-            result = self._parse_response(response.content)
+            if self.router.choose(commit_data.get('diff_data', {})) == ModelRouter.MINI:
+                response = await self._acall(self.llm_mini, messages, project, 'analysis', ANALYSIS_SCHEMA)
+                # mini 결과가 잘못되면 escalation 이 재시도 역할을 하므로 복구 요청은 생략
+                result = self._parse_structured(response.content, self._validate_result, 'analysis')
+                if not self._escalate(result):
+                    return self._handle_analysis_response(result)
 
-            if result:
-                logger.info(
-                    f"Analysis complete: action={result.get('action')}, "
-                    f"confidence={result.get('confidence')}%"
-                )
-                return result
-            else:
-                logger.error("Failed to parse LLM response")
-                return None
+            response = await self._acall(self.llm, messages, project, 'analysis', ANALYSIS_SCHEMA)
+            result = await self._aparse_or_repair(
+                response.content, ANALYSIS_SCHEMA, self._validate_result, project, 'analysis'
+            )
 
+            return self._handle_analysis_response(result)
+
+        except asyncio.TimeoutError:
+            logger.error(f"Commit analysis timed out after {settings.LLM_REQUEST_TIMEOUT}s")
+            return None
         except Exception as e:
             logger.error(f"Error during commit analysis: {e}", exc_info=True)
             return None
 
+    def fit_analysis_diff(
+        self,
+        commit_data: Dict[str, Any],
+        redmine_issues: list,
+        gitlab_issue: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        # 분석 prompt 를 실제로 만들어 token 예산에 맞게 diff 를 채운 diff_data 반환
+        def render(diff_data: Dict[str, Any]) -> Dict[str, str]:
+            return self._analysis_sections({**commit_data, 'diff_data': diff_data}, redmine_issues, gitlab_issue)
+
+        return self.budgeter.pack(commit_data.get('diff_data', {}), render, label='analysis')
+
+    def _analysis_sections(
+        self,
+        commit_data: Dict[str, Any],
+        redmine_issues: list,
+        gitlab_issue: Optional[Dict]
+    ) -> Dict[str, str]:
+        fields = self._user_prompt_fields(commit_data, redmine_issues, gitlab_issue)
+        template = self.analysis_template['template']
+
+        return {
+            'system': self.system_prompt['content'],
+            'commit': template.format(**{**fields, 'changed_files': '', 'diff_summary': '', 'redmine_issues': ''}),
+            'diff': f"{fields['changed_files']}\n{fields['diff_summary']}",
+            'issues': fields['redmine_issues'],
+        }
+
+    def _issue_block(self, redmine_issues: list) -> str:
+        # 후보 issue 는 commit 마다 달라지므로 prompt 끝쪽에 두고, prompt cache 는 앞쪽 고정 지시문까지만 적용됨
+        # 같은 후보 목록이면 byte 단위로 동일한 블록이 되도록 id 순으로 정렬 (escalation/재시도 시 재사용)
+        redmine_issues = sorted(redmine_issues or [], key=lambda issue: issue.get('id') or 0)
+        key = tuple((issue.get('id'), issue.get('updated_on')) for issue in redmine_issues)
+
+        with self._issue_blocks_lock:
+            block = self._issue_blocks.get(key)
+            if block is not None:
+                self._issue_blocks.move_to_end(key)
+                return block
+
+        block = format_redmine_issues(redmine_issues)
+
+        with self._issue_blocks_lock:
+            self._issue_blocks[key] = block
+            while len(self._issue_blocks) > self.ISSUE_BLOCK_CACHE_SIZE:
+                self._issue_blocks.popitem(last=False)
+
+        return block
+
+    def _call(
+        self,
+        llm: ChatOpenAI,
+        messages: List[BaseMessage],
+        project: Optional[str] = None,
+        label: str = 'analysis',
+        schema: Optional[Dict[str, Any]] = None
+    ) -> BaseMessage:
+        reserved = self._reserve_tokens(messages)
+        retries = self.RATE_LIMIT_RETRIES if self.governor.enabled else 0
+
+        for attempt in range(retries + 1):
+            self.governor.acquire(llm.model_name, reserved, label)
+
+            started = time.perf_counter()
+            try:
+                response = self._structured(llm, schema).invoke(messages)
+            except openai.RateLimitError as e:
+                self.governor.penalize(llm.model_name, e.response.headers)
+                if attempt == retries:
+                    raise
+                logger.warning(f"Retrying {label} on {llm.model_name} after rate limit ({attempt + 1}/{retries})")
+                continue
+            except BaseException:
+                # timeout/그 외 오류는 사용량을 알 수 없으므로 예약분을 돌려줌
+                self.governor.settle(llm.model_name, reserved, 0)
+                raise
+            self._record_usage(llm, response, time.perf_counter() - started, project, label, reserved)
+            return response
+
+    async def _acall(
+        self,
+        llm: ChatOpenAI,
+        messages: List[BaseMessage],
+        project: Optional[str] = None,
+        label: str = 'analysis',
+        schema: Optional[Dict[str, Any]] = None
+    ) -> BaseMessage:
+        # prompt 렌더링/token 계산은 CPU 작업이므로 event loop 밖에서 실행
+        reserved = await asyncio.to_thread(self._reserve_tokens, messages)
+        retries = self.RATE_LIMIT_RETRIES if self.governor.enabled else 0
+
+        for attempt in range(retries + 1):
+            await self.governor.acquire_async(llm.model_name, reserved, label)
+
+            # 취소(CancelledError)는 예약분을 돌려준 뒤 그대로 전파되어 진행 중인 요청도 함께 취소됨
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self._structured(llm, schema).ainvoke(messages),
+                    timeout=settings.LLM_REQUEST_TIMEOUT
+                )
+            except openai.RateLimitError as e:
+                self.governor.penalize(llm.model_name, e.response.headers)
+                if attempt == retries:
+                    raise
+                logger.warning(f"Retrying {label} on {llm.model_name} after rate limit ({attempt + 1}/{retries})")
+                continue
+            except BaseException:
+                # timeout/취소/그 외 오류는 사용량을 알 수 없으므로 예약분을 돌려줌
+                self.governor.settle(llm.model_name, reserved, 0)
+                raise
+            self._record_usage(llm, response, time.perf_counter() - started, project, label, reserved)
+            return response
+
+    @staticmethod
+    def _reserve_tokens(messages: List[BaseMessage]) -> int:
+        # 요청 token 은 전송할 prompt 로 계산하고 응답분은 고정값으로 예약
+        prompt_tokens = sum(get_token_counter().count_many([str(message.content) for message in messages]))
+        return prompt_tokens + settings.RATE_LIMIT_OUTPUT_TOKENS
+
+    def _structured(self, llm: ChatOpenAI, schema: Optional[Dict[str, Any]]):
+        # 응답이 schema 를 따르도록 API 단에서 강제 (strict json_schema)
+        if schema is None or not settings.STRUCTURED_OUTPUT_ENABLED:
+            return llm
+
+        key = (id(llm), schema['name'])
+        bound = self._structured_llms.get(key)
+        if bound is None:
+            bound = llm.bind(response_format={"type": "json_schema", "json_schema": schema})
+            self._structured_llms[key] = bound
+        return bound
+
+    def _parse_structured(
+        self,
+        response_text: str,
+        validate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        label: str
+    ) -> Optional[Dict[str, Any]]:
+        result, error = self._parse_json(response_text, validate)
+        if error:
+            logger.warning(f"Invalid {label} response ({error}): {response_text[:200]}")
+        return result
+
+    def _parse_or_repair(
+        self,
+        response_text: str,
+        schema: Dict[str, Any],
+        validate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        project: Optional[str],
+        label: str
+    ) -> Optional[Dict[str, Any]]:
+        result, error = self._parse_json(response_text, validate)
+        if not error:
+            return result
+
+        logger.warning(f"Invalid {label} response ({error}): {response_text[:200]}")
+        if not settings.JSON_REPAIR_ENABLED:
+            return None
+
+        response = self._call(
+            self.llm_mini,
+            self._repair_messages(response_text, schema, error),
+            project,
+            f'{label}_repair',
+            schema
+        )
+        return self._parse_repaired(response.content, validate, label)
+
+    async def _aparse_or_repair(
+        self,
+        response_text: str,
+        schema: Dict[str, Any],
+        validate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        project: Optional[str],
+        label: str
+    ) -> Optional[Dict[str, Any]]:
+        result, error = self._parse_json(response_text, validate)
+        if not error:
+            return result
+
+        logger.warning(f"Invalid {label} response ({error}): {response_text[:200]}")
+        if not settings.JSON_REPAIR_ENABLED:
+            return None
+
+        response = await self._acall(
+            self.llm_mini,
+            self._repair_messages(response_text, schema, error),
+            project,
+            f'{label}_repair',
+            schema
+        )
+        return self._parse_repaired(response.content, validate, label)
+
+    def _parse_repaired(
+        self,
+        response_text: str,
+        validate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        label: str
+    ) -> Optional[Dict[str, Any]]:
+        # 복구는 한 번만 시도
+        result, error = self._parse_json(response_text, validate)
+        if error:
+            logger.error(f"JSON repair failed for {label} response ({error}): {response_text[:200]}")
+            return None
+
+        logger.info(f"Repaired {label} response")
+        return result
+
+    @staticmethod
+    def _parse_json(
+        response_text: str,
+        validate: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            result = json.loads(response_text)
+        except (json.JSONDecodeError, TypeError) as e:
+            return None, f"invalid JSON: {e}"
+
+        if not isinstance(result, dict):
+            return None, "response is not a JSON object"
+
+        try:
+            return validate(result), None
+        except ValueError as e:
+            return None, str(e)
+
+    def _repair_messages(self, response_text: str, schema: Dict[str, Any], error: str) -> List[BaseMessage]:
+        prompt = self.json_repair_template['template'].format(
+            schema=json.dumps(schema['schema'], ensure_ascii=False, separators=(',', ':')),
+            error=error,
+            response=response_text
+        )
+        return [HumanMessage(content=prompt)]
+
+    def _escalate(self, result: Optional[Dict[str, Any]], check_confidence: bool = True) -> bool:
+        reason = self.router.escalation_reason(result, check_confidence)
+        if reason is None:
+            return False
+
+        self.router.record_escalation(reason)
+        logger.info(f"Escalating to {self.llm.model_name} ({reason})")
+        return True
+
+    def _record_usage(
+        self,
+        llm: ChatOpenAI,
+        response: BaseMessage,
+        latency: float,
+        project: Optional[str],
+        label: str,
+        reserved: int
+    ):
+        usage = getattr(response, 'usage_metadata', None)
+        tier = ModelRouter.MINI if llm is self.llm_mini else ModelRouter.LARGE
+        self.router.record_call(tier, latency, usage)
+
+        self.governor.observe(llm.model_name, (getattr(response, 'response_metadata', None) or {}).get('headers'))
+        self.governor.settle(llm.model_name, reserved, usage.get('total_tokens') if usage else None)
+
+        if not usage:
+            return
+
+        cached_tokens = (usage.get('input_token_details') or {}).get('cache_read', 0) or 0
+        get_prompt_cache_stats().record(project, label, usage.get('input_tokens', 0), cached_tokens)
+
+    def _analysis_messages(
+        self,
+        commit_data: Dict[str, Any],
+        redmine_issues: list,
+        gitlab_issue: Optional[Dict]
+    ) -> List[BaseMessage]:
+        system_msg = SystemMessage(content=self.system_prompt['content'])
+
+        user_content = self._format_user_prompt(
+            commit_data,
+            redmine_issues,
+            gitlab_issue
+        )
+        user_msg = HumanMessage(content=user_content)
+
+        return [system_msg, user_msg]
+
+    def _handle_analysis_response(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if result:
+            logger.info(
+                f"Analysis complete: action={result.get('action')}, "
+                f"confidence={result.get('confidence')}%"
+            )
+            return result
+        else:
+            logger.error("Failed to parse LLM response")
+            return None
+
     def _format_user_prompt(
         self,
         commit_data: Dict[str, Any],
@@ -78,6 +451,15 @@ class CommitAnalysisChain:
 
         template = self.analysis_template['template']
 
+        return template.format(**self._user_prompt_fields(commit_data, redmine_issues, gitlab_issue))
+
+    def _user_prompt_fields(
+        self,
+        commit_data: Dict[str, Any],
+        redmine_issues: list,
+        gitlab_issue: Optional[Dict]
+    ) -> Dict[str, Any]:
+
         if gitlab_issue:
             gitlab_issue_info = (
                 f"GitLab Issue 참조:\n"
@@ -106,7 +488,7 @@ class CommitAnalysisChain:
                 f"상위 변경 파일:\n{format_file_changes(diff_data['diffs'], include_diff=False)}"
             )
 
-        prompt = template.format(
+        return dict(
             repository=commit_data.get('repository', 'Unknown'),
             branch=commit_data.get('branch', 'Unknown'),
             author=commit_data.get('author', 'Unknown'),
@@ -116,38 +498,23 @@ class CommitAnalysisChain:
             changed_files=format_file_changes(diff_data.get('diffs', [])),
             diff_summary=diff_summary,
             gitlab_issue_info=gitlab_issue_info,
-            redmine_issues=format_redmine_issues(redmine_issues)
+            redmine_issues=self._issue_block(redmine_issues)
         )
 
-        return prompt
-
-    def _parse_response(self, response_text: str) -> Optional[Dict[str, Any]]:
-        try:
-            result = json.loads(response_text)
-            return self._validate_result(result)
-        except json.JSONDecodeError:
-            result = extract_json_from_text(response_text)
-            if result:
-                return self._validate_result(result)
-
-            logger.error(f"Could not parse JSON from response: {response_text[:200]}")
-            return None
-
-    def _validate_result(self, result: Dict) -> Optional[Dict]:
+    @staticmethod
+    def _validate_result(result: Dict) -> Dict:
+        # schema 로 표현되지 않는 조건(update 시 issue ID 필수)도 함께 검사
         required_fields = ['action', 'tracker_id', 'priority_id', 'subject', 'done_ratio']
 
         for field in required_fields:
             if field not in result:
-                logger.error(f"Missing required field: {field}")
-                return None
+                raise ValueError(f"Missing required field: {field}")
 
         if result['action'] not in ['create', 'update']:
-            logger.error(f"Invalid action: {result['action']}")
-            return None
+            raise ValueError(f"Invalid action: {result['action']}")
 
         if result['action'] == 'update' and not result.get('redmine_issue_id'):
-            logger.error("Update action requires redmine_issue_id")
-            return None
+            raise ValueError("Update action requires redmine_issue_id")
 
         return result
 
@@ -168,80 +535,144 @@ class CommitAnalysisChain:
             }
         """
         try:
+            messages = self._documentation_messages(commit_message, diff_data, author)
 
-            system_msg = SystemMessage(content=self.documentation_prompt['content'])
-
-            diff_summary = diff_data.get('summary', {})
-            files_changed = format_file_changes(diff_data.get('diffs', []))
-
-            diff_detail = ""
-            diff_type = diff_data.get('type', 'unknown')
-            if diff_type == 'full':
-                diff_detail = format_file_changes(diff_data.get('diffs', []), include_diff=True)
-            else:
-                diff_detail = files_changed
-
-            user_msg = HumanMessage(
-                content=(
-                    f"다음 commit의 변경 내용을 분석하여 문서화하고 진척도/상태를 판단해주세요:\n\n"
-                    f"**Commit 메시지** (참고용): {commit_message}\n\n"
-                    f"**변경 통계**:\n"
-                    f"- 파일: {diff_summary.get('total_files', 0)}개\n"
-                    f"- 추가: +{diff_summary.get('total_additions', 0)}줄\n"
-                    f"- 삭제: -{diff_summary.get('total_deletions', 0)}줄\n\n"
-                    f"**변경 파일 상세**:\n{diff_detail}\n\n"
-                    f"위 내용을 분석하여 JSON 형식으로 응답해주세요."
-                )
+            logger.info("Generating commit documentation...")
+
+            if self.router.choose(diff_data) == ModelRouter.MINI:
+                response = self._call(self.llm_mini, messages, label='documentation', schema=DOCUMENTATION_SCHEMA)
+                result = self._parse_structured(response.content, self._validate_documentation, 'documentation')
+                if not self._escalate(result, check_confidence=False):
+                    return self._handle_documentation_response(result)
+
+            response = self._call(self.llm, messages, label='documentation', schema=DOCUMENTATION_SCHEMA)
+            result = self._parse_or_repair(
+                response.content, DOCUMENTATION_SCHEMA, self._validate_documentation, None, 'documentation'
             )
 
+            return self._handle_documentation_response(result)
+
+        except Exception as e:
+            logger.error(f"Error generating commit documentation: {e}", exc_info=True)
+            return None
+
+    async def document_commit_async(
+        self,
+        commit_message: str,
+        diff_data: Dict[str, Any],
+        author: str
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            messages = await asyncio.to_thread(self._documentation_messages, commit_message, diff_data, author)
+
             logger.info("Generating commit documentation...")
-            response = self.llm.invoke([system_msg, user_msg])
 
-            result = self._parse_documentation_response(response.content)
+            if self.router.choose(diff_data) == ModelRouter.MINI:
+                response = await self._acall(self.llm_mini, messages, label='documentation', schema=DOCUMENTATION_SCHEMA)
+                result = self._parse_structured(response.content, self._validate_documentation, 'documentation')
+                if not self._escalate(result, check_confidence=False):
+                    return self._handle_documentation_response(result)
 
-            if result:
-                logger.info(
-                    f"Documentation generated: done_ratio={result.get('done_ratio')}%, "
-                    f"status_id={result.get('status_id')}"
-                )
-                return result
-            else:
-                logger.error("Failed to parse documentation response")
-                return None
+            response = await self._acall(self.llm, messages, label='documentation', schema=DOCUMENTATION_SCHEMA)
+            result = await self._aparse_or_repair(
+                response.content, DOCUMENTATION_SCHEMA, self._validate_documentation, None, 'documentation'
+            )
 
+            return self._handle_documentation_response(result)
+
+        except asyncio.TimeoutError:
+            logger.error(f"Commit documentation timed out after {settings.LLM_REQUEST_TIMEOUT}s")
+            return None
         except Exception as e:
             logger.error(f"Error generating commit documentation: {e}", exc_info=True)
             return None
 
-    def _parse_documentation_response(self, response_text: str) -> Optional[Dict[str, Any]]:
-        """Documentation 응답 JSON 파싱"""
-        try:
-            result = json.loads(response_text)
+    def _documentation_messages(
+        self,
+        commit_message: str,
+        diff_data: Dict[str, Any],
+        author: str
+    ) -> List[BaseMessage]:
+        system_content = self.documentation_prompt['content']
 
-            if 'documentation' not in result or 'done_ratio' not in result or 'status_id' not in result:
-                logger.error("Missing required fields in documentation response")
-                return None
+        def render(data: Dict[str, Any]) -> Dict[str, str]:
+            return {
+                'system': system_content,
+                'commit': self._documentation_user_content(commit_message, data),
+            }
 
-            return result
+        packed = self.budgeter.pack(diff_data, render, label='documentation')
 
-        except json.JSONDecodeError:
-            result = extract_json_from_text(response_text)
-            if result and 'documentation' in result:
-                return result
+        return [
+            SystemMessage(content=system_content),
+            HumanMessage(content=self._documentation_user_content(commit_message, packed))
+        ]
 
-            logger.error(f"Could not parse JSON from documentation response: {response_text[:200]}")
+    def _documentation_user_content(self, commit_message: str, diff_data: Dict[str, Any]) -> str:
+        diff_summary = diff_data.get('summary', {})
+
+        diff_type = diff_data.get('type', 'unknown')
+        if diff_type in ('full', 'summary'):
+            diff_detail = format_file_changes(diff_data.get('diffs', []), include_diff=True)
+        else:
+            diff_detail = format_file_changes(diff_data.get('diffs', []))
+
+        return (
+            f"다음 commit의 변경 내용을 분석하여 문서화하고 진척도/상태를 판단해주세요:\n\n"
+            f"**Commit 메시지** (참고용): {commit_message}\n\n"
+            f"**변경 통계**:\n"
+            f"- 파일: {diff_summary.get('total_files', 0)}개\n"
+            f"- 추가: +{diff_summary.get('total_additions', 0)}줄\n"
+            f"- 삭제: -{diff_summary.get('total_deletions', 0)}줄\n\n"
+            f"**변경 파일 상세**:\n{diff_detail}\n\n"
+            f"위 내용을 분석하여 JSON 형식으로 응답해주세요."
+        )
+
+    def _handle_documentation_response(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if result:
+            logger.info(
+                f"Documentation generated: done_ratio={result.get('done_ratio')}%, "
+                f"status_id={result.get('status_id')}"
+            )
+            return result
+        else:
+            logger.error("Failed to parse documentation response")
             return None
 
-    async def analyze_async(
+    @staticmethod
+    def _validate_documentation(result: Dict) -> Dict:
+        """Documentation 응답 필수 필드 검사"""
+        for field in ('documentation', 'done_ratio', 'status_id'):
+            if field not in result:
+                raise ValueError(f"Missing required field in documentation response: {field}")
+
+        return result
+
+    def analyze_chunk(
         self,
+        chunk_data: list,
+        chunk_index: int,
+        total_chunks: int,
         commit_data: Dict[str, Any],
-        redmine_issues: list,
-        gitlab_issue: Optional[Dict] = None
+        redmine_issues: list
     ) -> Optional[Dict[str, Any]]:
+        try:
+            messages = self._chunk_messages(chunk_data, chunk_index, total_chunks, commit_data, redmine_issues)
 
-        return self.analyze(commit_data, redmine_issues, gitlab_issue)
+            logger.info(f"Analyzing chunk {chunk_index}/{total_chunks}")
+            project = commit_data.get('repository')
+            response = self._call(self.llm_mini, messages, project, 'chunk', CHUNK_SCHEMA)
+            result = self._parse_or_repair(
+                response.content, CHUNK_SCHEMA, self._validate_chunk_result, project, 'chunk'
+            )
 
-    def analyze_chunk(
+            return self._handle_chunk_response(result, chunk_index)
+
+        except Exception as e:
+            logger.error(f"Error analyzing chunk {chunk_index}: {e}", exc_info=True)
+            return None
+
+    async def analyze_chunk_async(
         self,
         chunk_data: list,
         chunk_index: int,
@@ -250,55 +681,169 @@ class CommitAnalysisChain:
         redmine_issues: list
     ) -> Optional[Dict[str, Any]]:
         try:
+            messages = await asyncio.to_thread(self._chunk_messages, chunk_data, chunk_index, total_chunks, commit_data, redmine_issues)
 
-            template = self.chunk_analysis_template['template']
-
-            chunk_diff_text = format_file_changes(chunk_data, include_diff=True)
-
-            prompt = template.format(
-                repository=commit_data.get('repository', 'Unknown'),
-                branch=commit_data.get('branch', 'Unknown'),
-                author=commit_data.get('author', 'Unknown'),
-                commit_hash=commit_data.get('commit_hash', 'Unknown'),
-                commit_message=commit_data.get('commit_message', ''),
-                chunk_index=chunk_index,
-                total_chunks=total_chunks,
-                chunk_files_count=len(chunk_data),
-                chunk_changed_files=format_file_changes(chunk_data),
-                chunk_diff=chunk_diff_text,
-                redmine_issues=format_redmine_issues(redmine_issues)
+            logger.info(f"Analyzing chunk {chunk_index}/{total_chunks}")
+            project = commit_data.get('repository')
+            response = await self._acall(self.llm_mini, messages, project, 'chunk', CHUNK_SCHEMA)
+            result = await self._aparse_or_repair(
+                response.content, CHUNK_SCHEMA, self._validate_chunk_result, project, 'chunk'
             )
 
-            user_msg = HumanMessage(content=prompt)
+            return self._handle_chunk_response(result, chunk_index)
 
-            logger.info(f"Analyzing chunk {chunk_index}/{total_chunks}")
-            response = self.llm_mini.invoke([user_msg])
+        except asyncio.TimeoutError:
+            logger.error(f"Chunk {chunk_index} analysis timed out after {settings.LLM_REQUEST_TIMEOUT}s")
+            return None
+        except Exception as e:
+            logger.error(f"Error analyzing chunk {chunk_index}: {e}", exc_info=True)
+            return None
+
+    def _chunk_messages(
+        self,
+        chunk_data: list,
+        chunk_index: int,
+        total_chunks: int,
+        commit_data: Dict[str, Any],
+        redmine_issues: list
+    ) -> List[BaseMessage]:
+        template = self.chunk_analysis_template['template']
+
+        chunk_diff_text = format_file_changes(chunk_data, include_diff=True)
+
+        prompt = template.format(
+            repository=commit_data.get('repository', 'Unknown'),
+            branch=commit_data.get('branch', 'Unknown'),
+            author=commit_data.get('author', 'Unknown'),
+            commit_hash=commit_data.get('commit_hash', 'Unknown'),
+            commit_message=commit_data.get('commit_message', ''),
+            chunk_index=chunk_index,
+            total_chunks=total_chunks,
+            chunk_files_count=len(chunk_data),
+            chunk_changed_files=format_file_changes(chunk_data),
+            chunk_diff=chunk_diff_text,
+            issue_section=self._chunk_issue_section(redmine_issues)
+        )
 
-            result = self._parse_chunk_response(response.content)
+        return [HumanMessage(content=prompt)]
+
+    def _chunk_issue_section(self, redmine_issues: list) -> str:
+        # none 모드: 청크는 변경 요약만 하고 issue 매칭은 종합 단계에서 한 번만 수행
+        if settings.CHUNK_ISSUE_CONTEXT != 'full':
+            return ""
+        return f"=== Open 상태 Redmine Issues ===\n{self._issue_block(redmine_issues)}\n\n"
+
+    def _handle_chunk_response(self, result: Optional[Dict[str, Any]], chunk_index: int) -> Optional[Dict[str, Any]]:
+        if result:
+            logger.info(f"Chunk {chunk_index} analysis complete")
+            return result
+        else:
+            logger.error(f"Failed to parse chunk {chunk_index} response")
+            return None
+
+    @staticmethod
+    def _validate_chunk_result(result: Dict) -> Dict:
+        if 'main_changes' not in result:
+            raise ValueError("Missing required field in chunk response: main_changes")
+
+        return result
+
+    def merge_chunk_results(
+        self,
+        chunk_results: list,
+        commit_data: Dict[str, Any],
+        level: int,
+        group_index: int,
+        group_count: int
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            messages = self._merge_messages(chunk_results, commit_data, level, group_index, group_count)
+
+            logger.info(f"Merging chunk results (level {level}, group {group_index}/{group_count})")
+            project = commit_data.get('repository')
+            response = self._call(self.llm_mini, messages, project, 'merge', MERGE_SCHEMA)
+            result = self._parse_or_repair(
+                response.content, MERGE_SCHEMA, self._validate_chunk_result, project, 'merge'
+            )
 
-            if result:
-                logger.info(f"Chunk {chunk_index} analysis complete")
-                return result
-            else:
-                logger.error(f"Failed to parse chunk {chunk_index} response")
-                return None
+            return self._handle_merge_response(result, level, group_index)
 
         except Exception as e:
-            logger.error(f"Error analyzing chunk {chunk_index}: {e}", exc_info=True)
+            logger.error(f"Error merging chunk results (level {level}, group {group_index}): {e}", exc_info=True)
             return None
 
-    def _parse_chunk_response(self, response_text: str) -> Optional[Dict[str, Any]]:
+    async def merge_chunk_results_async(
+        self,
+        chunk_results: list,
+        commit_data: Dict[str, Any],
+        level: int,
+        group_index: int,
+        group_count: int
+    ) -> Optional[Dict[str, Any]]:
         try:
-            result = json.loads(response_text)
-            return result
-        except json.JSONDecodeError:
-            result = extract_json_from_text(response_text)
-            if result:
-                return result
+            messages = await asyncio.to_thread(self._merge_messages, chunk_results, commit_data, level, group_index, group_count)
+
+            logger.info(f"Merging chunk results (level {level}, group {group_index}/{group_count})")
+            project = commit_data.get('repository')
+            response = await self._acall(self.llm_mini, messages, project, 'merge', MERGE_SCHEMA)
+            result = await self._aparse_or_repair(
+                response.content, MERGE_SCHEMA, self._validate_chunk_result, project, 'merge'
+            )
+
+            return self._handle_merge_response(result, level, group_index)
+
+        except asyncio.TimeoutError:
+            logger.error(f"Chunk merge (level {level}, group {group_index}) timed out after {settings.LLM_REQUEST_TIMEOUT}s")
+            return None
+        except Exception as e:
+            logger.error(f"Error merging chunk results (level {level}, group {group_index}): {e}", exc_info=True)
+            return None
+
+    def _merge_messages(
+        self,
+        chunk_results: list,
+        commit_data: Dict[str, Any],
+        level: int,
+        group_index: int,
+        group_count: int
+    ) -> List[BaseMessage]:
+        template = self.chunk_merge_template['template']
 
-            logger.error(f"Could not parse JSON from chunk response: {response_text[:200]}")
+        prompt = template.format(
+            repository=commit_data.get('repository', 'Unknown'),
+            commit_hash=commit_data.get('commit_hash', 'Unknown'),
+            commit_message=commit_data.get('commit_message', ''),
+            level=level,
+            group_index=group_index,
+            group_count=group_count,
+            results_count=len(chunk_results),
+            chunk_results=self._format_chunk_results(chunk_results)
+        )
+
+        return [HumanMessage(content=prompt)]
+
+    def _handle_merge_response(self, result: Optional[Dict[str, Any]], level: int, group_index: int) -> Optional[Dict[str, Any]]:
+        if result:
+            logger.info(f"Chunk merge complete (level {level}, group {group_index})")
+            return result
+        else:
+            logger.error(f"Failed to parse chunk merge response (level {level}, group {group_index})")
             return None
 
+    @staticmethod
+    def _format_chunk_results(chunk_results: list) -> str:
+        # 중간 결과는 기본적으로 공백 없는 JSON 으로 직렬화해 token 을 절약
+        if settings.SYNTHESIS_COMPACT_JSON:
+            return '\n'.join(
+                f"Chunk {idx}: {json.dumps(chunk_result, ensure_ascii=False, separators=(',', ':'))}"
+                for idx, chunk_result in enumerate(chunk_results, 1)
+            )
+
+        chunk_results_text = ""
+        for idx, chunk_result in enumerate(chunk_results, 1):
+            chunk_results_text += f"Chunk {idx}:\n{json.dumps(chunk_result, ensure_ascii=False, indent=2)}\n\n"
+        return chunk_results_text
+
     def synthesize_results(
         self,
         chunk_results: list,
@@ -306,41 +851,78 @@ class CommitAnalysisChain:
         redmine_issues: list
     ) -> Optional[Dict[str, Any]]:
         try:
+            messages = self._synthesis_messages(chunk_results, commit_data, redmine_issues)
 
-            template = self.synthesis_template['template']
+            logger.info("Synthesizing chunk analysis results")
+            project = commit_data.get('repository')
+            response = self._call(self.llm, messages, project, 'synthesis', SYNTHESIS_SCHEMA)
+            result = self._parse_or_repair(
+                response.content, SYNTHESIS_SCHEMA, self._validate_result, project, 'synthesis'
+            )
 
-            chunk_results_text = ""
-            for idx, chunk_result in enumerate(chunk_results, 1):
-                chunk_results_text += f"Chunk {idx}:\n{json.dumps(chunk_result, ensure_ascii=False, indent=2)}\n\n"
+            return self._handle_synthesis_response(result)
 
-            prompt = template.format(
-                repository=commit_data.get('repository', 'Unknown'),
-                branch=commit_data.get('branch', 'Unknown'),
-                author=commit_data.get('author', 'Unknown'),
-                commit_hash=commit_data.get('commit_hash', 'Unknown'),
-                commit_message=commit_data.get('commit_message', ''),
-                chunk_results=chunk_results_text,
-                redmine_issues=format_redmine_issues(redmine_issues)
-            )
+        except Exception as e:
+            logger.error(f"Error synthesizing results: {e}", exc_info=True)
+            return None
 
-            system_msg = SystemMessage(content=self.system_prompt['content'])
-            user_msg = HumanMessage(content=prompt)
+    async def synthesize_results_async(
+        self,
+        chunk_results: list,
+        commit_data: Dict[str, Any],
+        redmine_issues: list
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            messages = await asyncio.to_thread(self._synthesis_messages, chunk_results, commit_data, redmine_issues)
 
             logger.info("Synthesizing chunk analysis results")
-            response = self.llm.invoke([system_msg, user_msg])
-
-            result = self._parse_response(response.content)
+            project = commit_data.get('repository')
+            response = await self._acall(self.llm, messages, project, 'synthesis', SYNTHESIS_SCHEMA)
+            result = await self._aparse_or_repair(
+                response.content, SYNTHESIS_SCHEMA, self._validate_result, project, 'synthesis'
+            )
 
-            if result:
-                logger.info(
-                    f"Synthesis complete: action={result.get('action')}, "
-                    f"confidence={result.get('confidence')}%"
-                )
-                return result
-            else:
-                logger.error("Failed to parse synthesis response")
-                return None
+            return self._handle_synthesis_response(result)
 
+        except asyncio.TimeoutError:
+            logger.error(f"Synthesis timed out after {settings.LLM_REQUEST_TIMEOUT}s")
+            return None
         except Exception as e:
             logger.error(f"Error synthesizing results: {e}", exc_info=True)
             return None
+
+    def _synthesis_messages(
+        self,
+        chunk_results: list,
+        commit_data: Dict[str, Any],
+        redmine_issues: list
+    ) -> List[BaseMessage]:
+        template = self.synthesis_template['template']
+
+        chunk_results_text = self._format_chunk_results(chunk_results)
+
+        prompt = template.format(
+            repository=commit_data.get('repository', 'Unknown'),
+            branch=commit_data.get('branch', 'Unknown'),
+            author=commit_data.get('author', 'Unknown'),
+            commit_hash=commit_data.get('commit_hash', 'Unknown'),
+            commit_message=commit_data.get('commit_message', ''),
+            chunk_results=chunk_results_text,
+            redmine_issues=self._issue_block(redmine_issues)
+        )
+
+        system_msg = SystemMessage(content=self.system_prompt['content'])
+        user_msg = HumanMessage(content=prompt)
+
+        return [system_msg, user_msg]
+
+    def _handle_synthesis_response(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if result:
+            logger.info(
+                f"Synthesis complete: action={result.get('action')}, "
+                f"confidence={result.get('confidence')}%"
+            )
+            return result
+        else:
+            logger.error("Failed to parse synthesis response")
+            return None